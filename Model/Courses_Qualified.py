@@ -1,15 +1,26 @@
 """
 DooleyHelpz MVP – Step 2: Course Qualification / Filtering
+
+The enriched catalog is loaded once into a CourseTable (rating, method, day
+bitmask, start/end minutes as arrays) and every filter is evaluated as a
+boolean mask over it. qualify_many() evaluates many students' filters in one
+pass; run_batch() writes all of their results with a single bulk_write.
+
+Usage:
+    python Courses_Qualified.py --min_rating 3 --days M,W --start 09:00
+    python Courses_Qualified.py --batch staging/student_filters.json
 """
 
 import argparse
 import os
 import json
-from pymongo import MongoClient
+from pymongo import MongoClient, DeleteMany, InsertOne
 from pymongo.errors import PyMongoError
 from pathlib import Path
 import re
 
+import numpy as np
+
 
 def parse_hhmm_to_min(hhmm):
     if not hhmm:
@@ -188,6 +199,169 @@ def qualifies(doc, min_rating, method, allowed_days, start_min, end_min, unavail
 
 
 
+class CourseTable:
+    """
+    Columnar view of the enriched catalog, built once per load:
+
+      rating     float  rmp.rating (0 when missing)
+      method     str    lowercased instruction_method
+      day_mask   int64  one bit per meeting day token (see day_bit)
+      start/end  float  meeting minutes, NaN when unknown
+    """
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.day_bits = {}
+
+        ratings, methods, masks, starts, ends = [], [], [], [], []
+        for doc in docs:
+            rating = (doc.get("rmp") or {}).get("rating") or 0
+            try:
+                ratings.append(float(rating))
+            except (TypeError, ValueError):
+                ratings.append(0.0)
+            methods.append((doc.get("instruction_method") or "").lower())
+
+            meeting = doc.get("meeting") or {}
+            masks.append(self.days_mask(meeting.get("days") or []))
+            st = meeting.get("start_min")
+            en = meeting.get("end_min")
+            starts.append(np.nan if st is None else st)
+            ends.append(np.nan if en is None else en)
+
+        self.rating = np.array(ratings, dtype=float)
+        self.method = np.array(methods, dtype=object)
+        self.day_mask = np.array(masks, dtype=np.int64)
+        self.start = np.array(starts, dtype=float)
+        self.end = np.array(ends, dtype=float)
+        self.timed = ~(np.isnan(self.start) | np.isnan(self.end))
+
+    def __len__(self):
+        return len(self.docs)
+
+    def day_bit(self, day):
+        return self.day_bits.setdefault(day, 1 << len(self.day_bits))
+
+    def days_mask(self, days):
+        mask = 0
+        for d in days:
+            mask |= self.day_bit(d)
+        return mask
+
+    def unavailable_mask(self, unavailable_blocks):
+        """True where the course meets during any unavailable block."""
+        conflict = np.zeros(len(self), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            for blk in unavailable_blocks:
+                conflict |= (
+                    self.timed
+                    & ((self.day_mask & self.day_bit(blk["day"])) != 0)
+                    & (np.maximum(self.start, blk["start_min"]) < np.minimum(self.end, blk["end_min"]))
+                )
+        return conflict
+
+    def mask(self, min_rating, method, allowed_days, start_min, end_min, unavailable_blocks):
+        """Vectorized qualifies() over the whole catalog."""
+        keep = self.rating >= (min_rating or 0)
+        if method:
+            keep &= self.method == method.lower()
+        if allowed_days:
+            keep &= (self.day_mask & self.days_mask(allowed_days)) != 0
+        # NaN comparisons are False, so unknown times fail an active window
+        with np.errstate(invalid="ignore"):
+            if start_min:
+                keep &= self.start >= start_min
+            if end_min:
+                keep &= self.end <= end_min
+        if unavailable_blocks:
+            keep &= ~self.unavailable_mask(unavailable_blocks)
+        return keep
+
+    def select(self, mask):
+        return [self.docs[i] for i in np.flatnonzero(mask)]
+
+
+def student_filters(spec):
+    """
+    Normalize one student's filter spec:
+
+      {"id": "...", "min_rating": 3.5, "method": "In Person",
+       "days": ["M", "W"], "start": "09:00", "end": "17:00",
+       "time_unavailable": [...questionnaire blocks...]}
+    """
+    days = spec.get("days") or []
+    if isinstance(days, str):
+        days = days.split(",")
+    return {
+        "min_rating": float(spec.get("min_rating") or 0),
+        "method": spec.get("method"),
+        "allowed_days": [d.strip() for d in days],
+        "start_min": parse_hhmm_to_min(spec.get("start")),
+        "end_min": parse_hhmm_to_min(spec.get("end")),
+        "unavailable_blocks": parse_unavailable_blocks(spec.get("time_unavailable") or []),
+    }
+
+
+def qualify_many(table, filters):
+    """
+    Evaluate many students' filters in one pass.
+    Returns a (n_students, n_courses) boolean matrix.
+    """
+    n = len(table)
+    if not filters:
+        return np.zeros((0, n), dtype=bool)
+
+    min_rating = np.array([f["min_rating"] for f in filters], dtype=float)
+    start_min = np.array([f["start_min"] or np.nan for f in filters], dtype=float)
+    end_min = np.array([f["end_min"] or np.nan for f in filters], dtype=float)
+    allowed = np.array([table.days_mask(f["allowed_days"]) for f in filters], dtype=np.int64)
+
+    keep = table.rating[None, :] >= min_rating[:, None]
+
+    for method in {f["method"] for f in filters if f["method"]}:
+        rows = np.array([f["method"] == method for f in filters])
+        keep[rows] &= table.method == method.lower()
+
+    has_days = allowed != 0
+    keep[has_days] &= (table.day_mask[None, :] & allowed[has_days, None]) != 0
+
+    with np.errstate(invalid="ignore"):
+        has_start = ~np.isnan(start_min)
+        keep[has_start] &= table.start[None, :] >= start_min[has_start, None]
+        has_end = ~np.isnan(end_min)
+        keep[has_end] &= table.end[None, :] <= end_min[has_end, None]
+
+        # All students' unavailable blocks as one (n_blocks, n_courses) conflict matrix
+        blocks = [(i, b) for i, f in enumerate(filters) for b in f["unavailable_blocks"]]
+        if blocks:
+            owner = np.array([i for i, _ in blocks])
+            bit = np.array([table.day_bit(b["day"]) for _, b in blocks], dtype=np.int64)
+            b_start = np.array([b["start_min"] for _, b in blocks], dtype=float)
+            b_end = np.array([b["end_min"] for _, b in blocks], dtype=float)
+            conflict = (
+                table.timed[None, :]
+                & ((table.day_mask[None, :] & bit[:, None]) != 0)
+                & (np.maximum(table.start[None, :], b_start[:, None])
+                   < np.minimum(table.end[None, :], b_end[:, None]))
+            )
+            unavailable = np.zeros((len(filters), n), dtype=bool)
+            np.logical_or.at(unavailable, owner, conflict)
+            keep &= ~unavailable
+
+    return keep
+
+
+def load_source(uri):
+    client = MongoClient(uri)
+    col_in = client["DetailedCourses"]["CoursesEnriched"]
+    try:
+        return client, list(col_in.find({}))
+    except PyMongoError as e:
+        print(f"[WARN] DB read failed: {e}")
+        with open("out/courses_enriched.json") as f:
+            return client, json.load(f)
+
+
 def run(uri, min_rating, method, days_csv, start, end):
     allowed_days = [d.strip() for d in (days_csv.split(",") if days_csv else [])]
     start_min = parse_hhmm_to_min(start)
@@ -208,24 +382,13 @@ def run(uri, min_rating, method, days_csv, start, end):
         # it's fine if the file doesn't exist yet
         unavailable_blocks = []
 
-    client = MongoClient(uri)
-    db = client["DetailedCourses"]
-    col_in = db["CoursesEnriched"]
-    col_out = db["CoursesQualified"]
-
-
-    try:
-        source = list(col_in.find({}))
-    except PyMongoError as e:
-        print(f"[WARN] DB read failed: {e}")
-        with open("out/courses_enriched.json") as f:
-            source = json.load(f)
-
-        qualified = [
-        d for d in source
-        if qualifies(d, min_rating, method, allowed_days, start_min, end_min, unavailable_blocks)
-    ]
+    client, source = load_source(uri)
+    col_out = client["DetailedCourses"]["CoursesQualified"]
 
+    table = CourseTable(source)
+    qualified = table.select(
+        table.mask(min_rating, method, allowed_days, start_min, end_min, unavailable_blocks)
+    )
 
     try:
         col_out.delete_many({})
@@ -241,6 +404,41 @@ def run(uri, min_rating, method, days_csv, start, end):
     print("Saved backup JSON → out/courses_qualified.json")
 
 
+def run_batch(uri, specs_path):
+    """
+    Qualify every student in specs_path (a JSON list of student_filters specs)
+    and replace their CoursesQualified rows with one bulk_write.
+    """
+    with open(specs_path, "r", encoding="utf-8") as f:
+        specs = json.load(f)
+
+    client, source = load_source(uri)
+    col_out = client["DetailedCourses"]["CoursesQualified"]
+
+    table = CourseTable(source)
+    keep = qualify_many(table, [student_filters(spec) for spec in specs])
+
+    student_ids = [str(spec.get("id")) for spec in specs]
+    ops = [DeleteMany({"student_id": {"$in": student_ids}})]
+    results = {}
+    for student_id, row in zip(student_ids, keep):
+        docs = table.select(row)
+        results[student_id] = [d.get("code") for d in docs]
+        for d in docs:
+            ops.append(InsertOne({**{k: v for k, v in d.items() if k != "_id"}, "student_id": student_id}))
+
+    try:
+        col_out.bulk_write(ops, ordered=True)
+        print(f"Wrote {len(ops) - 1} qualified rows for {len(specs)} students → Mongo.")
+    except PyMongoError as e:
+        print(f"[WARN] Mongo write failed: {e}")
+
+    Path("out").mkdir(exist_ok=True)
+    with open("out/courses_qualified_batch.json", "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print("Saved backup JSON → out/courses_qualified_batch.json")
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--uri", default=os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
@@ -249,8 +447,13 @@ def main():
     parser.add_argument("--days", type=str, default=None)
     parser.add_argument("--start", type=str, default=None)
     parser.add_argument("--end", type=str, default=None)
+    parser.add_argument("--batch", type=str, default=None,
+                        help="JSON list of per-student filter specs to qualify in one pass")
     args = parser.parse_args()
 
+    if args.batch:
+        run_batch(args.uri, args.batch)
+        return
     run(args.uri, args.min_rating, args.method, args.days, args.start, args.end)
 
 
@@ -13,47 +13,54 @@ Outputs:
 
 import os
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Set
 import re
 from bson import ObjectId
 
-from pymongo import MongoClient
-from pymongo.errors import PyMongoError
-from dotenv import load_dotenv
-
 from track_graduation import track_grad
+from resources import SCRIPT_DIR, get_collection, load_json
 
 # -------------------------------------------------------------------
-# Load synthetic data
+# Synthetic data + Mongo collections (loaded on first use)
 # -------------------------------------------------------------------
 
-SCRIPT_DIR = os.path.dirname(__file__)
 SYNTHETIC_COURSES_PATH = os.path.join(SCRIPT_DIR, "synthetic_courses.json")
 SYNTHETIC_PREF_PATH    = os.path.join(SCRIPT_DIR, "synthetic_pref.json")
 
-with open(SYNTHETIC_COURSES_PATH, "r", encoding="utf-8") as f:
-    _synthetic_courses_list = json.load(f)
 
-with open(SYNTHETIC_PREF_PATH, "r", encoding="utf-8") as f:
-    _synthetic_pref_list = json.load(f)
+@lru_cache(maxsize=None)
+def syn_courses_by_id() -> Dict[str, Dict[str, Any]]:
+    return {str(rec["shared_id"]): rec for rec in load_json(SYNTHETIC_COURSES_PATH)}
 
-SYN_COURSES_BY_ID = {str(rec["shared_id"]): rec for rec in _synthetic_courses_list}
-SYN_PREF_BY_ID    = {str(rec["shared_id"]): rec for rec in _synthetic_pref_list}
 
-# -------------------------------------------------------------------
-# Mongo setup
-# -------------------------------------------------------------------
+@lru_cache(maxsize=None)
+def syn_pref_by_id() -> Dict[str, Dict[str, Any]]:
+    return {str(rec["shared_id"]): rec for rec in load_json(SYNTHETIC_PREF_PATH)}
+
 
-load_dotenv()
-DB_URI = os.getenv("DB_URI")
-if not DB_URI:
-    raise RuntimeError("❌ DB_URI is not set in your .env file")
+def col_enriched():
+    return get_collection("DetailedCourses", "CoursesEnriched")
 
-client = MongoClient(DB_URI)
-DB_DETAILED = client["DetailedCourses"]
-COL_ENRICHED = DB_DETAILED["CoursesEnriched"]
-COL_DETAILED = DB_DETAILED["DetailedCourses"]
+
+def col_detailed():
+    return get_collection("DetailedCourses", "DetailedCourses")
+
+
+# Old module-level names, resolved lazily for existing callers
+_LAZY_ATTRS = {
+    "SYN_COURSES_BY_ID": syn_courses_by_id,
+    "SYN_PREF_BY_ID": syn_pref_by_id,
+    "COL_ENRICHED": col_enriched,
+    "COL_DETAILED": col_detailed,
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        return _LAZY_ATTRS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # -------------------------------------------------------------------
 # Time parsing helpers
@@ -149,11 +156,26 @@ def _normalize_code(code: str) -> str:
     return code.replace(" ", "").upper()
 
 def get_requirements_for_code(code: str) -> Dict[str, Any]:
-    doc = COL_DETAILED.find_one({"code": code}, {"requirements": 1, "_id": 0})
+    doc = col_detailed().find_one({"code": code}, {"requirements": 1, "_id": 0})
     if not doc:
         return {}
     return doc.get("requirements") or {}
 
+def load_catalog():
+    """
+    Fetch everything build_qualified_courses_for_student reads from Mongo in
+    two queries: the CoursesEnriched docs and a code -> requirements map
+    (first doc per code, like get_requirements_for_code's find_one).
+    """
+    source = list(col_enriched().find({}))
+    requirements_by_code = {}
+    for doc in col_detailed().find({}, {"code": 1, "requirements": 1, "_id": 0}):
+        code = doc.get("code")
+        if code and code not in requirements_by_code:
+            requirements_by_code[code] = doc.get("requirements") or {}
+    print(f"[INFO] Loaded {len(source)} enriched docs, {len(requirements_by_code)} requirement entries.")
+    return source, requirements_by_code
+
 def prereqs_satisfied_from_requirements(req: Dict[str, Any], completed_codes: Set[str]) -> bool:
     if not req:
         return True
@@ -198,8 +220,8 @@ def matches_interests(doc: Dict[str, Any], interests: List[str]) -> bool:
 
 def fetch_user_doc(shared_id: str) -> Dict[str, Any]:
     key = str(shared_id)
-    pref = SYN_PREF_BY_ID.get(key)
-    hist = SYN_COURSES_BY_ID.get(key)
+    pref = syn_pref_by_id().get(key)
+    hist = syn_courses_by_id().get(key)
     if pref is None or hist is None:
         raise ValueError(f"No synthetic pref or courses found for ID={key}")
     return {"shared_id": key, "pref": pref, "history": hist}
@@ -250,7 +272,14 @@ def clean_for_json(obj):
 
 def build_qualified_courses_for_student(shared_id: str,
                                         min_rating: float = 0.0,
-                                        instruction_method: str = None):
+                                        instruction_method: str = None,
+                                        catalog=None,
+                                        write_json: bool = True):
+    """
+    catalog: optional (source, requirements_by_code) from load_catalog(), so
+    callers handling many students fetch the catalog once instead of per
+    student and per course.
+    """
     user_doc = fetch_user_doc(shared_id)
     pref = user_doc["pref"]
 
@@ -266,11 +295,15 @@ def build_qualified_courses_for_student(shared_id: str,
 
     due_ger_tags = {tag for d in ger_due for tag in d.keys()}
 
-    try:
-        source = list(COL_ENRICHED.find({}))
-        print(f"[INFO] Loaded {len(source)} docs from DetailedCourses.CoursesEnriched.")
-    except:
-        source = []
+    requirements_by_code = None
+    if catalog is not None:
+        source, requirements_by_code = catalog
+    else:
+        try:
+            source = list(col_enriched().find({}))
+            print(f"[INFO] Loaded {len(source)} docs from DetailedCourses.CoursesEnriched.")
+        except:
+            source = []
 
     qualified = []
 
@@ -299,7 +332,10 @@ def build_qualified_courses_for_student(shared_id: str,
             continue
 
         # e) prereqs
-        req = get_requirements_for_code(code_norm)
+        if requirements_by_code is not None:
+            req = requirements_by_code.get(code_norm) or {}
+        else:
+            req = get_requirements_for_code(code_norm)
         if not prereqs_satisfied_from_requirements(req, completed_codes):
             continue
 
@@ -323,6 +359,9 @@ def build_qualified_courses_for_student(shared_id: str,
 
     print(f"[INFO] For student {shared_id}, {len(qualified)} courses qualified.")
 
+    if not write_json:
+        return qualified
+
     out_dir = Path("out")
     out_dir.mkdir(exist_ok=True)
     out_path = out_dir / f"courses_qualified_{shared_id}.json"
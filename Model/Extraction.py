@@ -23,10 +23,15 @@ import argparse
 import json
 import os
 import re
+import sys
 from typing import Dict, Any, Optional, Tuple, List
 
 from pymongo import MongoClient, UpdateOne
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backEnd"))
+from course_classifier import classification_input, get_classification
+from professor_features import rmp_id_from_url
+
 
 # -----------------------------
 # Normalization helpers
@@ -284,6 +289,9 @@ def normalize_course(raw: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any
         "meeting": meeting,               # parsed for filters/recs
         # rmp filled later
     }
+    # permission / restricted / research flags + classifier version; a current
+    # stamp from prep_pipeline (same merged input) is kept, stale ones recomputed
+    detailed["classification"] = get_classification(classification_input(raw, detailed))
 
     basic = {
         "code": detailed["code"],
@@ -316,6 +324,8 @@ def enrich_with_rmp(detailed: Dict[str, Any], rmp_index: Dict[str, Dict[str, Any
         "would_take_again_pct": _safe_float(rmp.get("would_take_again_%")) if rmp else None,
         "department": rmp.get("department") if rmp else None,
         "url": rmp.get("url") if rmp else None,
+        # key into the professor feature store (scripts/rmp_features.py)
+        "id": rmp_id_from_url(rmp.get("url")) if rmp else None,
     }
     return enriched
 
@@ -25,36 +25,52 @@ Outputs:
 import os
 import json
 import math
+import hashlib
+import multiprocessing
+import shutil
+from datetime import datetime
 from pathlib import Path
 
-import numpy as np
-from sklearn.linear_model import LinearRegression
-import joblib
+import sys
 
-from pymongo import MongoClient
-from pymongo.errors import PyMongoError
+import numpy as np
 
 # Import your existing qualification logic
 from Courses_Qualified_new import (
     build_qualified_courses_for_student,
-    SYN_PREF_BY_ID,   # to get list of synthetic shared_ids
+    load_catalog,
+    syn_pref_by_id,   # to get list of synthetic shared_ids
+    syn_courses_by_id,
 )
+from resources import LOCAL_URI, get_collection
 
-# -------------------- MongoDB Setup --------------------
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backEnd"))
+from professor_features import get_feature_store, course_rmp_id, feature_store_version
 
-from dotenv import load_dotenv
-load_dotenv()
-DB_URI = os.getenv("DB_URI", os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+# -------------------- MongoDB Setup --------------------
+# sklearn, joblib and the Mongo client are only loaded by the functions that
+# use them, so importing this module stays cheap (see bench_startup.py).
 
-client = MongoClient(DB_URI)
-DB_DETAILED = client["DetailedCourses"]
-COL_RECOMMENDED_ML = DB_DETAILED["RecommendedML"]  # new collection
+def col_recommended_ml():
+    return get_collection("DetailedCourses", "RecommendedML", default=LOCAL_URI)  # new collection
 
 OUT_DIR = Path("out")
-OUT_DIR.mkdir(exist_ok=True)
 
 MODEL_PATH = OUT_DIR / "recommender_ml.joblib"
 
+# Dependency-free export read by backEnd/ml_recommendation_engine.py
+COMPILED_MODEL_PATH = OUT_DIR / "recommender_ml.json"
+COMPILED_FORMAT_VERSION = 1
+FEATURE_NAMES = ["rating_norm", "again_norm", "easy_norm", "popularity_norm"]
+
+# backEnd model registry: <dir>/<version>/ plus a CURRENT pointer file
+REGISTRY_DIR = Path(os.getenv(
+    "MODEL_REGISTRY_DIR", Path(__file__).resolve().parent.parent / "backEnd" / "models"
+))
+
+# Model types whose prediction is exactly X @ coef_ + intercept_
+COMPILABLE_MODELS = {"LinearRegression", "Ridge", "Lasso", "ElasticNet"}
+
 
 # -------------------- Helper Functions --------------------
 
@@ -96,7 +112,7 @@ def score_course_rule_based(doc, w_rating=0.55, w_again=0.15, w_easy=0.15, w_pop
 
 
 
-def extract_features_from_doc(doc):
+def extract_features_from_doc(doc, store):
     """
     Build the feature vector used by the ML model.
 
@@ -110,7 +126,17 @@ def extract_features_from_doc(doc):
       - interest match
       - time preference alignment
       etc.
+
+    Courses whose professor is in the precomputed feature store
+    (scripts/rmp_features.py) read their row from it. store is the
+    get_feature_store() result, fetched once by the caller rather than per
+    course; None means no store is built.
     """
+    if store is not None:
+        row = store.index.get(course_rmp_id(doc))
+        if row is not None:
+            return store.features[row].copy()
+
     rmp = doc.get("rmp") or {}
     rating = norm(rmp.get("rating"), 0, 5)
     again = norm(rmp.get("would_take_again_%"), 0, 100)
@@ -125,57 +151,135 @@ def extract_features_from_doc(doc):
 
 # -------------------- Training Data Builder --------------------
 
+TRAINING_CACHE_DIR = OUT_DIR / "training_cache"
+N_FEATURES = len(FEATURE_NAMES)
+
+# Set in each pool worker by _init_training_worker
+_worker_catalog = None
+_worker_params = None
+
+
+def training_inputs_hash(catalog, shared_ids, min_rating, instruction_method):
+    """Hash of everything the training rows depend on: catalog, feature store, synthetic users, filters."""
+    source, requirements_by_code = catalog
+    h = hashlib.sha256()
+    h.update(json.dumps({
+        "features": FEATURE_NAMES,
+        "feature_store": feature_store_version(),
+        "min_rating": min_rating,
+        "instruction_method": instruction_method,
+        "shared_ids": shared_ids,
+    }, sort_keys=True).encode("utf-8"))
+    for shared_id in shared_ids:
+        h.update(json.dumps(syn_pref_by_id().get(shared_id), sort_keys=True, default=str).encode("utf-8"))
+        h.update(json.dumps(syn_courses_by_id().get(shared_id), sort_keys=True, default=str).encode("utf-8"))
+    for doc in source:
+        h.update(json.dumps(doc, sort_keys=True, default=str).encode("utf-8"))
+    h.update(json.dumps(requirements_by_code, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def _init_training_worker(catalog, min_rating, instruction_method):
+    global _worker_catalog, _worker_params
+    _worker_catalog = catalog
+    _worker_params = (min_rating, instruction_method)
+
+
+def _training_rows_for_student(shared_id):
+    """Pool task: [features..., target] rows for one synthetic user."""
+    min_rating, instruction_method = _worker_params
+    try:
+        qualified = build_qualified_courses_for_student(
+            shared_id,
+            min_rating=min_rating,
+            instruction_method=instruction_method,
+            catalog=_worker_catalog,
+            write_json=False,
+        )
+    except Exception as e:
+        print(f"[WARN] Skipping user {shared_id} due to error: {e}")
+        return shared_id, np.zeros((0, N_FEATURES + 1), dtype=np.float64)
+
+    store = get_feature_store()
+    rows = np.empty((len(qualified), N_FEATURES + 1), dtype=np.float64)
+    for i, doc in enumerate(qualified):
+        rows[i, :N_FEATURES] = extract_features_from_doc(doc, store)
+        rows[i, N_FEATURES] = score_course_rule_based(doc)
+    return shared_id, rows
+
+
 def build_training_matrix_from_synthetic(min_rating=0.0,
-                                         instruction_method=None):
+                                         instruction_method=None,
+                                         workers=None,
+                                         use_cache=True):
     """
     Build (X, y) from all synthetic users.
 
-    For each synthetic shared_id:
-      - Get their qualified courses using the existing rule-based pipeline.
-      - For each course:
-          X_row = extract_features_from_doc(doc)
-          y     = score_course_rule_based(doc)
+    The catalog is fetched once and shared with a process pool that builds
+    each user's rows:
+      X_row = extract_features_from_doc(doc, store)
+      y     = score_course_rule_based(doc)
+
+    Rows are streamed to disk as users finish and stored as
+    out/training_cache/<inputs hash>.npy (columns: features..., y). When the
+    catalog, synthetic data and filters are unchanged, that file is
+    memory-mapped and no per-user work is done.
 
     Returns:
       X: shape (n_samples, n_features)
       y: shape (n_samples,)
     """
-    X_rows = []
-    y_rows = []
-
-    shared_ids = sorted(list(SYN_PREF_BY_ID.keys()))
-
-    for shared_id in shared_ids:
-        print(f"[TRAIN] Building examples for synthetic user {shared_id}...")
-
-        try:
-            qualified = build_qualified_courses_for_student(
-                shared_id,
-                min_rating=min_rating,
-                instruction_method=instruction_method,
-            )
-        except Exception as e:
-            print(f"[WARN] Skipping user {shared_id} due to error: {e}")
-            continue
-
-        for doc in qualified:
-            x = extract_features_from_doc(doc)
-            y = score_course_rule_based(doc)
-            X_rows.append(x)
-            y_rows.append(y)
-
-    if not X_rows:
+    shared_ids = sorted(list(syn_pref_by_id().keys()))
+    catalog = load_catalog()
+
+    TRAINING_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    key = training_inputs_hash(catalog, shared_ids, min_rating, instruction_method)
+    dataset_path = TRAINING_CACHE_DIR / f"{key}.npy"
+
+    if use_cache and dataset_path.exists():
+        data = np.load(dataset_path, mmap_mode="r")
+        print(f"[TRAIN] Reusing cached training matrix {dataset_path} shape={data.shape}")
+        return data[:, :N_FEATURES], data[:, N_FEATURES]
+
+    raw_path = TRAINING_CACHE_DIR / f"{key}.rows.tmp"
+    n_rows = 0
+    ctx = multiprocessing.get_context("spawn")  # fresh Mongo clients per worker
+    with raw_path.open("wb") as raw, ctx.Pool(
+        processes=workers,
+        initializer=_init_training_worker,
+        initargs=(catalog, min_rating, instruction_method),
+    ) as pool:
+        # imap keeps user order, so the dataset is identical across runs
+        for shared_id, rows in pool.imap(_training_rows_for_student, shared_ids):
+            print(f"[TRAIN] {shared_id}: {len(rows)} examples")
+            raw.write(rows.tobytes())
+            n_rows += len(rows)
+
+    if n_rows == 0:
+        raw_path.unlink()
         raise RuntimeError("No training data built (X_rows is empty).")
 
-    X = np.vstack(X_rows)
-    y = np.array(y_rows, dtype=float)
-    print(f"[TRAIN] Built training matrix X shape={X.shape}, y shape={y.shape}")
+    # Prepend the .npy header and copy the streamed rows behind it
+    tmp_path = TRAINING_CACHE_DIR / f"{key}.npy.tmp"
+    with tmp_path.open("wb") as out, raw_path.open("rb") as raw:
+        np.lib.format.write_array_header_1_0(out, {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+            "fortran_order": False,
+            "shape": (n_rows, N_FEATURES + 1),
+        })
+        shutil.copyfileobj(raw, out)
+    os.replace(tmp_path, dataset_path)
+    raw_path.unlink()
+
+    data = np.load(dataset_path, mmap_mode="r")
+    X, y = data[:, :N_FEATURES], data[:, N_FEATURES]
+    print(f"[TRAIN] Built training matrix X shape={X.shape}, y shape={y.shape} → {dataset_path}")
     return X, y
 
 
 # -------------------- Training & Saving the Model --------------------
 
-def train_recommender_model(min_rating=0.0, instruction_method=None):
+def train_recommender_model(min_rating=0.0, instruction_method=None, workers=None, use_cache=True):
     """
     Train a simple linear regression model on synthetic data.
 
@@ -186,17 +290,103 @@ def train_recommender_model(min_rating=0.0, instruction_method=None):
     X, y = build_training_matrix_from_synthetic(
         min_rating=min_rating,
         instruction_method=instruction_method,
+        workers=workers,
+        use_cache=use_cache,
     )
 
+    import joblib
+    from sklearn.linear_model import LinearRegression
+
     model = LinearRegression()
     model.fit(X, y)
 
+    OUT_DIR.mkdir(exist_ok=True)
     joblib.dump(model, MODEL_PATH)
     print(f"[TRAIN] Saved trained recommender model → {MODEL_PATH}")
+
+    export_compiled_model(model, training_info={
+        "n_samples": int(X.shape[0]),
+        "r2": float(model.score(X, y)),
+        "min_rating": min_rating,
+        "instruction_method": instruction_method,
+    })
     return model
 
 
+def export_compiled_model(model, path=COMPILED_MODEL_PATH, training_info=None):
+    """
+    Write a linear model as plain JSON (coefficients, intercept, feature
+    schema, training metadata) so serving can score with NumPy alone.
+
+    Returns the written path, or None when the model type can't be compiled
+    (serving then keeps using the joblib file).
+    """
+    import sklearn
+
+    model_type = type(model).__name__
+    if model_type not in COMPILABLE_MODELS:
+        print(f"[TRAIN] {model_type} has no compiled form; serving will use {MODEL_PATH}")
+        return None
+
+    coef = np.asarray(model.coef_, dtype=float).ravel()
+    if coef.shape[0] != len(FEATURE_NAMES):
+        print(f"[TRAIN] Expected {len(FEATURE_NAMES)} coefficients, got {coef.shape[0]}; not compiling")
+        return None
+
+    trained_at = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    artifact = {
+        "format_version": COMPILED_FORMAT_VERSION,
+        "model_type": model_type,
+        "model_version": trained_at,
+        "features": FEATURE_NAMES,
+        "coef": coef.tolist(),
+        "intercept": float(np.asarray(model.intercept_, dtype=float).ravel()[0]),
+        "training": {
+            "trained_at": trained_at,
+            "sklearn_version": sklearn.__version__,
+            **(training_info or {}),
+        },
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(artifact, f, indent=2)
+    os.replace(tmp_path, path)
+    print(f"[TRAIN] Saved compiled model → {path}")
+    return path
+
+
+def publish_model(version=None, registry_dir=REGISTRY_DIR):
+    """
+    Copy the current artifacts into <registry_dir>/<version>/ and repoint
+    CURRENT at it. The pointer is replaced atomically, so a running server's
+    watcher either sees the old version or the complete new one.
+    """
+    if version is None and COMPILED_MODEL_PATH.exists():
+        with COMPILED_MODEL_PATH.open("r", encoding="utf-8") as f:
+            version = json.load(f).get("model_version")
+    version = version or datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+
+    registry_dir = Path(registry_dir)
+    version_dir = registry_dir / version
+    version_dir.mkdir(parents=True, exist_ok=True)
+    for artifact in (COMPILED_MODEL_PATH, MODEL_PATH):
+        if artifact.exists():
+            shutil.copy2(artifact, version_dir / artifact.name)
+
+    pointer = registry_dir / "CURRENT"
+    tmp_pointer = registry_dir / "CURRENT.tmp"
+    tmp_pointer.write_text(version + "\n", encoding="utf-8")
+    os.replace(tmp_pointer, pointer)
+    print(f"[TRAIN] Published model {version} → {version_dir}")
+    return version
+
+
 def load_recommender_model():
+    import joblib
+
     if not MODEL_PATH.exists():
         raise FileNotFoundError(
             f"Model file {MODEL_PATH} not found – run train_recommender_model() first."
@@ -210,7 +400,8 @@ def recommend_for_student_ml(shared_id: str,
                              top_n: int = 10,
                              min_rating: float = 0.0,
                              instruction_method: str | None = None,
-                             use_trained_model: bool = True):
+                             use_trained_model: bool = True,
+                             catalog=None):
     """
     Main entry point, analogous to Recommended_Courses.run but per-student and ML-based.
 
@@ -222,12 +413,15 @@ def recommend_for_student_ml(shared_id: str,
       5) Write to MongoDB and JSON backup.
 
     Returns: list of top_n recommended course docs (with 'score_ml' added).
+
+    catalog: optional load_catalog() result, passed through to the qualifier.
     """
     # 1) Build qualified set exactly as your current system does
     qualified = build_qualified_courses_for_student(
         shared_id,
         min_rating=min_rating,
         instruction_method=instruction_method,
+        catalog=catalog,
     )
 
     if not qualified:
@@ -242,9 +436,10 @@ def recommend_for_student_ml(shared_id: str,
         model = None
 
     # 3) Score each course
+    store = get_feature_store()
     scored = []
     for doc in qualified:
-        x = extract_features_from_doc(doc)
+        x = extract_features_from_doc(doc, store)
 
         if model is not None:
             # ML prediction
@@ -307,15 +502,18 @@ def recommend_for_student_ml(shared_id: str,
 
 
     # 4) Save to MongoDB (per-student)
+    from pymongo.errors import PyMongoError
     try:
-        COL_RECOMMENDED_ML.delete_many({"shared_id": str(shared_id)})
+        col = col_recommended_ml()
+        col.delete_many({"shared_id": str(shared_id)})
         if top:
-            COL_RECOMMENDED_ML.insert_many(top)
+            col.insert_many(top)
         print(f"[INFO] Wrote {len(top)} ML recommendations → DetailedCourses.RecommendedML.")
     except PyMongoError as e:
         print(f"[WARN] Mongo write failed: {e}")
 
     # 5) Save JSON backup
+    OUT_DIR.mkdir(exist_ok=True)
     out_path = OUT_DIR / f"recommended_{shared_id}_ml.json"
     with out_path.open("w", encoding="utf-8") as f:
         for d in top:
@@ -336,15 +534,33 @@ if __name__ == "__main__":
     parser.add_argument("--top", type=int, default=10)
     parser.add_argument("--train", action="store_true",
                         help="If set, train model first on synthetic data.")
+    parser.add_argument("--export", action="store_true",
+                        help="Compile the existing joblib model to JSON and exit.")
+    parser.add_argument("--publish", action="store_true",
+                        help="After training/exporting, publish the artifacts to the model registry.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to build training rows (default: CPU count).")
+    parser.add_argument("--no_cache", action="store_true",
+                        help="Rebuild the training matrix even if a cached one matches.")
     parser.add_argument("--min_rating", type=float, default=0.0)
     parser.add_argument("--instruction_method", type=str, default=None)
     args = parser.parse_args()
 
+    if args.export:
+        export_compiled_model(load_recommender_model())
+        if args.publish:
+            publish_model()
+        raise SystemExit(0)
+
     if args.train:
         train_recommender_model(
             min_rating=args.min_rating,
             instruction_method=args.instruction_method,
+            workers=args.workers,
+            use_cache=not args.no_cache,
         )
+        if args.publish:
+            publish_model()
 
     recommend_for_student_ml(
         shared_id=args.shared_id,
@@ -8,20 +8,43 @@ Builds a conflict-free final schedule for a student by combining:
   - GER due, major requirements, CS electives, interests, and time preferences
   - Time conflict avoidance and credit caps
 
+Scoring and conflict checks run as column operations over integer meeting
+columns (start_min, end_min, a day bitmask) added once per ranked frame.
+
 Usage (CLI):
 
   python Schedule_Builder.py --shared_id 000005 --n_courses 5 --top_n 200
+  python Schedule_Builder.py --all --n_courses 5      # whole synthetic population
+
+--all scores the catalog once and ranks every student with array operations
+(get_schedules_for_population); it gives the same schedules as calling
+get_schedule per student, without the per-student model load and writes.
 """
 
 from __future__ import annotations
 
 import argparse
+import time
 from typing import List, Dict, Any
 
+import numpy as np
 import pandas as pd
 
-from Recommended_Courses import recommend_for_student_ml
-from Courses_Qualified_new import fetch_user_doc
+from Recommended_Courses import (
+    FEATURE_NAMES,
+    extract_features_from_doc,
+    get_feature_store,
+    load_recommender_model,
+    recommend_for_student_ml,
+)
+from Courses_Qualified_new import (
+    _normalize_code,
+    fetch_user_doc,
+    load_catalog,
+    parse_unavailable_blocks,
+    run_track_grad_for_user,
+    syn_pref_by_id,
+)
 
 
 # -------------------- Time helpers --------------------
@@ -87,6 +110,79 @@ def score_time(course_doc: Dict[str, Any] | pd.Series,
     return max(0.0, 1.0 - penalty)
 
 
+def score_time_columns(start: np.ndarray,
+                       end: np.ndarray,
+                       time_pref: List[str]) -> np.ndarray:
+    """
+    Column version of score_time over float minute arrays (NaN = unknown).
+    """
+    scores = np.full(len(start), 0.5)
+    if not time_pref or len(time_pref) < 2:
+        return scores
+
+    pref_start = hhmm_to_min(time_pref[0])
+    pref_end = hhmm_to_min(time_pref[1])
+    if pref_start is None or pref_end is None:
+        return scores
+
+    known = ~(np.isnan(start) | np.isnan(end))
+    s = np.where(known, start, 0.0)
+    e = np.where(known, end, 0.0)
+
+    overlap = np.maximum(0.0, np.minimum(e, pref_end) - np.maximum(s, pref_start))
+    duration = np.maximum(0.0, e - s)
+    inside = (duration > 0) & (overlap > 0)
+
+    distance = np.where(s < pref_start, pref_start - s, s - pref_end)
+    penalty = np.minimum(1.0, distance / 120)  # up to 2 hours
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        overlap_score = 0.7 + 0.3 * (overlap / duration)
+    scores = np.where(inside, overlap_score, np.maximum(0.0, 1.0 - penalty))
+    return np.where(known, scores, 0.5)
+
+
+def meeting_arrays(meetings, day_bits: Dict[str, int]):
+    """
+    Meeting dicts -> (start_min, end_min, day_mask) arrays. Times are float
+    with NaN when unknown; day_bits assigns one bit per distinct day token and
+    is extended in place, so callers can share it (0 = no days).
+    """
+    starts, ends, masks = [], [], []
+    for mtg in meetings:
+        mtg = mtg if isinstance(mtg, dict) else {}
+        start, end = mtg.get("start_min"), mtg.get("end_min")
+        starts.append(np.nan if start is None else start)
+        ends.append(np.nan if end is None else end)
+        mask = 0
+        for d in mtg.get("days") or []:
+            mask |= day_bits.setdefault(d, 1 << len(day_bits))
+        masks.append(mask)
+    return np.array(starts, dtype=float), np.array(ends, dtype=float), np.array(masks, dtype=np.int64)
+
+
+def add_meeting_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Parse each row's meeting dict once into start_min / end_min (float, NaN
+    when unknown) and day_mask (one bit per distinct day token, 0 = no days).
+    """
+    meetings = df["meeting"] if "meeting" in df.columns else pd.Series([None] * len(df))
+    starts, ends, masks = meeting_arrays(meetings, {})
+
+    df = df.copy()
+    df["start_min"] = starts
+    df["end_min"] = ends
+    df["day_mask"] = masks
+    return df
+
+
+def _credits_value(raw: Any) -> float:
+    try:
+        return float(3.0 if raw is None else raw)
+    except Exception:
+        return 3.0
+
+
 # -------------------- Preference-aware ranking --------------------
 
 def is_cs(code: Any) -> bool:
@@ -94,7 +190,8 @@ def is_cs(code: Any) -> bool:
 
 
 def compute_preference_scores(shared_id: str,
-                              top_n: int = 200) -> pd.DataFrame:
+                              top_n: int = 200,
+                              catalog=None) -> pd.DataFrame:
     """
     1) Calls recommend_for_student_ml(shared_id, top_n) to get ML-scored courses.
     2) Loads the student's preferences (priorityOrder, timePreference, etc.).
@@ -102,14 +199,16 @@ def compute_preference_scores(shared_id: str,
          - GER, MAJOR, PROFESSOR_RATING (score_ml), INTERESTS, TIME_PREFERENCE
     4) Combines them into a single total_score using priorityOrder as weights.
     5) Returns a DataFrame sorted by total_score descending.
+
+    catalog: optional load_catalog() result shared across students.
     """
     # 1) ML-based recommendations (this also writes a JSON backup for transparency)
-    recs = recommend_for_student_ml(shared_id, top_n=top_n)
+    recs = recommend_for_student_ml(shared_id, top_n=top_n, catalog=catalog)
 
     if not recs:
         return pd.DataFrame()
 
-    df = pd.DataFrame(recs)
+    df = add_meeting_columns(pd.DataFrame(recs))
 
     # 2) Student preferences from synthetic_pref.json via fetch_user_doc
     user_doc = fetch_user_doc(shared_id)
@@ -126,25 +225,48 @@ def compute_preference_scores(shared_id: str,
         # fallback: no GER_due info → all empty lists
         ger_series = pd.Series([[] for _ in range(len(df))])
 
-    ger_scores = ger_series.apply(lambda lst: 1.0 if lst else 0.0)
+    ger_scores = ger_series.map(bool).to_numpy(dtype=float)
 
-    def major_score_row(row: pd.Series) -> float:
-        if row.get("reason_major_must"):
-            return 1.0
-        if row.get("reason_major_elec") or is_cs(row.get("code")):
-            # treat CS + major_elec as “good for major” but slightly less than must
-            return 0.8
-        return 0.0
+    def flag(column: str) -> np.ndarray:
+        if column not in df.columns:
+            return np.zeros(len(df), dtype=bool)
+        return df[column].map(bool).to_numpy(dtype=bool)
 
-    major_scores = df.apply(major_score_row, axis=1)
-    interest_scores = df["reason_interest"].apply(lambda v: 1.0 if v else 0.0)
-    time_scores = df.apply(lambda row: score_time(row, time_pref), axis=1)
-    prof_scores = df["score_ml"]  # output of the ML model
+    # Must → 1.0; major elective or any CS course → 0.8 (good for the major,
+    # slightly less than must); everything else → 0.0
+    codes = df.get("code", pd.Series([None] * len(df), index=df.index, dtype=object))
+    cs_mask = codes.map(is_cs).to_numpy(dtype=bool)
+    major_scores = np.where(
+        flag("reason_major_must"), 1.0,
+        np.where(flag("reason_major_elec") | cs_mask, 0.8, 0.0),
+    )
+    interest_scores = flag("reason_interest").astype(float)
+    time_scores = score_time_columns(df["start_min"].to_numpy(), df["end_min"].to_numpy(), time_pref)
+    prof_scores = df["score_ml"].to_numpy(dtype=float)  # output of the ML model
 
     # 4) priorityOrder → weights
-    # Recognized keys:
-    #   GER_REQUIREMENTS, MAJOR_REQUIREMENTS, PROFESSOR_RATING,
-    #   INTERESTS, TIME_PREFERENCE
+    weights = priority_weights(priority_order)
+
+    # 5) total_score
+    df["total_score"] = (
+        weights["GER_REQUIREMENTS"] * ger_scores +
+        weights["MAJOR_REQUIREMENTS"] * major_scores +
+        weights["PROFESSOR_RATING"] * prof_scores +
+        weights["INTERESTS"] * interest_scores +
+        weights["TIME_PREFERENCE"] * time_scores
+    )
+
+    # stable, so ties keep the ML ordering (same as the population path)
+    df = df.sort_values("total_score", ascending=False, kind="stable").reset_index(drop=True)
+    return df
+
+
+def priority_weights(priority_order: List[str]) -> Dict[str, float]:
+    """
+    priorityOrder → weight per recognized key:
+      GER_REQUIREMENTS, MAJOR_REQUIREMENTS, PROFESSOR_RATING,
+      INTERESTS, TIME_PREFERENCE
+    """
     weights = {
         "GER_REQUIREMENTS": 0.0,
         "MAJOR_REQUIREMENTS": 0.0,
@@ -168,21 +290,62 @@ def compute_preference_scores(shared_id: str,
     for rank, key in enumerate(priority_order):
         if key in weights and rank < len(PRIORITY_LEVELS):
             weights[key] = PRIORITY_LEVELS[rank]
+    return weights
 
-    # 5) total_score
-    df["total_score"] = (
-        weights["GER_REQUIREMENTS"] * ger_scores +
-        weights["MAJOR_REQUIREMENTS"] * major_scores +
-        weights["PROFESSOR_RATING"] * prof_scores +
-        weights["INTERESTS"] * interest_scores +
-        weights["TIME_PREFERENCE"] * time_scores
-    )
 
-    df = df.sort_values("total_score", ascending=False).reset_index(drop=True)
-    return df
+# -------------------- Schedule builder (no time conflicts) --------------------
 
+def select_non_conflicting(order: np.ndarray,
+                           starts: np.ndarray,
+                           ends: np.ndarray,
+                           masks: np.ndarray,
+                           codes: np.ndarray,
+                           credits: np.ndarray,
+                           cap: float,
+                           n_courses: int) -> List[int]:
+    """
+    Walk row indices in `order` (best first) and keep each row that fits the
+    credit cap, repeats no course code and overlaps no kept meeting. Rows in
+    `order` must have known times and a non-zero day mask.
+    """
+    # Interval arrays of the courses chosen so far
+    sel_start = np.empty(n_courses)
+    sel_end = np.empty(n_courses)
+    sel_mask = np.empty(n_courses, dtype=np.int64)
+
+    selected_rows: List[int] = []
+    total_credits = 0.0
+    # avoid repeats like two MATH112s
+    used_codes: set[str] = set()
+
+    for i in order:
+        k = len(selected_rows)
+        if k >= n_courses:
+            break
+
+        code = codes[i]
+        if isinstance(code, str) and code in used_codes:
+            continue
+
+        # credit cap check
+        if total_credits + credits[i] > cap:
+            continue
+
+        # time conflict: shares a day and max(starts) < min(ends)
+        if k and np.any(
+            ((sel_mask[:k] & masks[i]) != 0)
+            & (np.maximum(sel_start[:k], starts[i]) < np.minimum(sel_end[:k], ends[i]))
+        ):
+            continue
+
+        sel_start[k], sel_end[k], sel_mask[k] = starts[i], ends[i], masks[i]
+        selected_rows.append(int(i))
+        total_credits += credits[i]
+        if isinstance(code, str):
+            used_codes.add(code)
+
+    return selected_rows
 
-# -------------------- Schedule builder (no time conflicts) --------------------
 
 def build_schedule_from_ranked(df_ranked: pd.DataFrame,
                                shared_id: str,
@@ -200,71 +363,27 @@ def build_schedule_from_ranked(df_ranked: pd.DataFrame,
 
     user_doc = fetch_user_doc(shared_id)
     pref = user_doc.get("pref", {})
-    pref_cred = pref.get("preferredCredits") or 16
+    cap = float(pref.get("preferredCredits") or 16) + 1e-6
 
-    selected_rows = []
-    total_credits = 0.0
-    # schedule_blocks[day] = list of (start, end) for already chosen courses
-    schedule_blocks: Dict[str, List[tuple[int, int]]] = {}
-    # 👇 NEW: track which course codes we've already selected
-    used_codes: set[str] = set()
-
-    for _, row in df_ranked.iterrows():
-        if len(selected_rows) >= n_courses:
-            break
+    if "day_mask" not in df_ranked.columns:
+        df_ranked = add_meeting_columns(df_ranked)
 
-        code = row.get("code")
-        # skip if we've already chosen this course code (avoid repeats like two MATH112s)
-        if isinstance(code, str) and code in used_codes:
-            continue
+    # Only rows with a usable meeting time can be scheduled
+    starts = df_ranked["start_min"].to_numpy()
+    ends = df_ranked["end_min"].to_numpy()
+    masks = df_ranked["day_mask"].to_numpy()
+    candidates = np.flatnonzero(~np.isnan(starts) & ~np.isnan(ends) & (masks != 0))
 
-        mtg = row.get("meeting") or {}
-        days = mtg.get("days") or []
-        start = mtg.get("start_min")
-        end = mtg.get("end_min")
+    codes = df_ranked["code"].to_numpy() if "code" in df_ranked.columns else np.full(len(df_ranked), None)
+    credits_col = df_ranked["credits"] if "credits" in df_ranked.columns else pd.Series([None] * len(df_ranked))
+    credits = np.array([_credits_value(c) for c in credits_col], dtype=float)
 
-        # skip if we have no usable meeting time
-        if start is None or end is None or not days:
-            continue
-
-        # credits
-        try:
-            credits = float(row.get("credits", 3.0))
-        except Exception:
-            credits = 3.0
-
-        # credit cap check
-        if total_credits + credits > float(pref_cred) + 1e-6:
-            continue
-
-        # time conflict check
-        conflict = False
-        for d in days:
-            blocks = schedule_blocks.get(d, [])
-            for (s, e) in blocks:
-                # intervals overlap iff max starts < min ends
-                if max(s, start) < min(e, end):
-                    conflict = True
-                    break
-            if conflict:
-                break
-
-        if conflict:
-            continue
-
-        # accept this course
-        selected_rows.append(row)
-        total_credits += credits
-        if isinstance(code, str):
-            used_codes.add(code)
-
-        for d in days:
-            schedule_blocks.setdefault(d, []).append((start, end))
+    selected_rows = select_non_conflicting(candidates, starts, ends, masks, codes, credits, cap, n_courses)
 
     if not selected_rows:
         return pd.DataFrame()
 
-    schedule = pd.DataFrame(selected_rows).reset_index(drop=True)
+    schedule = df_ranked.iloc[selected_rows].reset_index(drop=True)
     schedule["slot"] = range(1, len(schedule) + 1)
 
     # You can adjust which columns to show in the final table
@@ -283,14 +402,15 @@ def build_schedule_from_ranked(df_ranked: pd.DataFrame,
 
 def get_schedule(shared_id: str,
                  n_courses: int = 5,
-                 top_n_candidates: int = 200) -> pd.DataFrame:
+                 top_n_candidates: int = 200,
+                 catalog=None) -> pd.DataFrame:
     """
     Main public function.
 
     1) Compute preference-aware scores for many candidate courses.
     2) Build a conflict-free schedule from the top-ranked candidates.
     """
-    df_ranked = compute_preference_scores(shared_id, top_n=top_n_candidates)
+    df_ranked = compute_preference_scores(shared_id, top_n=top_n_candidates, catalog=catalog)
     if df_ranked.empty:
         print(f"[INFO] No ranked courses for student {shared_id}.")
         return pd.DataFrame()
@@ -301,18 +421,245 @@ def get_schedule(shared_id: str,
     return schedule
 
 
+# -------------------- Whole-population path --------------------
+
+SCHEDULE_COLUMNS = ["slot", "code", "title", "meeting", "credits", "total_score"]
+
+
+class CatalogArrays:
+    """
+    The catalog as arrays, built once per population run.
+
+    The ML score depends only on the course, so the model is loaded once and
+    every course is scored with a single predict() call. Meeting times,
+    credits, ratings and the prereq groups become arrays / incidence matrices,
+    so each student's qualification and ranking are mask operations instead
+    of a Python loop over courses.
+    """
+
+    def __init__(self, catalog, model, min_rating: float = 0.0,
+                 instruction_method: str | None = None):
+        source, requirements_by_code = catalog
+        self.docs = [doc for doc in source if doc.get("code")]
+        n = len(self.docs)
+        self.codes = np.array([doc["code"] for doc in self.docs], dtype=object)
+
+        store = get_feature_store()
+        features = (np.vstack([extract_features_from_doc(doc, store) for doc in self.docs])
+                    if n else np.zeros((0, len(FEATURE_NAMES))))
+        self.score_ml = np.asarray(model.predict(features), dtype=float) if n else np.zeros(0)
+
+        self.day_bits: Dict[str, int] = {}
+        self.starts, self.ends, self.masks = meeting_arrays(
+            [doc.get("meeting") for doc in self.docs], self.day_bits)
+        self.schedulable = ~np.isnan(self.starts) & ~np.isnan(self.ends) & (self.masks != 0)
+        self.credits = np.array([_credits_value(doc.get("credits")) for doc in self.docs], dtype=float)
+        self.is_cs = np.array([is_cs(c) for c in self.codes], dtype=bool)
+        # the qualifier never sets reason_ger_due, so like the per-student path
+        # this only sees a value already stored on the catalog doc
+        self.ger_due = np.array([bool(doc.get("reason_ger_due")) for doc in self.docs], dtype=bool)
+
+        # filters that do not depend on the student
+        rating = np.array([(doc.get("rmp") or {}).get("rating") or 0 for doc in self.docs], dtype=float)
+        self.static_ok = rating >= min_rating
+        if instruction_method:
+            methods = np.array([(doc.get("instruction_method") or "").lower() for doc in self.docs])
+            self.static_ok &= methods == instruction_method.lower()
+
+        self.rows_by_code: Dict[str, List[int]] = {}
+        for i, code in enumerate(self.codes):
+            self.rows_by_code.setdefault(code, []).append(i)
+
+        # prereqs: group x code incidence and group -> course row
+        vocab: Dict[str, int] = {}
+        group_codes, group_rows = [], []
+        for i, doc in enumerate(self.docs):
+            req = requirements_by_code.get(_normalize_code(doc["code"])) or {}
+            for group in req.get("prereq") or []:
+                if not group:
+                    continue
+                group_codes.append([vocab.setdefault(_normalize_code(c), len(vocab)) for c in group])
+                group_rows.append(i)
+        self.prereq_vocab = vocab
+        self.group_codes = np.zeros((len(group_codes), len(vocab)), dtype=np.float32)
+        for g, cols in enumerate(group_codes):
+            self.group_codes[g, cols] = 1
+        self.group_rows = np.zeros((len(group_codes), n), dtype=np.float32)
+        self.group_rows[np.arange(len(group_rows)), group_rows] = 1
+
+        titles = [(doc.get("title") or "").lower() for doc in self.docs]
+        descs = [(doc.get("description") or "").lower() for doc in self.docs]
+        self._text = list(zip(titles, descs))
+        self._keyword_hits: Dict[str, np.ndarray] = {}
+
+    def code_mask(self, codes) -> np.ndarray:
+        mask = np.zeros(len(self.docs), dtype=bool)
+        for code in codes:
+            mask[self.rows_by_code.get(code, [])] = True
+        return mask
+
+    def interest_mask(self, interests: List[str]) -> np.ndarray:
+        """matches_interests over the catalog, one scan per distinct keyword."""
+        mask = np.zeros(len(self.docs), dtype=bool)
+        for kw in interests or []:
+            kw = kw.lower()
+            hits = self._keyword_hits.get(kw)
+            if hits is None:
+                hits = self._keyword_hits[kw] = np.array(
+                    [kw in title or kw in desc for title, desc in self._text], dtype=bool)
+            mask |= hits
+        return mask
+
+    def prereqs_unmet(self, completed: List[set]) -> np.ndarray:
+        """students x courses: True where some prereq group has none of the student's courses."""
+        done = np.zeros((len(completed), len(self.prereq_vocab)), dtype=np.float32)
+        for s, codes in enumerate(completed):
+            cols = [self.prereq_vocab[c] for c in {_normalize_code(c) for c in codes} if c in self.prereq_vocab]
+            done[s, cols] = 1
+        group_missing = (done @ self.group_codes.T) == 0          # students x groups
+        return (group_missing.astype(np.float32) @ self.group_rows) > 0
+
+    def unavailable_conflicts(self, blocks) -> np.ndarray:
+        """course_conflicts_with_unavailable for every course against one student's blocks."""
+        conflict = np.zeros(len(self.docs), dtype=bool)
+        for blk in blocks:
+            bit = self.day_bits.get(blk["day"], 0)
+            if not bit:
+                continue
+            conflict |= (((self.masks & bit) != 0)
+                         & (np.maximum(self.starts, blk["start_min"]) < np.minimum(self.ends, blk["end_min"])))
+        return conflict
+
+
+def rank_population(table: CatalogArrays,
+                    shared_ids: List[str],
+                    top_n_candidates: int = 200):
+    """
+    Yield (shared_id, ranked row indices, total scores) per student, matching
+    recommend_for_student_ml + compute_preference_scores on the same catalog:
+    qualification and the sub-scores are computed as students x courses
+    matrices, then each student keeps the top_n by bucket / score_ml and is
+    re-ranked by total_score.
+    """
+    users = [fetch_user_doc(sid) for sid in shared_ids]
+    n_students, n_courses = len(users), len(table.docs)
+
+    completed, must, elective, blocks_by_student = [], [], [], []
+    for user_doc in users:
+        major_must, major_elec_groups, _, _, completed_codes = run_track_grad_for_user(user_doc)
+        completed.append(completed_codes)
+        must.append(table.code_mask(major_must))
+        elective.append(table.code_mask({c for g in major_elec_groups for c in g.get("courses", [])}))
+        blocks_by_student.append(parse_unavailable_blocks(user_doc["pref"].get("timeUnavailable", [])))
+
+    qualified = np.broadcast_to(table.static_ok, (n_students, n_courses)).copy()
+    qualified &= ~table.prereqs_unmet(completed)
+    for s in range(n_students):
+        qualified[s] &= ~table.code_mask(completed[s])
+        qualified[s] &= ~table.unavailable_conflicts(blocks_by_student[s])
+
+    must = np.array(must, dtype=bool).reshape(n_students, n_courses)
+    elective = np.array(elective, dtype=bool).reshape(n_students, n_courses)
+    interest = np.array([table.interest_mask(u["pref"].get("interests", [])) for u in users],
+                        dtype=bool).reshape(n_students, n_courses)
+
+    # recommend_for_student_ml buckets: GER due, major must, major elective / CS, other
+    bucket = np.where(table.ger_due, 0, np.where(must, 1, np.where(elective | table.is_cs, 2, 3)))
+
+    # compute_preference_scores sub-scores as students x courses matrices
+    major_scores = np.where(must, 1.0, np.where(elective | table.is_cs, 0.8, 0.0))
+    time_by_pref: Dict[tuple, np.ndarray] = {}
+    totals = np.empty((n_students, n_courses))
+    for s, user_doc in enumerate(users):
+        pref = user_doc["pref"]
+        time_pref = tuple(pref.get("timePreference", []) or [])
+        if time_pref not in time_by_pref:
+            time_by_pref[time_pref] = score_time_columns(table.starts, table.ends, list(time_pref))
+        w = priority_weights(pref.get("priorityOrder", []) or [])
+        totals[s] = (w["GER_REQUIREMENTS"] * table.ger_due +
+                     w["MAJOR_REQUIREMENTS"] * major_scores[s] +
+                     w["PROFESSOR_RATING"] * table.score_ml +
+                     w["INTERESTS"] * interest[s] +
+                     w["TIME_PREFERENCE"] * time_by_pref[time_pref])
+
+    for s, shared_id in enumerate(shared_ids):
+        rows = np.flatnonzero(qualified[s])
+        top = rows[np.lexsort((-table.score_ml[rows], bucket[s, rows]))][:top_n_candidates]
+        ranked = top[np.argsort(-totals[s, top], kind="stable")]
+        yield shared_id, ranked, totals[s, ranked]
+
+
+def get_schedules_for_population(shared_ids: List[str] | None = None,
+                                 n_courses: int = 5,
+                                 top_n_candidates: int = 200,
+                                 min_rating: float = 0.0,
+                                 instruction_method: str | None = None) -> Dict[str, pd.DataFrame]:
+    """
+    Build schedules for many synthetic students in one pass.
+
+    The catalog is fetched and scored once (see CatalogArrays); each student
+    then gets the same ranking get_schedule would produce and the same
+    interval selection over it. Unlike get_schedule, nothing is written to
+    RecommendedML or out/ per student.
+    """
+    if shared_ids is None:
+        shared_ids = sorted(syn_pref_by_id())
+
+    started = time.perf_counter()
+    table = CatalogArrays(load_catalog(), load_recommender_model(), min_rating, instruction_method)
+    prepared = time.perf_counter()
+
+    schedules = {}
+    for shared_id, ranked, totals in rank_population(table, shared_ids, top_n_candidates):
+        pref = fetch_user_doc(shared_id).get("pref", {})
+        cap = float(pref.get("preferredCredits") or 16) + 1e-6
+        keep = table.schedulable[ranked]
+        rows = select_non_conflicting(ranked[keep], table.starts, table.ends, table.masks,
+                                      table.codes, table.credits, cap, n_courses)
+        if not rows:
+            schedules[shared_id] = pd.DataFrame()
+            continue
+        score_by_row = dict(zip(ranked.tolist(), totals.tolist()))
+        docs = [table.docs[i] for i in rows]
+        schedules[shared_id] = pd.DataFrame({
+            "slot": range(1, len(rows) + 1),
+            "code": [doc.get("code") for doc in docs],
+            "title": [doc.get("title") for doc in docs],
+            # object columns, as in the per-student frame (no None -> NaN)
+            "meeting": pd.Series([doc.get("meeting") for doc in docs], dtype=object),
+            "credits": pd.Series([doc.get("credits") for doc in docs], dtype=object),
+            "total_score": [score_by_row[i] for i in rows],
+        }, columns=SCHEDULE_COLUMNS)
+
+    elapsed = time.perf_counter() - started
+    print(f"[INFO] Built {len(schedules)} schedules in {elapsed:.2f}s "
+          f"(catalog of {len(table.docs)} courses scored in {prepared - started:.2f}s).")
+    return schedules
+
+
 # -------------------- CLI --------------------
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--shared_id", type=str, required=True,
+    parser.add_argument("--shared_id", type=str,
                         help="Synthetic shared_id of the student (e.g., '000005').")
+    parser.add_argument("--all", action="store_true",
+                        help="Build schedules for every synthetic student.")
     parser.add_argument("--n_courses", type=int, default=5,
                         help="Number of courses to include in the final schedule.")
     parser.add_argument("--top_n", type=int, default=200,
                         help="Number of top ML recommendations to consider as candidates.")
     args = parser.parse_args()
 
+    if args.all:
+        schedules = get_schedules_for_population(n_courses=args.n_courses,
+                                                 top_n_candidates=args.top_n)
+        empty = sum(1 for sched in schedules.values() if sched.empty)
+        print(f"{len(schedules) - empty} schedules built, {empty} empty.")
+        return
+    if not args.shared_id:
+        parser.error("--shared_id is required unless --all is given")
+
     schedule = get_schedule(args.shared_id,
                             n_courses=args.n_courses,
                             top_n_candidates=args.top_n)
@@ -0,0 +1,96 @@
+"""
+Startup benchmark for the Model modules.
+
+Imports each module in a fresh interpreter and reports the median import time,
+which heavy dependencies the import pulled in, and whether it created a Mongo
+client or read a synthetic dataset (both should be 0: resources.py defers them
+to first use). Exits non-zero if any import does I/O.
+
+Usage:
+  python bench_startup.py [--repeat 5] [--out out/startup_bench.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+MODULES = [
+    "resources",
+    "track_graduation",
+    "Courses_Qualified_new",
+    "Recommended_Courses",
+    "Schedule_Builder",
+]
+HEAVY = ["pymongo", "sklearn", "joblib", "pandas", "numpy", "dotenv"]
+
+PROBE = """
+import importlib, json, sys, time
+started = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - started
+import resources
+print(json.dumps({
+    "seconds": elapsed,
+    "clients": resources.clients_created(),
+    "datasets": resources.datasets_loaded(),
+    "heavy": [m for m in sys.argv[2].split(",") if m in sys.modules],
+}))
+"""
+
+
+def probe(module: str):
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE, module, ",".join(HEAVY)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["import failed"])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default=None, help="Optional JSON results path")
+    args = parser.parse_args()
+
+    results = {}
+    did_io = False
+    for module in MODULES:
+        runs = [probe(module) for _ in range(args.repeat)]
+        errors = [r["error"] for r in runs if "error" in r]
+        if errors:
+            results[module] = {"error": errors[0]}
+            print(f"{module:24s} import failed: {errors[0]}")
+            continue
+
+        last = runs[-1]
+        results[module] = {
+            "median_ms": round(statistics.median(r["seconds"] for r in runs) * 1000, 2),
+            "clients": last["clients"],
+            "datasets": last["datasets"],
+            "heavy_imports": last["heavy"],
+        }
+        did_io |= bool(last["clients"] or last["datasets"])
+        r = results[module]
+        print(f"{module:24s} {r['median_ms']:8.2f} ms  clients={r['clients']} "
+              f"datasets={r['datasets']}  loads: {', '.join(r['heavy_imports']) or '-'}")
+
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if did_io:
+        print("FAIL: a module created a Mongo client or read a dataset at import time")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Shared, lazily constructed resources for the Model scripts.
+
+Nothing here touches the network or the filesystem at import time: the Mongo
+client is created on the first get_client() call (one per URI, shared by every
+module in the process) and JSON datasets are read on first use and cached.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+SCRIPT_DIR = os.path.dirname(__file__)
+
+
+@lru_cache(maxsize=None)
+def _load_env():
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+# Default for the modules that have always fallen back to a local server
+# (Recommended_Courses, track_graduation); Courses_Qualified_new requires DB_URI
+LOCAL_URI = "mongodb://localhost:27017"
+
+
+def db_uri(default=None):
+    """DB_URI from the environment / .env (MONGODB_URI as a fallback), else default."""
+    _load_env()
+    uri = os.getenv("DB_URI") or os.getenv("MONGODB_URI") or default
+    if not uri:
+        raise RuntimeError("❌ DB_URI is not set in your .env file")
+    return uri
+
+
+@lru_cache(maxsize=None)
+def _client(uri):
+    from pymongo import MongoClient
+    return MongoClient(uri)
+
+
+def get_client(uri=None, default=None):
+    """One shared client per resolved URI."""
+    return _client(uri or db_uri(default))
+
+
+def get_collection(db_name: str, col_name: str, uri=None, default=None):
+    return get_client(uri, default)[db_name][col_name]
+
+
+def clients_created() -> int:
+    """Number of Mongo clients constructed so far (used by bench_startup.py)."""
+    return _client.cache_info().currsize
+
+
+@lru_cache(maxsize=None)
+def load_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def datasets_loaded() -> int:
+    return load_json.cache_info().currsize
@@ -1,19 +1,13 @@
-from pymongo import MongoClient
-import os
-from dotenv import load_dotenv
 from pprint import pprint
-import os
-from dotenv import load_dotenv
-# load_dotenv(os.path.join(os.path.dirname(__file__), '../backEnd/.env'))
-# uri = os.getenv("MONGODB_URI")
-load_dotenv()
-uri = os.getenv("DB_URI")
-client1 = MongoClient(uri) #cluster
-client2 = MongoClient(uri)
-db = client1["BasicCourses"] # database
-col = db["BasicCourses"] #collection
-db2 = client2["DetailedCourses"] # database
-col2 = db2["DetailedCourses"] #collection
+from resources import LOCAL_URI, get_collection
+
+# Collections come from the shared client in resources.py, created on first query
+def basic_col():
+    return get_collection("BasicCourses", "BasicCourses", default=LOCAL_URI)
+
+def detailed_col():
+    return get_collection("DetailedCourses", "DetailedCourses", default=LOCAL_URI)
+
 CSBA_major_dictionary = {
     "must": ["MATH111", "MATH112", "MATH221", "CS170", "CS171", 'CS224', 'CS253',
              'CS255', 'CS326', 'CS350'],
@@ -90,7 +84,7 @@ def getridofZ(course_code):
     return course_code
 def get_regex(pattern):
     query = {"code": {"$regex": pattern}}
-    results = col.find(query, {"_id": 0, "code": 1})
+    results = basic_col().find(query, {"_id": 0, "code": 1})
     return [r["code"] for r in results]
 def track_major(major, courses):
     major_dictionary = None
@@ -134,8 +128,8 @@ def ger_fulfilled(incoming_test, legit_course, countic):
     ic_fulfilled = False
     for course in incoming_test:
         query = {"code": course}
-        result = col.find_one(query, {"_id": 0, "ger": 1})
-        result2 = col2.find_one(query, {"_id": 0, "ger": 1})
+        result = basic_col().find_one(query, {"_id": 0, "ger": 1})
+        result2 = detailed_col().find_one(query, {"_id": 0, "ger": 1})
         ger_tags = None
         if result and result.get("ger"):
             ger_tags = result.get("ger")
@@ -151,8 +145,8 @@ def ger_fulfilled(incoming_test, legit_course, countic):
             ic_fulfilled = True
     for course in legit_course:
         query = {"code": course}
-        result = col.find_one(query, {"_id": 0, "ger": 1})
-        result2 = col2.find_one(query, {"_id": 0, "ger": 1})
+        result = basic_col().find_one(query, {"_id": 0, "ger": 1})
+        result2 = detailed_col().find_one(query, {"_id": 0, "ger": 1})
         if result and result.get("ger") and result.get("ger") != []:
             for ger in result["ger"]:
                 if ger in Blue_GER and Blue_GER[ger] > 0:
@@ -1,6 +1,7 @@
 from playwright.sync_api import sync_playwright
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from permission_pool import add_headless_arguments, check_permissions_headless, headless_options
 import json, re, threading, math, argparse, platform, subprocess, tempfile, time, os, shutil
 
 def detect_campus(location, code):
@@ -177,9 +178,53 @@ def process_batch_visual(courses_batch, tile, slow_mo_ms, total, stats, stats_lo
     return permission_items
 
 
-def run(input_file, output_file, workers, slow_mo, record_video):
+def enrich_visual(unique_list, workers, slow_mo, record_video):
+    """Debug mode: one headed, tiled window per worker, each with a fixed slice."""
+    u = len(unique_list)
+    if workers < 1:
+        workers = 1
+    batch_size = math.ceil(u / workers)
+    batches = [unique_list[i:i + batch_size] for i in range(0, u, batch_size)]
+
+    sw, sh = get_screen_size()
+    tiles = compute_tiles(sw, sh, workers)
+
+    print(f"Workers: {workers}  |  Screen: {sw}x{sh}  |  Tile: ~{tiles[0][1][0]}x{tiles[0][1][1]}  |  slow_mo={slow_mo}ms")
+
+    stats_lock = threading.Lock()
+    stats = {"completed": 0}
+    permission_map = {}
+
+    rec_dir = "videos" if record_video else None
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = []
+        for i, batch in enumerate(batches):
+            tile = tiles[i]
+            futures.append(ex.submit(process_batch_visual, batch, tile, slow_mo, u, stats, stats_lock, rec_dir))
+        for fut in as_completed(futures):
+            for code, campuses, restr in fut.result():
+                permission_map[code] = {"campuses": campuses, "restrictions": restr}
+    return permission_map
+
+
+def enrich_headless(unique_list, options):
+    """Permission checks on pooled headless pages; same result shape as enrich_visual."""
+    codes = [c.get("code") or "" for c in unique_list]
+    permission = check_permissions_headless(codes, query_for=lambda code: code, **options)
+    permission_map = {}
+    for course in unique_list:
+        code = course.get("code") or ""
+        has_permission = permission.get(code, False)
+        permission_map[code] = {"campuses": detect_campus(course.get("location"), code),
+                                "restrictions": detect_restrictions(code, has_permission)}
+    return permission_map
+
+
+def run(input_file, output_file, workers, slow_mo, record_video, visual=False, headless_opts=None):
     print("=" * 60)
-    print("FAST VISUAL ENRICH (TILED, TEMP BACKUP, ATOMIC WRITE)")
+    print("FAST VISUAL ENRICH (TILED, TEMP BACKUP, ATOMIC WRITE)" if visual else
+          "HEADLESS ENRICH (POOLED PAGES, TEMP BACKUP, ATOMIC WRITE)")
     print("=" * 60)
 
     courses = []
@@ -205,30 +250,10 @@ def run(input_file, output_file, workers, slow_mo, record_video):
     shutil.copy2(input_file, backup)
     print(f"Backup (temp): {backup}")
 
-    if workers < 1:
-        workers = 1
-    batch_size = math.ceil(u / workers)
-    batches = [unique_list[i:i + batch_size] for i in range(0, u, batch_size)]
-
-    sw, sh = get_screen_size()
-    tiles = compute_tiles(sw, sh, workers)
-
-    print(f"Workers: {workers}  |  Screen: {sw}x{sh}  |  Tile: ~{tiles[0][1][0]}x{tiles[0][1][1]}  |  slow_mo={slow_mo}ms")
-
-    stats_lock = threading.Lock()
-    stats = {"completed": 0}
-    permission_map = {}
-
-    rec_dir = "videos" if record_video else None
-
-    with ThreadPoolExecutor(max_workers=workers) as ex:
-        futures = []
-        for i, batch in enumerate(batches):
-            tile = tiles[i]
-            futures.append(ex.submit(process_batch_visual, batch, tile, slow_mo, u, stats, stats_lock, rec_dir))
-        for fut in as_completed(futures):
-            for code, campuses, restr in fut.result():
-                permission_map[code] = {"campuses": campuses, "restrictions": restr}
+    if visual:
+        permission_map = enrich_visual(unique_list, workers, slow_mo, record_video)
+    else:
+        permission_map = enrich_headless(unique_list, headless_opts or {})
 
     for c in courses:
         code = c.get("code")
@@ -238,6 +263,8 @@ def run(input_file, output_file, workers, slow_mo, record_video):
         else:
             c["campuses"] = detect_campus(c.get("location"), code)
             c["restrictions"] = detect_restrictions(code, False)
+        # flags stamped before enrichment did not see permission_required
+        c.pop("classification", None)
 
    
     out_path = Path(output_file)
@@ -274,5 +301,7 @@ if __name__ == "__main__":
     ap.add_argument("--workers", type=int, default=12)
     ap.add_argument("--slow-mo", type=int, default=150)
     ap.add_argument("--record-video", action="store_true")
+    add_headless_arguments(ap)
     args = ap.parse_args()
-    run(args.input, args.output, args.workers, args.slow_mo, args.record_video)
+    run(args.input, args.output, args.workers, args.slow_mo, args.record_video,
+        visual=args.visual, headless_opts=headless_options(args))
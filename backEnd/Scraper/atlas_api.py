@@ -0,0 +1,361 @@
+"""
+Response-interception mode for the Atlas class-search scrapers.
+
+The class-search page fills its result list and details panel from FOSE JSON
+calls (api/?page=fose&route=search and route=details). Instead of clicking
+every section and reading the DOM, capture_course() keeps the search and
+first details responses the page fetches anyway and replays the details
+request for the remaining sections (one POST each, no rendering).
+
+snapshots_from_api() turns the captured JSON into the same
+{"course": snapshot, "sections": [snapshot, ...]} shape that
+browser_pool.snapshot_details produces, so the scrapers' parse_course and
+the page cache work unchanged for both sources.
+
+Recorded responses live in fixtures/atlas/responses/;
+`python atlas_api.py --check` re-parses them and diffs the records against
+fixtures/atlas/expected_records.jsonl. It also renders each recorded details
+response into the panel markup fixtures/atlas/index.html builds, reads it back
+the way snapshot_details reads the live DOM, and checks that the DOM path
+yields the same records as the API path.
+"""
+
+import argparse
+import html
+import json
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+
+RESPONSES_DIR = Path(__file__).parent / "fixtures" / "atlas" / "responses"
+EXPECTED_RECORDS = Path(__file__).parent / "fixtures" / "atlas" / "expected_records.jsonl"
+
+
+class CaptureError(Exception):
+    """Interception did not yield usable JSON; the caller falls back to the DOM."""
+
+
+def _is_fose(route: str):
+    return lambda response: "page=fose" in response.url and f"route={route}" in response.url
+
+
+def _code_key(code: str) -> str:
+    return re.sub(r'\s+', ' ', (code or "")).strip().upper()
+
+
+async def capture_course(page, course_code: str, term: str, campus: bool = False,
+                         timeout: int = 8000) -> dict:
+    """
+    Run the normal search + first click while capturing their JSON, then
+    replay the details request for every other section of the course.
+    Returns {"source": "api", "search": ..., "details": [...]}, None when the
+    course is not listed, and raises CaptureError when interception fails.
+    """
+    from browser_pool import search_course
+
+    try:
+        async with page.expect_response(_is_fose("search"), timeout=timeout) as search_info:
+            found = await search_course(page, course_code, term, campus=campus)
+        search = await (await search_info.value).json()
+    except Exception as e:
+        raise CaptureError(f"search response: {str(e)[:100]}")
+    if not found:
+        return None
+
+    rows = [r for r in search.get("results") or [] if _code_key(r.get("code")) == _code_key(course_code)]
+    if not rows:
+        rows = search.get("results") or []
+
+    try:
+        link = page.locator("div.result.result--group-start a.result__link").first
+        async with page.expect_response(_is_fose("details"), timeout=timeout) as details_info:
+            await link.click(timeout=4000)
+        first_response = await details_info.value
+        first = await first_response.json()
+        request = first_response.request
+        post_data = request.post_data or ""
+    except Exception as e:
+        raise CaptureError(f"details response: {str(e)[:100]}")
+
+    first_crn = str(first.get("crn") or "")
+    sections = first.get("allInGroup") or rows
+    details = [first]
+    for s in sections:
+        crn = str(s.get("crn") or "")
+        if not crn or crn == first_crn:
+            continue
+        if not first_crn or first_crn not in post_data:
+            raise CaptureError("cannot rewrite details request for other sections")
+        try:
+            resp = await page.request.post(request.url, data=post_data.replace(first_crn, crn),
+                                           headers={"Content-Type": request.headers.get("content-type", "application/json")})
+            details.append(await resp.json())
+        except Exception as e:
+            raise CaptureError(f"details replay for {crn}: {str(e)[:100]}")
+
+    return {"source": "api", "search": {**search, "results": rows}, "details": details}
+
+
+# -------------------- JSON -> snapshots --------------------
+
+def strip_html(value) -> str:
+    """HTML fragment -> text, one line per <br>/block element."""
+    text = re.sub(r'(?i)<br\s*/?>|</(?:p|div|li|tr)>', '\n', str(value or ""))
+    text = html.unescape(re.sub(r'<[^>]+>', ' ', text))
+    lines = [re.sub(r'[ \t]+', ' ', l).strip() for l in text.split('\n')]
+    return "\n".join(l for l in lines if l)
+
+
+def _first(d: dict, *keys) -> str:
+    for k in keys:
+        if d.get(k):
+            return strip_html(d[k])
+    return ""
+
+
+def _snapshot(d: dict, section_rows: list) -> dict:
+    code = d.get("code", "")
+    panel_lines = [
+        code, code, d.get("title", ""),
+        f"Section {d.get('section') or d.get('no', '')}, Class Nbr {d.get('crn', '')}",
+    ]
+    fields = (
+        ("Credit Hours", _first(d, "hours_html", "hours")),
+        ("Requirement Designation", _first(d, "ger_html", "gened_html", "ger")),
+        ("Typically Offered", _first(d, "typically_offered", "offered_html")),
+        ("Instruction Method", _first(d, "instmode_html", "instruction_method")),
+    )
+    # Empty fields are left out: a bare label would make field_value_text read the next line
+    panel_lines += [f"{label}: {' '.join(value.split())}" for label, value in fields if value]
+    all_sections = " ".join(
+        ["Class Nbr Section # Type Campus Meets Instructor Status"] +
+        [" ".join(str(s.get(k, "")) for k in ("crn", "no", "schd", "campus", "meets", "instr", "stat"))
+         for s in section_rows]
+    )
+    return {
+        "panel": "\n".join(panel_lines),
+        "blocks": {
+            "Registration Restrictions": re.sub(r'\s+', ' ', _first(d, "restrict_info", "restrictions")),
+            "Class Notes": re.sub(r'\s+', ' ', _first(d, "clssnotes", "class_notes")),
+            "Instructors": _first(d, "instructordetail_html", "instr"),
+            "Schedule and Location": re.sub(r'\s+', ' ', _first(d, "meeting_html", "meets")),
+            "All Sections": all_sections,
+        },
+    }
+
+
+def snapshots_from_api(content: dict) -> dict:
+    """Captured API content -> {"course": snapshot, "sections": [snapshot, ...]}."""
+    details = content.get("details") or []
+    if not details:
+        return None
+    first = details[0]
+    rows = first.get("allInGroup") or content.get("search", {}).get("results") or []
+    by_crn = {str(d.get("crn")): d for d in details}
+    sections = [_snapshot(by_crn[str(r.get("crn"))], rows) for r in rows if str(r.get("crn")) in by_crn]
+    return {"course": _snapshot(first, rows), "sections": sections}
+
+
+# -------------------- DOM path over recorded responses --------------------
+
+BLOCK_TAGS = {"div", "h1", "h2", "h3", "p", "li", "tr", "ul", "table", "form"}
+
+
+def _esc(value) -> str:
+    """index.html's esc(): only &, < and > are escaped."""
+    return html.escape(str(value or ""), quote=False)
+
+
+def render_details_html(d: dict) -> str:
+    """The details panel index.html's showDetails() renders for one details response."""
+    rows = "".join(
+        f'<div class="course-section"><a href="#" data-crn="{s.get("crn")}">{s.get("crn")}</a> '
+        f'{s.get("no")} {s.get("schd")} {s.get("campus")} {_esc(s.get("meets"))} '
+        f'{_esc(s.get("instr"))} {s.get("stat")}</div>'
+        for s in d.get("allInGroup") or [])
+    return f"""
+      <div class="panel panel--kind-details">
+        <div class="dtl-breadcrumb">{_esc(d.get("code"))}</div>
+        <div class="dtl-course-code">{_esc(d.get("code"))}</div>
+        <div class="text col-8 detail-title">{_esc(d.get("title"))}</div>
+        <div class="dtl-section">Section {_esc(d.get("section"))}, Class Nbr {_esc(d.get("crn"))}</div>
+        <div>Credit Hours: {_esc(d.get("hours_html"))}</div>
+        <div>Requirement Designation: {_esc(d.get("ger_html"))}</div>
+        <div>Typically Offered: {_esc(d.get("typically_offered"))}</div>
+        <div>Instruction Method: {_esc(d.get("instmode_html"))}</div>
+        <h3>Registration Restrictions</h3><div>{_esc(d.get("restrict_info"))}</div>
+        <h3>Class Notes</h3><div>{_esc(d.get("clssnotes"))}</div>
+        <h3>Instructors</h3><div>{d.get("instructordetail_html") or ""}</div>
+        <h3>Schedule and Location</h3><div>{_esc(d.get("meeting_html"))}</div>
+        <h3>All Sections</h3>
+        <div class="course-sections">
+          <div>Class Nbr Section # Type Campus Meets Instructor Status</div>
+          {rows}
+        </div>
+      </div>"""
+
+
+class _Node:
+
+    def __init__(self, tag: str, attrs: dict, parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []  # _Node or str
+
+
+class _TreeBuilder(HTMLParser):
+
+    VOID = {"br", "img", "input", "meta", "link"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = self.cur = _Node("#root", {})
+
+    def handle_starttag(self, tag, attrs):
+        node = _Node(tag, dict(attrs), self.cur)
+        self.cur.children.append(node)
+        if tag not in self.VOID:
+            self.cur = node
+
+    def handle_endtag(self, tag):
+        node = self.cur
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.cur = node.parent
+
+    def handle_data(self, data):
+        self.cur.children.append(data)
+
+
+def _inner_text(node) -> str:
+    """Rough innerText: block elements and <br> break lines, whitespace collapses."""
+    parts = []
+
+    def walk(n):
+        for child in n.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif child.tag == "br":
+                parts.append("\n")
+            else:
+                block = child.tag in BLOCK_TAGS
+                if block:
+                    parts.append("\n")
+                walk(child)
+                if block:
+                    parts.append("\n")
+    walk(node)
+    lines = [re.sub(r'\s+', ' ', l).strip() for l in "".join(parts).split("\n")]
+    return "\n".join(l for l in lines if l)
+
+
+def snapshot_from_html(markup: str) -> dict:
+    """browser_pool.snapshot_details over static markup instead of a live page."""
+    from browser_pool import DETAIL_HEADINGS, norm
+
+    builder = _TreeBuilder()
+    builder.feed(markup)
+
+    def find(n, pred):
+        for child in n.children:
+            if isinstance(child, _Node):
+                if pred(child):
+                    return child
+                hit = find(child, pred)
+                if hit is not None:
+                    return hit
+        return None
+
+    panel = find(builder.root, lambda n: "detail" in n.attrs.get("class", ""))
+    blocks = {}
+    for heading in DETAIL_HEADINGS:
+        h = find(builder.root, lambda n: n.tag in ("h2", "h3") and heading in _inner_text(n))
+        sibling = None
+        if h is not None:
+            siblings = [c for c in h.parent.children if isinstance(c, _Node)]
+            i = siblings.index(h)
+            sibling = siblings[i + 1] if i + 1 < len(siblings) else None
+        blocks[heading] = norm(_inner_text(sibling)) if sibling is not None else ""
+    return {"panel": _inner_text(panel) if panel is not None else "", "blocks": blocks}
+
+
+def dom_content_from_recording(content: dict, parse_all_sections_div) -> dict:
+    """
+    What fetch_course_dom would snapshot for a recorded course: the first
+    result's panel, then one panel per row of its All Sections list.
+    """
+    details = content.get("details") or []
+    if not details:
+        return None
+    by_crn = {str(d.get("crn")): d for d in details}
+    course = snapshot_from_html(render_details_html(details[0]))
+    sections = [snapshot_from_html(render_details_html(by_crn.get(s["class_nbr"], details[0])))
+                for s in parse_all_sections_div(course["blocks"]["All Sections"])]
+    return {"course": course, "sections": sections}
+
+
+# -------------------- Recorded-response check --------------------
+
+def load_recorded(responses_dir: Path = RESPONSES_DIR):
+    """Recorded captures: one JSON file per course, {"code", "term", "content"}."""
+    for p in sorted(responses_dir.glob("*.json")):
+        with open(p, "r", encoding="utf-8") as f:
+            yield json.load(f)
+
+
+def check(update: bool = False) -> int:
+    from browser_pool import CODE_LINE_RE
+    import prereq_visual
+    import scraper_spring_nonmatching
+
+    records = []
+    failures = 0
+    for rec in load_recorded():
+        # Suffixed / 4-digit codes are the non-matching scraper's job
+        scraper = prereq_visual if re.match(CODE_LINE_RE, rec["code"]) else scraper_spring_nonmatching
+        api_records = scraper.parse_course(rec["content"], include_email=True)
+        records.extend(api_records)
+
+        # Same course through the DOM path: rendered panels -> snapshots -> parse_course
+        dom = dom_content_from_recording(rec["content"], scraper.parse_all_sections_div)
+        dom_records = scraper.parse_course(dom, include_email=True)
+        if dom_records != api_records or not api_records:
+            failures += 1
+            print(f"FAIL {rec['code']}: API path gave {len(api_records)} records, DOM path {len(dom_records)}")
+            for got, want in zip(dom_records, api_records):
+                diff = {k: (got.get(k), want.get(k)) for k in set(got) | set(want) if got.get(k) != want.get(k)}
+                if diff:
+                    print(f"     section {want.get('section')} (dom, api): {diff}")
+
+    if update:
+        with open(EXPECTED_RECORDS, "w", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        print(f"Wrote {len(records)} records to {EXPECTED_RECORDS}")
+        return 0
+
+    with open(EXPECTED_RECORDS, "r", encoding="utf-8") as f:
+        expected = [json.loads(l) for l in f if l.strip()]
+    for i, (got, want) in enumerate(zip(records, expected)):
+        if got != want:
+            failures += 1
+            diff = {k: (got.get(k), want.get(k)) for k in set(got) | set(want) if got.get(k) != want.get(k)}
+            print(f"FAIL record {i} ({want.get('code')} {want.get('section')}): {diff}")
+    if len(records) != len(expected):
+        failures += 1
+        print(f"FAIL {len(records)} records parsed, {len(expected)} expected")
+    print(f"{len(records)} records from recorded responses (API and DOM paths), {failures} mismatches")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--check", action="store_true", help="Parse recorded responses and diff against expected")
+    ap.add_argument("--update", action="store_true", help="Rewrite expected_records.jsonl from the recordings")
+    args = ap.parse_args()
+    if args.check or args.update:
+        sys.exit(check(update=args.update))
+    ap.print_help()
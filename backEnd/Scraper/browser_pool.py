@@ -0,0 +1,547 @@
+"""
+Shared headless browser runtime for the Atlas scrapers.
+
+One (or a few) headless Chromium processes serve many lightweight contexts on
+a single asyncio event loop, instead of one headed browser per worker thread.
+Each worker coroutine owns one context + page and pulls course codes from a
+shared queue until it is empty.
+
+    results = run_pool(codes, scrape_course, concurrency=32, browsers=2)
+
+Workers pull from the queue as they go idle (no up-front slices), and failed
+or timed-out courses are retried with backoff before landing in a dead-letter
+file; run_pool prints and optionally writes throughput stats. JsonlSink
+streams each course's records to disk as it finishes, with a checkpoint
+manifest so an interrupted run can continue with --resume.
+
+ATLAS_URL can point the scrapers at a local fixture server (fixture_server.py)
+instead of https://atlas.emory.edu/.
+
+The async page helpers the scrapers share (heading blocks, detail fields,
+section clicks) also live here.
+"""
+
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+from playwright.async_api import async_playwright, Page, Route, Request
+
+ATLAS_URL = os.getenv("ATLAS_URL", "https://atlas.emory.edu/")
+
+# Resource types aborted in every context; pages only need HTML, JS and XHR
+BLOCKED_RESOURCES = ("image", "font", "media", "stylesheet")
+
+Handler = Callable[[Page, Any], Awaitable[Any]]
+
+
+class BrowserPool:
+
+    def __init__(
+        self,
+        concurrency: int = 24,
+        browsers: int = 1,
+        headless: bool = True,
+        slow_mo: int = 0,
+        blocked: Iterable[str] = BLOCKED_RESOURCES,
+        default_timeout: int = 6000,
+        retries: int = 2,
+        backoff: float = 2.0,
+        item_timeout: float = 90.0,
+    ):
+        self.concurrency = max(1, int(concurrency))
+        self.browsers_wanted = max(1, int(browsers))
+        self.headless = headless
+        self.slow_mo = slow_mo
+        self.blocked = set(blocked)
+        self.default_timeout = default_timeout
+        self.retries = max(0, int(retries))
+        self.backoff = backoff
+        self.item_timeout = item_timeout
+
+        self.stats = {"pages": 0, "blocked_requests": 0, "completed": 0, "failed": 0,
+                      "retries": 0, "timeouts": 0}
+        self.item_seconds: List[float] = []
+        self.dead_letters: List[dict] = []
+        self._playwright = None
+        self._browsers = []
+
+    async def __aenter__(self):
+        self._playwright = await async_playwright().start()
+        for _ in range(self.browsers_wanted):
+            self._browsers.append(await self._playwright.chromium.launch(
+                headless=self.headless, slow_mo=self.slow_mo
+            ))
+        return self
+
+    async def __aexit__(self, *exc):
+        for browser in self._browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+    async def new_page(self, index: int = 0) -> Page:
+        """Fresh context + page on browser index % n, with blocking and popup closing."""
+        browser = self._browsers[index % len(self._browsers)]
+        context = await browser.new_context()
+        page = await context.new_page()
+        page.set_default_timeout(self.default_timeout)
+
+        async def close_popup(popup):
+            if popup != page:
+                try:
+                    await popup.close()
+                except Exception:
+                    pass
+        context.on("page", close_popup)
+
+        if self.blocked:
+            async def route(route: Route, request: Request):
+                if request.resource_type in self.blocked:
+                    self.stats["blocked_requests"] += 1
+                    return await route.abort()
+                return await route.continue_()
+            await context.route("**/*", route)
+
+        self.stats["pages"] += 1
+        return page
+
+    async def map(self, items: List[Any], handler: Handler, total: Optional[int] = None,
+                  on_result: Optional[Callable[[Any, Any], None]] = None) -> List[Any]:
+        """
+        Run handler(page, item) for every item; returns the non-None results,
+        or hands each (item, result) to on_result as it finishes instead of
+        keeping it (so a JsonlSink can stream results to disk).
+
+        Items sit on one shared queue and idle workers pull the next one, so a
+        slow course only holds up its own worker. A handler that raises or
+        runs past item_timeout gets a fresh page and the item is re-queued
+        after an exponential backoff; after `retries` re-tries it goes to
+        self.dead_letters instead. If no fresh page can be opened (the browser
+        died) the item is dead-lettered too. An exception from on_result ends
+        the run and is re-raised here rather than leaving join() waiting.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait((item, 0, 0.0))
+        total = total or len(items)
+        results: List[Any] = []
+        pending = set()
+        started = time.perf_counter()
+
+        def report():
+            done = self.stats["completed"] + self.stats["failed"]
+            if done % 10 == 0 or done == total:
+                rate = self.stats["completed"] / max(time.perf_counter() - started, 1e-9) * 60
+                print(f"Progress: {done}/{total}  ({rate:.1f} courses/min, "
+                      f"{self.stats['failed']} failed, {self.stats['retries']} retries)")
+
+        async def requeue(entry, delay):
+            await asyncio.sleep(delay)
+            queue.put_nowait(entry)
+            queue.task_done()
+
+        def dead_letter(item, attempt, spent, error):
+            self.stats["failed"] += 1
+            self.dead_letters.append({"item": item, "attempts": attempt + 1,
+                                      "error": error, "seconds": round(spent, 3)})
+            print(f"Error scraping {item}: {error[:100]}", file=sys.stderr)
+
+        async def fresh_page(index, old):
+            """Close old (if any) and open a new page; None when the browser cannot make one."""
+            if old is not None:
+                try:
+                    await old.context.close()
+                except Exception:
+                    pass
+            try:
+                return await self.new_page(index)
+            except Exception as e:
+                print(f"Worker {index} could not open a page: {type(e).__name__}: {str(e)[:100]}",
+                      file=sys.stderr)
+                return None
+
+        async def worker(index: int):
+            page = await fresh_page(index, None)
+            try:
+                while True:
+                    item, attempt, spent = await queue.get()
+                    handed_off = False
+                    try:
+                        if page is None:
+                            page = await fresh_page(index, None)
+                            if page is None:
+                                dead_letter(item, attempt, spent, "no page: browser unavailable")
+                                report()
+                                continue
+
+                        t0 = time.perf_counter()
+                        try:
+                            result = await asyncio.wait_for(handler(page, item), self.item_timeout)
+                        except Exception as e:
+                            spent += time.perf_counter() - t0
+                            timed_out = isinstance(e, asyncio.TimeoutError)
+                            self.stats["timeouts"] += timed_out
+                            error = "timeout" if timed_out else f"{type(e).__name__}: {str(e)[:200]}"
+
+                            if attempt < self.retries:
+                                self.stats["retries"] += 1
+                                delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+                                print(f"Retrying {item} in {delay:.1f}s ({error[:100]})", file=sys.stderr)
+                                # requeue() re-puts the entry, then marks this get() done
+                                handed_off = True
+                                task = asyncio.create_task(requeue((item, attempt + 1, spent), delay))
+                                pending.add(task)
+                                task.add_done_callback(pending.discard)
+                            else:
+                                dead_letter(item, attempt, spent, error)
+                                report()
+                            # The page may be mid-navigation or crashed; start clean
+                            page = await fresh_page(index, page)
+                            continue
+
+                        spent += time.perf_counter() - t0
+                        # a failing on_result (sink I/O error) ends the worker and the run
+                        if on_result is not None:
+                            on_result(item, result)
+                        elif result is not None:
+                            results.append(result)
+                        self.stats["completed"] += 1
+                        self.item_seconds.append(spent)
+                        report()
+                    finally:
+                        if not handed_off:
+                            queue.task_done()
+            finally:
+                if page is not None:
+                    try:
+                        await page.context.close()
+                    except Exception:
+                        pass
+
+        n_workers = min(self.concurrency, max(1, len(items)))
+        workers = [asyncio.create_task(worker(i)) for i in range(n_workers)]
+        join_task = asyncio.create_task(queue.join())
+        try:
+            # workers only return by raising; stop as soon as one does instead of waiting on join()
+            done, _ = await asyncio.wait([join_task, *workers], return_when=asyncio.FIRST_COMPLETED)
+            crashed = [w for w in workers if w in done]
+        finally:
+            for task in [join_task, *workers, *pending]:
+                task.cancel()
+            await asyncio.gather(join_task, *workers, *pending, return_exceptions=True)
+        if crashed:
+            raise crashed[0].exception()
+        self.elapsed = time.perf_counter() - started
+        return results
+
+    def summary(self) -> dict:
+        """Throughput and reliability numbers for the last map() call."""
+        done = self.stats["completed"] + self.stats["failed"]
+        elapsed = getattr(self, "elapsed", 0.0)
+        return {
+            **self.stats,
+            "items": done,
+            "elapsed_seconds": round(elapsed, 2),
+            "courses_per_min": round(self.stats["completed"] / elapsed * 60, 2) if elapsed else 0.0,
+            "p50_item_seconds": round(percentile(self.item_seconds, 50), 3),
+            "p95_item_seconds": round(percentile(self.item_seconds, 95), 3),
+            "failure_rate": round(self.stats["failed"] / done, 4) if done else 0.0,
+            "browsers": self.browsers_wanted,
+            "concurrency": self.concurrency,
+        }
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[k]
+
+
+def run_pool(items: List[Any], handler: Handler, stats_file: Optional[str] = None,
+             dead_letter: Optional[str] = None, on_result: Optional[Callable[[Any, Any], None]] = None,
+             **pool_options) -> List[Any]:
+    """
+    Synchronous entry point: scrape items with a BrowserPool and return results.
+
+    Items that exhausted their retries are written to dead_letter (JSONL) and
+    the run summary to stats_file (JSON) when those paths are given.
+    """
+    async def main():
+        async with BrowserPool(**pool_options) as pool:
+            results = await pool.map(items, handler, on_result=on_result)
+            return results, pool.summary(), pool.dead_letters
+
+    results, summary, dead_letters = asyncio.run(main())
+    print(f"Pool: {summary['completed']}/{summary['items']} items in {summary['elapsed_seconds']:.1f}s "
+          f"({summary['courses_per_min']:.1f}/min, p95 {summary['p95_item_seconds']:.1f}s, "
+          f"failure rate {summary['failure_rate']:.1%}, {summary['retries']} retries) on "
+          f"{summary['browsers']} browser(s), {summary['pages']} pages, "
+          f"{summary['blocked_requests']} blocked requests")
+
+    if stats_file:
+        Path(stats_file).parent.mkdir(parents=True, exist_ok=True)
+        with open(stats_file, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Stats written to {stats_file}")
+    if dead_letter and dead_letters:
+        Path(dead_letter).parent.mkdir(parents=True, exist_ok=True)
+        with open(dead_letter, "w", encoding="utf-8") as f:
+            for entry in dead_letters:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(f"{len(dead_letters)} failed items written to {dead_letter}")
+    return results
+
+
+class JsonlSink:
+    """
+    Crash-safe streaming output for a scrape run.
+
+    Each finished item's records are appended to the output JSONL as soon as
+    the item completes, then a line {"item", "records", "offset"} goes to
+    the manifest (<output>.manifest.jsonl), where offset is the output size
+    after the write. Both files are fsync'ed every `fsync_every` items and on
+    close. With resume=True, items already in the manifest are skipped and
+    the output is cut back to the last recorded offset, dropping any records
+    written after the final checkpoint.
+    """
+
+    def __init__(self, output_file: str, resume: bool = False, fsync_every: int = 25):
+        self.path = Path(output_file)
+        self.manifest_path = Path(f"{self.path.with_suffix('')}.manifest.jsonl")
+        self.fsync_every = max(1, int(fsync_every))
+        self.done = set()
+        self.records_written = 0
+        self._since_sync = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        offset = 0
+        if resume and self.manifest_path.exists():
+            good = 0
+            with open(self.manifest_path, "r+b") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # torn last line from a crash
+                    self.done.add(entry["item"])
+                    offset = entry["offset"]
+                    good += len(line)
+                f.truncate(good)
+
+        if resume and self.path.exists():
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+        self._out = open(self.path, "ab" if resume else "wb")
+        self._manifest = open(self.manifest_path, "ab" if resume else "wb")
+        if resume and self.done:
+            print(f"Resuming: {len(self.done)} items already done in {self.manifest_path}")
+
+    def pending(self, items: List[Any]) -> List[Any]:
+        return [item for item in items if item not in self.done]
+
+    def write(self, item: Any, result: Any):
+        """on_result callback: append one item's record(s), then checkpoint it."""
+        if result is None:
+            records = []
+        elif isinstance(result, list):
+            records = result
+        else:
+            records = [result]
+
+        for rec in records:
+            self._out.write((json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._out.flush()
+        entry = {"item": item, "records": len(records), "offset": self._out.tell()}
+        self._manifest.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._manifest.flush()
+
+        self.done.add(item)
+        self.records_written += len(records)
+        self._since_sync += 1
+        if self._since_sync >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        os.fsync(self._out.fileno())
+        os.fsync(self._manifest.fileno())
+        self._since_sync = 0
+
+    def close(self):
+        self.sync()
+        self._out.close()
+        self._manifest.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def add_pool_arguments(ap):
+    """CLI flags shared by the scrapers."""
+    ap.add_argument("--workers", type=int, default=24,
+                    help="Concurrent pages (contexts) across all browsers")
+    ap.add_argument("--browsers", type=int, default=1, help="Headless Chromium processes")
+    ap.add_argument("--headed", action="store_true", help="Show the browsers (debugging)")
+    ap.add_argument("--no-block", action="store_true", help="Load images, fonts, media and CSS")
+    ap.add_argument("--retries", type=int, default=2, help="Re-tries per course before dead-lettering")
+    ap.add_argument("--backoff", type=float, default=2.0, help="Base retry delay in seconds (doubles per attempt)")
+    ap.add_argument("--item-timeout", type=float, default=90.0, help="Seconds allowed per course attempt")
+    ap.add_argument("--stats-file", default=None, help="Run stats JSON (default: <output>.stats.json)")
+    ap.add_argument("--dead-letter", default=None, help="Failed courses JSONL (default: <output>.failed.jsonl)")
+    ap.add_argument("--resume", action="store_true",
+                    help="Skip courses already checkpointed in <output>.manifest.jsonl and append")
+
+
+def pool_options(args, default_timeout: int = 6000, output_file: Optional[str] = None):
+    stem = str(Path(output_file).with_suffix("")) if output_file else None
+    return {
+        "concurrency": args.workers,
+        "browsers": args.browsers,
+        "headless": not args.headed,
+        "slow_mo": 10 if args.headed else 0,
+        "blocked": () if args.no_block else BLOCKED_RESOURCES,
+        "default_timeout": default_timeout,
+        "retries": args.retries,
+        "backoff": args.backoff,
+        "item_timeout": args.item_timeout,
+        "stats_file": args.stats_file or (f"{stem}.stats.json" if stem else None),
+        "dead_letter": args.dead_letter or (f"{stem}.failed.jsonl" if stem else None),
+    }
+
+
+# -------------------- Shared page helpers --------------------
+
+def norm(s: str) -> str:
+    return re.sub(r'\s+', ' ', (s or '')).strip()
+
+async def block_after_heading(page, heading: str) -> str:
+    try:
+        h = page.locator(f"h3:has-text('{heading}'), h2:has-text('{heading}')").first
+        sec = h.locator("xpath=following-sibling::*[1]")
+        return norm(await sec.inner_text())
+    except Exception:
+        return ""
+
+FIELD_LABEL_RE = re.compile(r'^[A-Z][A-Za-z /&()-]{2,40}:(\s|$)')
+
+def field_value_text(panel_text: str, label: str) -> str:
+    """Value of a 'Label: value' line (or the line after a bare label) in a details panel."""
+    lines = [l.strip() for l in (panel_text or "").split("\n")]
+    for i, line in enumerate(lines):
+        if re.match(fr'^{re.escape(label)}\s*:?', line, re.I):
+            val = norm(re.sub(fr'^{re.escape(label)}\s*:?', '', line, flags=re.I))
+            if val:
+                return val
+            # A bare label reads the next line, unless that line is the next field
+            if i + 1 < len(lines) and len(lines[i+1]) < 200 and not FIELD_LABEL_RE.match(lines[i+1]):
+                return norm(lines[i+1])
+    return ""
+
+async def field_value(page, label: str) -> str:
+    try:
+        panel = page.locator("[class*='detail']").first
+        return field_value_text(await panel.inner_text(), label)
+    except Exception:
+        return ""
+
+CODE_LINE_RE = r'^[A-Z]{2,10}(?:_OX)?\s+\d{3}[A-Z]?$'
+
+def code_and_title_text(panel_text: str, code_line_re: str = CODE_LINE_RE):
+    lines = [l.strip() for l in (panel_text or "").split('\n') if l.strip()]
+    lines = [l for l in lines if not re.search(r'Section\s+[A-Z]?\d+[A-Z]?,\s*Class\s+Nbr', l, re.I)]
+
+    code_rows = [i for i, l in enumerate(lines) if re.match(code_line_re, l)]
+    code, title = "", ""
+    if len(code_rows) >= 2:
+        i = code_rows[1]
+        code = lines[i]
+        title = lines[i+1] if i+1 < len(lines) else ""
+    elif len(code_rows) == 1:
+        i = code_rows[0]
+        code = lines[i]
+        title = lines[i+1] if i+1 < len(lines) else ""
+
+    return code, title
+
+async def get_code_and_title(page, code_line_re: str = CODE_LINE_RE):
+    panel = page.locator("[class*='detail']").first
+    return code_and_title_text(await panel.inner_text(), code_line_re)
+
+# Heading blocks kept in a details snapshot (see page_cache.py)
+DETAIL_HEADINGS = ("Registration Restrictions", "Class Notes", "Instructors",
+                   "Schedule and Location", "All Sections")
+
+async def snapshot_details(page) -> dict:
+    """
+    Everything the parsers read from the details panel, as plain text:
+    the panel's inner text plus the block after each DETAIL_HEADINGS heading.
+    Parsing a snapshot needs no browser, so snapshots can be cached.
+    """
+    try:
+        panel = await page.locator("[class*='detail']").first.inner_text()
+    except Exception:
+        panel = ""
+    blocks = {}
+    for heading in DETAIL_HEADINGS:
+        blocks[heading] = await block_after_heading(page, heading)
+    return {"panel": panel, "blocks": blocks}
+
+async def click_section_by_class(page, class_nbr: str) -> bool:
+    try:
+        h3 = page.locator("h3:has-text('All Sections')").first
+        container = h3.locator("xpath=following-sibling::*[1]")
+        link = container.locator(f"a:has-text('{class_nbr}')").first
+        if await link.count() == 0:
+            return False
+        await link.scroll_into_view_if_needed()
+        await link.click(timeout=3000)
+        await asyncio.sleep(0.8)
+        return True
+    except Exception:
+        return False
+
+async def fallback_click_by_section_label(page, section_hint: str) -> bool:
+    try:
+        detail = page.locator("[class*='detail']").first
+        cand = detail.locator(f"a:has-text('{section_hint}')").first
+        if await cand.count() == 0:
+            return False
+        await cand.scroll_into_view_if_needed()
+        await cand.click(timeout=2500)
+        await page.get_by_text(re.compile(rf"Section\s+{re.escape(section_hint)}\b", re.I)).first.wait_for(timeout=3000)
+        return True
+    except Exception:
+        return False
+
+async def search_course(page, course_code: str, term: str, campus: bool = False,
+                        goto_timeout: int = 12000, results_timeout: int = 8000) -> bool:
+    """Run an Atlas keyword search; True when at least one result link is shown."""
+    await page.goto(ATLAS_URL, timeout=goto_timeout)
+    await page.get_by_label("Keyword").fill(course_code)
+    await page.select_option("select#crit-srcdb", term)
+    if campus:
+        try:
+            await page.select_option("select#crit-campus",
+                                     label="Oxford Campus" if "_OX" in course_code else "Atlanta Campus")
+        except Exception:
+            pass
+    await page.get_by_role("button", name="SEARCH").click()
+    await page.wait_for_selector("div.panel__info-bar", timeout=results_timeout)
+    link = page.locator("div.result.result--group-start a.result__link").first
+    return await link.count() > 0
@@ -0,0 +1,268 @@
+"""
+Local stand-in for atlas.emory.edu, built from fixtures/atlas/.
+
+Serves a small search page with the same selectors the scrapers use
+(Keyword label, select#crit-srcdb, SEARCH button, result links, details panel
+with "All Sections") backed by a FOSE-style JSON API:
+
+  POST /api/?page=fose&route=search    {"other": {"srcdb": ...}, "criteria": [...]}
+  POST /api/?page=fose&route=details   {"group": "code:CS 170", "key": "crn:24001", "srcdb": ...}
+  GET  /api/?page=fose&route=terms
+
+Usage:
+  python fixture_server.py [--port 8765] [--latency-ms 0]
+  python fixture_server.py --check [--levels 1,4,8] [--repeat 10] [--mode api|dom] [--latency-ms 50]
+      # scrape the fixtures through run_pool at each concurrency, diff against
+      # expected_records.jsonl and print courses/min
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "atlas"
+
+
+def load_fixture(fixture_dir: Path = FIXTURE_DIR):
+    with open(fixture_dir / "courses.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def instructor_html(section):
+    lines = [section.get("instructor") or "Staff"]
+    if section.get("email"):
+        lines.append(section["email"])
+    lines.append("Primary Instructor")
+    return "<br>".join(lines)
+
+
+def search_results(data, body):
+    srcdb = (body.get("other") or {}).get("srcdb", "")
+    criteria = {c.get("field"): (c.get("value") or "").strip() for c in body.get("criteria") or []}
+    keyword = criteria.get("keyword", "").upper()
+    campus = criteria.get("campus", "")
+
+    results = []
+    for course in data["courses"]:
+        if course["srcdb"] != srcdb:
+            continue
+        if keyword and keyword not in course["code"].upper() and keyword not in course["title"].upper():
+            continue
+        for s in course["sections"]:
+            if campus and s["campus"] != campus:
+                continue
+            results.append({
+                "key": s["crn"], "code": course["code"], "title": course["title"],
+                "crn": s["crn"], "no": s["section"], "schd": s["type"],
+                "campus": s["campus"], "meets": s["meets"], "instr": s["instructor"],
+                "stat": s.get("status", "Open"), "srcdb": srcdb,
+            })
+    return {"srcdb": srcdb, "count": len({r["code"] for r in results}), "results": results}
+
+
+def course_details(data, body):
+    code = (body.get("group") or "").split(":", 1)[-1]
+    crn = (body.get("key") or "").split(":", 1)[-1]
+    srcdb = body.get("srcdb", "")
+
+    for course in data["courses"]:
+        if course["code"] != code or course["srcdb"] != srcdb:
+            continue
+        section = next((s for s in course["sections"] if s["crn"] == crn), course["sections"][0])
+        return {
+            "key": section["crn"], "code": course["code"], "title": course["title"],
+            "section": section["section"], "crn": section["crn"], "srcdb": srcdb,
+            "hours_html": course.get("credits", ""),
+            "ger_html": course.get("ger", ""),
+            "instmode_html": course.get("instruction_method", ""),
+            "typically_offered": course.get("typically_offered", ""),
+            "restrict_info": course.get("restrictions", ""),
+            "clssnotes": section.get("notes", ""),
+            "instructordetail_html": instructor_html(section),
+            "meeting_html": section.get("schedule_location", ""),
+            "allInGroup": [{
+                "crn": s["crn"], "no": s["section"], "schd": s["type"], "campus": s["campus"],
+                "meets": s["meets"], "instr": s["instructor"], "stat": s.get("status", "Open"),
+            } for s in course["sections"]],
+        }
+    return None
+
+
+def make_handler(data, latency_ms: int = 0):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def send(self, status, body: bytes, content_type: str):
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_json(self, obj, status=200):
+            self.send(status, json.dumps(obj).encode("utf-8"), "application/json")
+
+        def route(self):
+            return parse_qs(urlparse(self.path).query).get("route", [""])[0]
+
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path in ("/", "/index.html"):
+                self.send(200, (FIXTURE_DIR / "index.html").read_bytes(), "text/html; charset=utf-8")
+            elif path == "/api/" and self.route() == "terms":
+                self.send_json([{"code": code, "name": name} for name, code in data["terms"].items()])
+            elif path.startswith("/static/"):
+                # Placeholder assets so resource blocking has something to block
+                self.send(200, b"", "text/css" if path.endswith(".css") else "image/png")
+            else:
+                self.send_json({"fatal": "not found"}, 404)
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/api/":
+                return self.send_json({"fatal": "not found"}, 404)
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                return self.send_json({"fatal": "bad json"}, 400)
+
+            route = self.route()
+            if route == "search":
+                self.send_json(search_results(data, body))
+            elif route == "details":
+                details = course_details(data, body)
+                if details is None:
+                    self.send_json({"fatal": "course not found"}, 404)
+                else:
+                    self.send_json(details)
+            else:
+                self.send_json({"fatal": f"unknown route {route!r}"}, 404)
+
+    return Handler
+
+
+def start_server(port: int = 0, latency_ms: int = 0, fixture_dir: Path = FIXTURE_DIR):
+    """Start the fixture server on a daemon thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(load_fixture(fixture_dir), latency_ms))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def chromium_error():
+    """None if Playwright can launch Chromium here, otherwise the reason."""
+    import asyncio
+    from playwright.async_api import async_playwright
+
+    async def probe():
+        async with async_playwright() as p:
+            browser = await p.chromium.launch()
+            await browser.close()
+    try:
+        asyncio.run(probe())
+    except Exception as e:
+        return f"{type(e).__name__}: {str(e).strip().splitlines()[0][:200]}"
+    return None
+
+
+def check(args):
+    """
+    Scrape the fixture courses through run_pool once per --levels concurrency,
+    diff every record against fixtures/atlas/expected_records.jsonl and print
+    records and courses/min per level.
+    """
+    import browser_pool
+    from prereq_visual import scrape_course
+    from atlas_api import EXPECTED_RECORDS
+
+    error = chromium_error()
+    if error:
+        print(f"SKIP: Chromium could not be launched ({error}). "
+              f"Install it with `python -m playwright install chromium` and re-run.")
+        return 2
+
+    data = load_fixture()
+    terms = {code: name for name, code in data["terms"].items()}
+    srcdb = {c["code"]: c["srcdb"] for c in data["courses"]}
+    with open(EXPECTED_RECORDS, "r", encoding="utf-8") as f:
+        expected = [json.loads(l) for l in f if l.strip()]
+    # Suffixed / 4-digit codes are scraper_spring_nonmatching's, not prereq_visual's
+    expected = [r for r in expected if re.match(browser_pool.CODE_LINE_RE, r["code"])]
+    codes = sorted({r["code"] for r in expected})
+    items = codes * args.repeat
+
+    async def handle(page, code):
+        return await scrape_course(page, code, terms[srcdb[code]], include_email=True, mode=args.mode)
+
+    server, url = start_server(latency_ms=args.latency_ms)
+    browser_pool.ATLAS_URL = url
+    failures = []
+    rows = []
+    try:
+        for level in args.levels:
+            options = {**browser_pool.pool_options(args), "concurrency": level}
+            started = time.perf_counter()
+            results = browser_pool.run_pool(items, handle, **options)
+            elapsed = time.perf_counter() - started
+            records = [r for recs in results for r in recs]
+
+            want = sorted(json.dumps(r, sort_keys=True) for r in expected * args.repeat)
+            got = sorted(json.dumps(r, sort_keys=True) for r in records)
+            if len(results) != len(items):
+                failures.append(f"concurrency {level}: {len(items) - len(results)} courses dead-lettered")
+            if got != want:
+                missing = len([w for w in set(want) if w not in got])
+                failures.append(f"concurrency {level}: {len(records)} records, {len(want)} expected, "
+                                f"{missing} expected records not produced")
+            rows.append((level, len(records), elapsed, len(results) / elapsed * 60 if elapsed else 0.0))
+    finally:
+        server.shutdown()
+
+    print(f"\n{len(items)} courses ({len(codes)} fixture courses x {args.repeat}), "
+          f"mode={args.mode}, latency {args.latency_ms}ms")
+    print(f"{'concurrency':>11} {'records':>8} {'seconds':>8} {'courses/min':>12}")
+    for level, n, elapsed, rate in rows:
+        print(f"{level:>11} {n:>8} {elapsed:>8.2f} {rate:>12.1f}")
+    for f in failures:
+        print(f"FAIL {f}")
+    return 1 if failures else 0
+
+
+def main():
+    from browser_pool import add_pool_arguments
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=int(os.getenv("FIXTURE_PORT", "8765")))
+    ap.add_argument("--latency-ms", type=int, default=0, help="Delay added to every response")
+    ap.add_argument("--check", action="store_true", help="Scrape the fixtures and verify the records")
+    ap.add_argument("--levels", type=lambda v: [int(x) for x in v.split(",")], default=[1, 4, 8],
+                    help="Concurrency levels for --check, comma separated")
+    ap.add_argument("--repeat", type=int, default=10, help="Times each fixture course is queued by --check")
+    ap.add_argument("--mode", choices=["api", "dom"], default="api", help="Scrape path for --check")
+    add_pool_arguments(ap)
+    args = ap.parse_args()
+
+    if args.check:
+        sys.exit(check(args))
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(load_fixture(), args.latency_ms))
+    print(f"Atlas fixture server on http://127.0.0.1:{args.port}/  (ATLAS_URL=http://127.0.0.1:{args.port}/)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
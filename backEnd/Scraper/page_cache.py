@@ -0,0 +1,205 @@
+"""
+On-disk cache of fetched Atlas course pages for incremental rescrapes.
+
+Each entry is one gzip'd JSON file keyed by term + course code:
+
+    <cache_dir>/<term>/<code>.json.gz
+    {"term", "code", "fetched_at", "hash", "content"}
+
+`content` is whatever the scraper captured for the course (details-panel
+snapshots from browser_pool.snapshot_details, or None when the course was not
+found) and `hash` is the SHA-256 of its canonical JSON, copied into every
+output record as `page_hash` so unchanged pages are easy to spot across terms.
+
+With --incremental, cached entries younger than --ttl-days (and not listed in
+--refetch) are re-parsed offline; only the rest go to the browser pool.
+With --offline nothing is fetched at all, so a parser fix can be re-applied to
+the whole cached catalog in seconds.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_CACHE_DIR = os.getenv("ATLAS_PAGE_CACHE", "page_cache")
+
+
+def _slug(s: str) -> str:
+    s = re.sub(r'[^A-Za-z0-9_.-]+', '_', (s or "").strip())
+    if len(s) > 80:
+        s = s[:60] + "_" + hashlib.sha1(s.encode("utf-8")).hexdigest()[:12]
+    return s or "_"
+
+
+def content_hash(content: Any) -> str:
+    blob = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR):
+        self.root = Path(root)
+        self.stats = {"hits": 0, "writes": 0, "unchanged": 0}
+
+    def path(self, term: str, code: str) -> Path:
+        return self.root / _slug(term) / f"{_slug(code)}.json.gz"
+
+    def get(self, term: str, code: str) -> Optional[dict]:
+        p = self.path(term, code)
+        try:
+            with gzip.open(p, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, EOFError, json.JSONDecodeError):
+            return None
+
+    def put(self, term: str, code: str, content: Any) -> dict:
+        """Store a fresh fetch; returns the entry (with its content hash)."""
+        entry = {
+            "term": term,
+            "code": code,
+            "fetched_at": time.time(),
+            "hash": content_hash(content),
+            "content": content,
+        }
+        old = self.get(term, code)
+        if old is not None and old.get("hash") == entry["hash"]:
+            self.stats["unchanged"] += 1
+
+        p = self.path(term, code)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(p.name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, p)
+        self.stats["writes"] += 1
+        return entry
+
+    def split(self, term: str, codes: Iterable[str], ttl_days: Optional[float] = None,
+              refetch: Optional[Set[str]] = None) -> Tuple[List[Tuple[str, dict]], List[str]]:
+        """
+        Partition codes into ([(code, cached entry), ...], [codes to fetch]).
+        An entry is reusable when it exists, is younger than ttl_days (no limit
+        when None) and its code is not in refetch.
+        """
+        refetch = refetch or set()
+        now = time.time()
+        cached, fetch = [], []
+        for code in codes:
+            entry = None if code in refetch else self.get(term, code)
+            if entry is not None and ttl_days is not None:
+                if now - entry.get("fetched_at", 0) > ttl_days * 86400:
+                    entry = None
+            if entry is None:
+                fetch.append(code)
+            else:
+                cached.append((code, entry))
+        self.stats["hits"] += len(cached)
+        return cached, fetch
+
+
+def load_refetch(path: Optional[str]) -> Set[str]:
+    """Codes flagged as changed: one per line, or JSONL objects with a "code" key."""
+    if not path:
+        return set()
+    codes = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                line = json.loads(line).get("code", "")
+            if line:
+                codes.add(line.strip())
+    return codes
+
+
+def with_hash(records, page_hash: str):
+    """Tag a parsed result (None, one record or a list of records) with page_hash."""
+    if records is None:
+        return None
+    if isinstance(records, list):
+        return [{**r, "page_hash": page_hash} for r in records]
+    return {**records, "page_hash": page_hash}
+
+
+def add_cache_arguments(ap):
+    """CLI flags shared by the scrapers."""
+    ap.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Compressed course-page cache")
+    ap.add_argument("--no-cache", action="store_true", help="Do not read or write the page cache")
+    ap.add_argument("--incremental", action="store_true",
+                    help="Re-parse cached pages offline; fetch only missing, stale or --refetch courses")
+    ap.add_argument("--offline", action="store_true",
+                    help="Re-parse cached pages only; never start a browser")
+    ap.add_argument("--ttl-days", type=float, default=30.0,
+                    help="Cached pages older than this are re-fetched in --incremental mode")
+    ap.add_argument("--refetch", default=None,
+                    help="File of course codes flagged as changed (always re-fetched)")
+
+
+def cache_options(args) -> dict:
+    return {
+        "cache_dir": None if args.no_cache else args.cache_dir,
+        "incremental": args.incremental,
+        "offline": args.offline,
+        "ttl_days": args.ttl_days,
+        "refetch": load_refetch(args.refetch),
+    }
+
+
+def scrape_with_cache(courses: List[str], term: str, fetch, parse, sink, pool_options: dict,
+                      cache_dir: Optional[str] = DEFAULT_CACHE_DIR, incremental: bool = False,
+                      offline: bool = False, ttl_days: Optional[float] = 30.0,
+                      refetch: Optional[Set[str]] = None):
+    """
+    Scrape courses into sink through the page cache.
+
+    fetch(page, code) is the async browser half and returns the content to
+    cache; parse(content) turns content into record(s) without a browser.
+    In incremental/offline mode cached pages are parsed first; whatever is
+    left (missing, stale, flagged, or unparseable) goes to the browser pool,
+    unless offline.
+    """
+    cache = PageCache(cache_dir) if cache_dir else None
+    todo = sink.pending(courses)
+
+    if cache is not None and (incremental or offline):
+        cached, todo = cache.split(term, todo, None if offline else ttl_days, refetch)
+        started = time.perf_counter()
+        parsed = 0
+        for code, entry in cached:
+            try:
+                records = parse(entry["content"])
+            except Exception as e:
+                print(f"Could not re-parse cached {code}: {str(e)[:100]}")
+                todo.append(code)
+                continue
+            sink.write(code, with_hash(records, entry["hash"]))
+            parsed += 1
+        print(f"Re-parsed {parsed} cached pages offline in {time.perf_counter() - started:.2f}s")
+
+        if offline:
+            if todo:
+                print(f"Offline: skipped {len(todo)} courses with no usable cached page")
+            return
+
+    if not todo:
+        return
+
+    from browser_pool import run_pool
+
+    async def handle(page, code):
+        content = await fetch(page, code)
+        page_hash = cache.put(term, code, content)["hash"] if cache else content_hash(content)
+        return with_hash(parse(content), page_hash)
+
+    run_pool(todo, handle, on_result=sink.write, **pool_options)
+    if cache is not None:
+        print(f"Page cache: {cache.stats['writes']} pages written "
+              f"({cache.stats['unchanged']} unchanged since last fetch)")
@@ -0,0 +1,157 @@
+"""
+Headless permission checks for Atlas.py / visualAtlas.py.
+
+The tiled visual mode gives every worker its own headed browser window and a
+fixed slice of courses. Here the same check runs on browser_pool's shared
+headless pages instead: each page session works through many courses from
+one queue, and courses that resolve to the same Atlas query (visualAtlas
+searches by department) are checked once and the answer fanned out.
+"""
+
+from typing import Callable, Dict, Iterable
+
+from browser_pool import BLOCKED_RESOURCES, run_pool
+import browser_pool
+
+PERMISSION_PHRASES = ("permission required prior to enrollment", "consent")
+NOTE_KEYS = ("notes", "classNotes", "enrollmentRequirements", "consent", "requisites")
+SECTION_LIST_KEYS = ("sections", "data", "classes", "courseSections", "results")
+
+
+def notes_need_permission(text: str) -> bool:
+    text = (text or "").lower()
+    return any(p in text for p in PERMISSION_PHRASES)
+
+
+def sections_from_payload(data):
+    """Section dicts from whatever shape the details/sections response has."""
+    sections = []
+    if isinstance(data, dict):
+        for k in SECTION_LIST_KEYS:
+            v = data.get(k)
+            if isinstance(v, list):
+                sections = v
+                break
+        if not sections:
+            sections = list(data.values())
+    elif isinstance(data, list):
+        sections = data
+    return [s for s in sections if isinstance(s, dict)]
+
+
+def payload_needs_permission(data) -> bool:
+    for s in sections_from_payload(data):
+        if notes_need_permission(" ".join(str(s.get(k) or "") for k in NOTE_KEYS)):
+            return True
+    return False
+
+
+def _looks_like_sections(resp):
+    try:
+        rt = resp.request.resource_type
+    except Exception:
+        rt = ""
+    url = resp.url.lower()
+    return (rt in ("xhr", "fetch")) and any(k in url for k in ("section", "class", "details", "course"))
+
+
+async def check_permission_async(page, query: str, term: str = "Spring 2026",
+                                 campus_label: str = "Atlanta Campus") -> bool:
+    """
+    Async twin of check_permission_for_course_fast: True if any section needs
+    permission. Navigation/search failures raise, so run_pool retries them
+    with backoff and dead-letters the query once retries run out.
+    """
+    await page.goto(browser_pool.ATLAS_URL, timeout=20000)
+    await page.get_by_label("Keyword").fill(query)
+    await page.select_option("select#crit-srcdb", term)
+    try:
+        await page.select_option("select#crit-camp", campus_label)
+    except Exception:
+        pass
+    await page.get_by_role("button", name="SEARCH").click()
+    await page.wait_for_selector("div.panel__info-bar", timeout=15000)
+
+    links = page.locator("div.result.result--group-start a.result__link")
+    if await links.count() == 0:
+        return False
+
+    data = None
+    try:
+        async with page.expect_response(_looks_like_sections, timeout=15000) as resp_info:
+            await links.first.click(force=True)
+        data = await (await resp_info.value).json()
+    except Exception:
+        data = None
+    if payload_needs_permission(data):
+        return True
+
+    for sec in (await page.locator("a.course-section").all())[:5]:
+        try:
+            await sec.scroll_into_view_if_needed()
+            await sec.click(force=True)
+            await page.wait_for_timeout(150)
+            text = await page.locator("[class*='note']").first.text_content()
+            if notes_need_permission(text):
+                return True
+        except Exception:
+            continue
+    return False
+
+
+def check_permissions_headless(codes: Iterable[str], query_for: Callable[[str], str] = lambda c: c,
+                               **pool_options) -> Dict[str, bool]:
+    """
+    Run check_permission_async for every distinct query over a headless
+    BrowserPool; returns {code: permission_required}. Courses whose query is
+    empty, or whose check was dead-lettered after retries, map to False (as
+    before); dead-lettered queries are reported and written to dead_letter
+    when that path is given.
+    """
+    by_query: Dict[str, list] = {}
+    for code in codes:
+        by_query.setdefault(query_for(code) or "", []).append(code)
+    queries = [q for q in by_query if q]
+    print(f"Headless check: {sum(len(v) for v in by_query.values())} courses -> {len(queries)} distinct queries")
+
+    async def handle(page, query):
+        return query, await check_permission_async(page, query)
+
+    pool_options.setdefault("blocked", BLOCKED_RESOURCES)
+    answers = dict(run_pool(queries, handle, **pool_options))
+
+    failed = [q for q in queries if q not in answers]
+    if failed:
+        affected = sum(len(by_query[q]) for q in failed)
+        print(f"Headless check: {len(failed)} queries failed after retries; "
+              f"{affected} courses default to no permission: {', '.join(failed[:10])}"
+              f"{' ...' if len(failed) > 10 else ''}")
+
+    result = {}
+    for query, group in by_query.items():
+        for code in group:
+            result[code] = bool(answers.get(query, False))
+    return result
+
+
+def add_headless_arguments(ap):
+    """Flags for the headless mode; --workers stays each script's own flag."""
+    ap.add_argument("--visual", action="store_true",
+                    help="Debug: tiled headed windows with a fixed slice of courses each (old mode)")
+    ap.add_argument("--browsers", type=int, default=1, help="Headless Chromium processes")
+    ap.add_argument("--retries", type=int, default=1, help="Re-tries per query before giving up (False)")
+    ap.add_argument("--item-timeout", type=float, default=60.0, help="Seconds allowed per query")
+    ap.add_argument("--stats-file", default=None, help="Optional run stats JSON")
+    ap.add_argument("--dead-letter", default=None, help="Optional JSONL of queries that failed after retries")
+
+
+def headless_options(args) -> dict:
+    return {
+        "concurrency": args.workers,
+        "browsers": args.browsers,
+        "retries": args.retries,
+        "item_timeout": args.item_timeout,
+        "stats_file": args.stats_file,
+        "dead_letter": args.dead_letter,
+        "default_timeout": 15000,
+    }
@@ -404,8 +404,6 @@ def scrape_professor_batch_from_queue(prof_queue, worker_id, stats, stats_lock,
                 if stats["completed"] % 10 == 0 or stats["completed"] == 1:
                     print(f"[Worker {worker_id}] Progress: {stats['completed']} professors scraped, {stats['total_reviews']} reviews")
             
-            time.sleep(0.5)
-        
         browser.close()
     
     with stats_lock:
@@ -413,6 +411,287 @@ def scrape_professor_batch_from_queue(prof_queue, worker_id, stats, stats_lock,
     
     print(f"[Worker {worker_id}] Finished - scraped {len(local_results)} professors")
 
+# -------------------- Bulk mode (captured GraphQL pages) --------------------
+#
+# The professor search page fetches its result cards from the site's GraphQL
+# endpoint, 8 teachers per "Show More" page, and each teacher node already has
+# avgRating, numRatings, avgDifficulty and wouldTakeAgainPercent. Bulk mode
+# captures that request once and replays it cursor by cursor, so discovery
+# and ratings come back together without scrolling or per-professor pages.
+
+RMP_BASE = "https://www.ratemyprofessors.com"
+RMP_FIXTURES = Path(__file__).parent / "fixtures" / "rmp"
+SHOW_MORE_SELECTORS = [
+    'button:has-text("Show More")',
+    'button:text-is("Show More")',
+    '[data-testid="show-more-button"]',
+]
+
+def teacher_page_info(payload):
+    """GraphQL search payload -> (teacher nodes, end cursor, has next page)."""
+    root = (payload or {}).get("data") or {}
+    teachers = (root.get("search") or {}).get("teachers") or {}
+    if not teachers:
+        # Pagination queries answer under node -> school -> teachers
+        teachers = ((root.get("node") or {}).get("teachers")) or {}
+    nodes = [e["node"] for e in teachers.get("edges") or [] if e.get("node")]
+    info = teachers.get("pageInfo") or {}
+    return nodes, info.get("endCursor"), bool(info.get("hasNextPage"))
+
+def professor_from_node(node, school_name):
+    """One teacher node -> the record schema the page scraper writes, plus bulk-only fields."""
+    num = int(node.get("numRatings") or 0)
+    rating = node.get("avgRating")
+    again = node.get("wouldTakeAgainPercent")
+    difficulty = node.get("avgDifficulty")
+    legacy_id = node.get("legacyId")
+    return {
+        "name": f"{node.get('firstName', '').strip()} {node.get('lastName', '').strip()}".strip() or "N/A",
+        "rating": str(rating) if num and rating is not None else "No rating",
+        "num_ratings": str(num),
+        "department": node.get("department") or "N/A",
+        "difficulty": difficulty if num else None,
+        "would_take_again_%": again if num and again is not None and again >= 0 else None,
+        "rmp_legacy_id": legacy_id,
+        "school": school_name,
+        "url": f"{RMP_BASE}/professor/{legacy_id}",
+        "reviews": [],
+    }
+
+def professors_from_payloads(payloads, school_name):
+    profs = {}
+    for payload in payloads:
+        nodes, _, _ = teacher_page_info(payload)
+        for node in nodes:
+            rec = professor_from_node(node, school_name)
+            profs[rec["url"]] = rec
+    return list(profs.values())
+
+def relay_store_teachers(page):
+    """Teachers embedded in the first server-rendered page (window.__RELAY_STORE__)."""
+    try:
+        store = page.evaluate("() => window.__RELAY_STORE__ || {}")
+    except Exception:
+        return []
+    return [v for v in store.values() if isinstance(v, dict) and v.get("__typename") == "Teacher"]
+
+def collect_professors_bulk(page, school_id, school_name, max_pages=2000):
+    """
+    Load the search page, capture the GraphQL request behind one "Show More"
+    click, then replay it from the first cursor until hasNextPage is false.
+    Returns (professor records, raw payloads).
+    """
+    url = f"{RMP_BASE}/search/professors/{school_id}"
+    print(f"[{school_name}] Loading search page...")
+    page.goto(url, wait_until="domcontentloaded", timeout=20000)
+
+    template = None
+    for selector in SHOW_MORE_SELECTORS:
+        try:
+            with page.expect_response(lambda r: "/graphql" in r.url and r.request.method == "POST",
+                                      timeout=8000) as resp_info:
+                page.click(selector, timeout=3000, force=True)
+            template = resp_info.value.request
+            break
+        except Exception:
+            continue
+
+    if template is None:
+        # A single page of results: no pagination request is ever made
+        nodes = relay_store_teachers(page)
+        print(f"[{school_name}] No pagination request captured; {len(nodes)} teachers from the page itself")
+        return [professor_from_node(n, school_name) for n in nodes], []
+
+    body = template.post_data_json
+    if not isinstance(body, dict) or "cursor" not in (body.get("variables") or {}):
+        nodes = relay_store_teachers(page)
+        print(f"[{school_name}] Unrecognised pagination request; {len(nodes)} teachers from the page itself")
+        return [professor_from_node(n, school_name) for n in nodes], []
+    headers = {k: v for k, v in template.headers.items() if k.lower() != "content-length"}
+    payloads = []
+    cursor = ""
+    for n_page in range(max_pages):
+        body["variables"]["cursor"] = cursor
+        payload = page.request.post(template.url, data=json.dumps(body), headers=headers).json()
+        payloads.append(payload)
+        nodes, cursor, has_next = teacher_page_info(payload)
+        if (n_page + 1) % 50 == 0:
+            print(f"[{school_name}] {n_page + 1} pages, {sum(len(teacher_page_info(p)[0]) for p in payloads)} teachers")
+        if not has_next or not cursor:
+            break
+
+    profs = professors_from_payloads(payloads, school_name)
+    print(f"[{school_name}] ✓ {len(profs)} professors from {len(payloads)} captured pages")
+    return profs, payloads
+
+def load_previous(path):
+    """Previous output keyed by url, for incremental review scraping."""
+    prev = {}
+    if path and Path(path).exists():
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    rec = json.loads(line)
+                    prev[rec.get("url")] = rec
+    return prev
+
+def reviews_needed(professors, previous):
+    """Professors whose reviews must be (re)scraped: new, or num_ratings changed."""
+    need = []
+    for prof in professors:
+        old = previous.get(prof["url"])
+        if old is None or str(old.get("num_ratings")) != str(prof["num_ratings"]) or \
+                (int(prof["num_ratings"]) > 0 and not old.get("reviews")):
+            need.append(prof)
+    return need
+
+def merge_reviews(professors, previous, scraped):
+    """Attach freshly scraped reviews, or carry them over from the previous run."""
+    by_url = {r["url"]: r for r in scraped}
+    for prof in professors:
+        if prof["url"] in by_url:
+            prof["reviews"] = by_url[prof["url"]].get("reviews", [])
+        elif prof["url"] in previous:
+            prof["reviews"] = previous[prof["url"]].get("reviews", [])
+    return professors
+
+def scrape_reviews(professors, workers):
+    prof_queue = Queue()
+    for prof in professors:
+        prof_queue.put((prof["url"], prof["name"], prof["school"]))
+    stats_lock = threading.Lock()
+    stats = {"completed": 0, "total_reviews": 0}
+    results_list = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(scrape_professor_batch_from_queue, prof_queue, worker_id, stats, stats_lock, results_list)
+                   for worker_id in range(1, workers + 1)]
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Worker error: {e}")
+    return results_list
+
+def attach_reviews(professors, previous, reviews, workers, scrape=None):
+    """
+    Give each bulk record its reviews. With reviews on, new/changed professors
+    are scraped and the rest reuse `previous`; with reviews off everyone
+    reuses `previous`, and professors whose num_ratings moved are reported
+    as carrying stale reviews.
+    """
+    scrape = scrape or scrape_reviews
+    need = reviews_needed(professors, previous)
+    if reviews:
+        print(f"Reviews: {len(need)} of {len(professors)} professors new or changed since last run")
+        return merge_reviews(professors, previous, scrape(need, workers) if need else [])
+
+    merge_reviews(professors, previous, [])
+    carried = sum(1 for p in professors if p["reviews"])
+    stale = sum(1 for p in need if p["url"] in previous and previous[p["url"]].get("reviews"))
+    print(f"Reviews: carried over for {carried} professors from the previous output"
+          + (f"; {stale} of those have new ratings since (re-run with --reviews)" if stale else ""))
+    return professors
+
+def run_bulk(output_file, workers=6, reviews=False, previous_file=None, headed=False):
+    print("=" * 60)
+    print("RATE MY PROFESSOR SCRAPER - BULK MODE")
+    print("=" * 60)
+
+    start_time = time.time()
+    # Loaded either way: without --reviews the earlier reviews are carried over, not dropped
+    previous = load_previous(previous_file or output_file)
+    professors = []
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=not headed)
+        page = browser.new_page()
+        for school_id, school_name in ((EMORY_SCHOOL_ID, "Emory Atlanta"), (OXFORD_SCHOOL_ID, "Emory Oxford")):
+            profs, _ = collect_professors_bulk(page, school_id, school_name)
+            professors.extend(profs)
+        browser.close()
+
+    attach_reviews(professors, previous, reviews, workers)
+
+    out_path = Path(output_file)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for prof in professors:
+            f.write(json.dumps(prof, ensure_ascii=False) + "\n")
+    tmp.replace(out_path)
+
+    print(f"Total professors: {len(professors)}")
+    print(f"Total reviews: {sum(len(p['reviews']) for p in professors)}")
+    print(f"Time elapsed: {(time.time() - start_time)/60:.1f} minutes")
+    print(f"Output: {out_path}")
+
+def check_fixtures():
+    """Parse the recorded GraphQL pages and compare with expected_professors.jsonl."""
+    payloads = []
+    for path in sorted(RMP_FIXTURES.glob("teacher_search_page*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            payloads.append(json.load(f))
+    got = professors_from_payloads(payloads, "Emory Atlanta")
+    with open(RMP_FIXTURES / "expected_professors.jsonl", "r", encoding="utf-8") as f:
+        expected = [json.loads(l) for l in f if l.strip()]
+
+    failures = [f"{w['name']}: got {g}" for g, w in zip(got, expected) if g != w]
+    if len(got) != len(expected):
+        failures.append(f"{len(got)} professors parsed, {len(expected)} expected")
+
+    # Checked by hand against the GraphQL nodes in the recorded pages, not
+    # produced by professor_from_node: 1003 is on both pages, a zero-rating
+    # professor and wouldTakeAgainPercent -1 mean "no value", names are trimmed
+    hand_checked = {
+        "1001": {"name": "Jane Doe", "rating": "4.6", "num_ratings": "42", "difficulty": 2.9,
+                 "would_take_again_%": 91.3},
+        "1003": {"name": "Maria Lopez", "rating": "No rating", "num_ratings": "0", "difficulty": None,
+                 "would_take_again_%": None},
+        "1004": {"name": "Priya Natarajan", "rating": "4.0", "num_ratings": "8", "difficulty": 3.5,
+                 "would_take_again_%": None},
+        "1005": {"name": "Wei Chen", "rating": "2.4", "num_ratings": "23", "difficulty": 4.1,
+                 "would_take_again_%": 30.4},
+    }
+    by_id = {str(g["rmp_legacy_id"]): g for g in got}
+    if sorted(by_id) != ["1001", "1002", "1003", "1004", "1005"]:
+        failures.append(f"professor ids {sorted(by_id)}, expected 1001-1005 once each")
+    for rmp_id, fields in hand_checked.items():
+        rec = by_id.get(rmp_id, {})
+        wrong = {k: (rec.get(k), v) for k, v in fields.items() if rec.get(k) != v}
+        if wrong:
+            failures.append(f"{rmp_id} (got, want): {wrong}")
+
+    # Incremental reviews: unchanged counts reuse old reviews, changed/new ones are re-scraped
+    previous = {e["url"]: {**e, "reviews": [{"comment": "kept"}] if int(e["num_ratings"]) else []}
+                for e in expected[:-1]}
+    previous[expected[0]["url"]]["num_ratings"] = "0"
+    need = {p["url"] for p in reviews_needed(got, previous)}
+    want = {expected[0]["url"], expected[-1]["url"]}
+    if need != want:
+        failures.append(f"reviews_needed picked {sorted(need)}, expected {sorted(want)}")
+
+    # Without --reviews nothing is scraped and earlier reviews survive the rewrite
+    def no_scrape(need, workers):
+        raise AssertionError("reviews scraped without --reviews")
+    carried = attach_reviews([dict(g) for g in got], previous, False, 1, scrape=no_scrape)
+    kept = {p["url"] for p in carried if p["reviews"] == [{"comment": "kept"}]}
+    want_kept = {e["url"] for e in expected[:-1] if int(e["num_ratings"])}
+    if kept != want_kept:
+        failures.append(f"reviews carried over for {sorted(kept)}, expected {sorted(want_kept)}")
+
+    # With --reviews only the new/changed professors are scraped
+    scraped = attach_reviews([dict(g) for g in got], previous, True, 1,
+                             scrape=lambda need, workers: [{"url": p["url"], "reviews": [{"comment": "new"}]}
+                                                           for p in need])
+    fresh = {p["url"] for p in scraped if p["reviews"] == [{"comment": "new"}]}
+    if fresh != want:
+        failures.append(f"--reviews rescraped {sorted(fresh)}, expected {sorted(want)}")
+
+    for f in failures:
+        print(f"FAIL {f}")
+    print(f"{len(got)} professors from {len(payloads)} recorded pages, {len(failures)} failures")
+    return 1 if failures else 0
+
 def run(output_file, workers=6):
     print("=" * 60)
     print("RATE MY PROFESSOR SCRAPER - FIXED VERSION")
@@ -492,6 +771,18 @@ if __name__ == "__main__":
     ap = argparse.ArgumentParser(description="Scrape Rate My Professor with ALL reviews - FIXED")
     ap.add_argument("--output", default="rmp_data.jsonl", help="Output file path")
     ap.add_argument("--workers", type=int, default=6, help="Number of parallel workers (default: 6)")
+    ap.add_argument("--mode", choices=["bulk", "pages"], default="bulk",
+                    help="bulk: ratings from captured search pages; pages: open every professor page")
+    ap.add_argument("--reviews", action="store_true",
+                    help="Bulk mode: also scrape reviews, only for professors new or changed since --previous")
+    ap.add_argument("--previous", default=None, help="Earlier output to reuse reviews from (default: --output)")
+    ap.add_argument("--headed", action="store_true", help="Show the browser in bulk mode")
+    ap.add_argument("--check", action="store_true", help="Verify bulk parsing against fixtures/rmp")
     args = ap.parse_args()
     
-    run(args.output, args.workers)
\ No newline at end of file
+    if args.check:
+        raise SystemExit(check_fixtures())
+    if args.mode == "bulk":
+        run_bulk(args.output, args.workers, reviews=args.reviews, previous_file=args.previous, headed=args.headed)
+    else:
+        run(args.output, args.workers)
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Queue / retry / failure checks for BrowserPool.map, without a browser.
+
+FakePool hands out stand-in pages, so these run anywhere:
+    python backEnd/Scraper/test_browser_pool.py   (or pytest)
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from browser_pool import BrowserPool, percentile
+
+# a hang in map() fails the check instead of blocking it
+RUN_TIMEOUT = 10
+
+
+class FakeContext:
+    async def close(self):
+        pass
+
+
+class FakePage:
+    context = FakeContext()
+
+
+class FakePool(BrowserPool):
+    """BrowserPool with fake pages; new_page fails once `broken` is set."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.broken = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def new_page(self, index=0):
+        if self.broken:
+            raise RuntimeError("Target closed: browser has been closed")
+        self.stats["pages"] += 1
+        return FakePage()
+
+
+def run_map(pool, items, handler, on_result=None):
+    async def main():
+        return await asyncio.wait_for(pool.map(items, handler, on_result=on_result), RUN_TIMEOUT)
+    return asyncio.run(main())
+
+
+def test_retries_timeouts_and_dead_letters():
+    tries = {}
+
+    async def handler(page, item):
+        tries[item] = tries.get(item, 0) + 1
+        if item % 7 == 0 and tries[item] < 2:
+            raise RuntimeError("flaky")
+        if item == 13:
+            raise RuntimeError("always")
+        if item == 20:
+            await asyncio.sleep(5)
+        return {"item": item}
+
+    pool = FakePool(concurrency=6, retries=2, backoff=0.01, item_timeout=0.3)
+    results = run_map(pool, list(range(40)), handler)
+
+    assert sorted(r["item"] for r in results) == [i for i in range(40) if i not in (13, 20)]
+    assert sorted(d["item"] for d in pool.dead_letters) == [13, 20]
+    assert all(d["attempts"] == 3 for d in pool.dead_letters)
+    assert pool.stats["timeouts"] == 3
+    assert pool.stats["completed"] == 38 and pool.stats["failed"] == 2
+
+
+def test_failing_sink_raises_instead_of_hanging():
+    def on_result(item, result):
+        if item == 5:
+            raise OSError("No space left on device")
+
+    async def handler(page, item):
+        await asyncio.sleep(0.001)
+        return item
+
+    pool = FakePool(concurrency=4, retries=0)
+    try:
+        run_map(pool, list(range(20)), handler, on_result=on_result)
+    except OSError as e:
+        assert "No space left" in str(e)
+    else:
+        raise AssertionError("on_result error was swallowed")
+
+
+def test_dead_browser_dead_letters_remaining_items():
+    pool = FakePool(concurrency=2, retries=1, backoff=0.01)
+
+    async def handler(page, item):
+        if item == 3:
+            pool.broken = True
+            raise RuntimeError("Page crashed")
+        return item
+
+    results = run_map(pool, list(range(10)), handler)
+
+    failed = {d["item"] for d in pool.dead_letters}
+    assert 3 in failed
+    assert set(results) | failed == set(range(10))
+    assert pool.stats["completed"] + pool.stats["failed"] == 10
+
+
+def test_permission_errors_retry_then_default_to_false():
+    import permission_pool
+
+    tries = {}
+
+    async def check(page, query):
+        tries[query] = tries.get(query, 0) + 1
+        if query == "FLAKY" and tries[query] == 1:
+            raise RuntimeError("Timeout 20000ms exceeded")
+        if query == "DOWN":
+            raise RuntimeError("net::ERR_CONNECTION_RESET")
+        return query == "FLAKY"
+
+    def fake_run_pool(items, handler, **options):
+        options.pop("blocked", None)
+        return run_map(FakePool(**options), items, handler)
+
+    saved = permission_pool.check_permission_async, permission_pool.run_pool
+    permission_pool.check_permission_async, permission_pool.run_pool = check, fake_run_pool
+    try:
+        result = permission_pool.check_permissions_headless(
+            ["CS 170", "CS 171", "MATH 111"], query_for={"CS 170": "FLAKY", "CS 171": "DOWN"}.get,
+            retries=1, backoff=0.01)
+    finally:
+        permission_pool.check_permission_async, permission_pool.run_pool = saved
+
+    assert result == {"CS 170": True, "CS 171": False, "MATH 111": False}
+    assert tries == {"FLAKY": 2, "DOWN": 2}
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 50) == 0.0
+    assert percentile([1.0, 2.0], 50) == 1.0
+    assert percentile([1.0, 2.0], 51) == 2.0
+    assert percentile([float(i) for i in range(1, 101)], 95) == 95.0
+    assert percentile([float(i) for i in range(1, 11)], 100) == 10.0
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
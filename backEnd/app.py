@@ -7,12 +7,14 @@ import sys
 from pathlib import Path
 import re
 
+from request_profiler import should_profile, profile_call, anonymize_uid, anonymize_doc, collection_fingerprint
+
 app = Flask(__name__)
 # CORS configuration - allow all origins for API routes
 CORS(app, 
      resources={r"/api/*": {"origins": "*"}},
      methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-     allow_headers=["Content-Type", "Authorization"],
+     allow_headers=["Content-Type", "Authorization", "X-Profile-Token"],
      expose_headers=["Content-Type"],
      supports_credentials=False)
 
@@ -58,12 +60,16 @@ except ImportError as e:
 
 # Import the ML recommendation engine
 try:
-    from ml_recommendation_engine import generate_schedule_for_user as ml_generate
+    from ml_recommendation_engine import generate_schedule_for_user as ml_generate, model_registry
     ML_ENGINE_AVAILABLE = True
     print("Loaded ML recommendation engine")
+    # Load the serving model now rather than on the first request, and pick
+    # up newly published versions in the background
+    model_registry.start(watch=os.getenv("MODEL_WATCH", "1") != "0")
 except ImportError as e:
     print(f"Could not load ML recommendation engine: {e}")
     ml_generate = None
+    model_registry = None
 
 # Cache for last submitted data
 last_userCourses = None
@@ -84,6 +90,46 @@ def get_uid_query(uid):
     return {"uid": uid}
 
 
+# Helper to run an engine, profiling the call when requested
+def run_engine(endpoint, generate_func, uid, num_recommendations, engine_type):
+    """Call generate_func; under PROFILE_REQUESTS / X-Profile-Token also save profile artifacts."""
+    def call():
+        return generate_func(
+            uid=uid,
+            course_col=course_col,
+            pref_col=pref_col,
+            enriched_courses_col=enriched_courses_col,
+            rmp_col=rmp_col,
+            basic_courses_col=basic_courses_col,
+            num_recommendations=num_recommendations
+        )
+
+    if not should_profile(request.headers):
+        return call()
+
+    # Snapshot the exact inputs the engine will read so the run can be replayed offline
+    uid_query = get_uid_query(uid)
+    anon_uid = anonymize_uid(uid)
+    input_state = {
+        "engine_type": engine_type,
+        "num_recommendations": num_recommendations,
+        "uid": anon_uid,
+        "user_courses": anonymize_doc(course_col.find_one(uid_query, sort=[("_id", -1)]), anon_uid),
+        "user_prefs": anonymize_doc(pref_col.find_one(uid_query, sort=[("_id", -1)]), anon_uid),
+        # The catalog is read live on replay; these flag when it has changed since
+        "catalog": {
+            "DetailedCourses": collection_fingerprint(enriched_courses_col),
+            "BasicCourses": collection_fingerprint(basic_courses_col),
+            "RMP": collection_fingerprint(rmp_col),
+        },
+    }
+
+    result, artifact_dir = profile_call(endpoint, call, input_state)
+    if artifact_dir and isinstance(result, dict):
+        result["profile_id"] = os.path.basename(artifact_dir)
+    return result
+
+
 # Handle CORS for all requests
 @app.before_request
 def handle_cors():
@@ -105,7 +151,7 @@ def after_request(response):
     # Use set instead of add to replace existing headers
     response.headers['Access-Control-Allow-Origin'] = '*'
     response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-    response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
+    response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-Profile-Token'
     return response
 
 
@@ -173,7 +219,8 @@ def engine_status():
             },
             "ml": {
                 "available": ML_ENGINE_AVAILABLE,
-                "description": "Machine Learning based recommendations - learns from RMP data"
+                "description": "Machine Learning based recommendations - learns from RMP data",
+                "model": model_registry.status() if model_registry is not None else None
             }
         },
         "default": "fibheap" if FIBHEAP_ENGINE_AVAILABLE else ("ml" if ML_ENGINE_AVAILABLE else None)
@@ -507,12 +554,15 @@ def modify_schedule():
         
         # Select engine
         generate_func = None
+        actual_engine = engine_type
         if engine_type == "ml" and ML_ENGINE_AVAILABLE:
             generate_func = ml_generate
         elif FIBHEAP_ENGINE_AVAILABLE:
             generate_func = fibheap_generate
+            actual_engine = "fibheap"
         elif ML_ENGINE_AVAILABLE:
             generate_func = ml_generate
+            actual_engine = "ml"
         
         if generate_func is None:
             return jsonify({
@@ -521,15 +571,7 @@ def modify_schedule():
             }), 500
         
         # Regenerate schedule with modifications
-        result = generate_func(
-            uid=uid,
-            course_col=course_col,
-            pref_col=pref_col,
-            enriched_courses_col=enriched_courses_col,
-            rmp_col=rmp_col,
-            basic_courses_col=basic_courses_col,
-            num_recommendations=10
-        )
+        result = run_engine("modify-schedule", generate_func, uid, 10, actual_engine)
         
         return jsonify(result), 200 if result.get("success") else 400
         
@@ -735,15 +777,7 @@ def generate_schedule():
         
         print(f"[INFO] Generating schedule using {actual_engine} engine for user {uid}")
         
-        result = generate_func(
-            uid=uid,
-            course_col=course_col,
-            pref_col=pref_col,
-            enriched_courses_col=enriched_courses_col,
-            rmp_col=rmp_col,
-            basic_courses_col=basic_courses_col,
-            num_recommendations=num_recommendations
-        )
+        result = run_engine("generate-schedule", generate_func, uid, num_recommendations, actual_engine)
         
         # Add engine info to result
         if result.get("success"):
@@ -0,0 +1,214 @@
+"""
+Benchmark for the ML engine's schedule assembly stage.
+
+Runs build_conflict_free_schedules (precomputed codes/credits/week bitmasks)
+against the previous list-scanning implementation on a catalog export,
+checks both produce the same schedules, and prints timings.
+
+Usage:
+  python bench_schedule_assembly.py [catalog.json] [--repeat 5] [--meetings]
+
+--meetings fills each course's meeting dict from its time string first, so
+the time-conflict path is exercised (exports store meeting as null).
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from ml_recommendation_engine import (
+    build_conflict_free_schedules,
+    normalize_code,
+    parse_meeting_time,
+    score_course_rule_based,
+)
+
+DEFAULT_EXPORT_GLOB = os.path.join(
+    os.path.dirname(__file__), "..", "mongo_exports", "DetailedCourses_DetailedCourses_*.json"
+)
+
+
+# Previous implementation, kept here as the reference for equality and timing
+def legacy_build_conflict_free_schedules(
+    ranked_courses: List[Dict],
+    num_schedules: int = 10,
+    max_credits: int = 18,
+    min_courses: int = 4,
+    max_courses: int = 6
+) -> List[Dict]:
+    def safe_credits(raw, default: float = 3.0) -> float:
+        
+        if raw is None:
+            return default
+        if isinstance(raw, (int, float)):
+            try:
+                return float(raw)
+            except (TypeError, ValueError):
+                return default
+
+        if isinstance(raw, str):
+            # Extract numbers and optional range (supports hyphen or en dash)
+            match = re.match(r"\s*(\d+(?:\.\d+)?)(?:\s*[-\u2013]\s*(\d+(?:\.\d+)?))?", raw)
+            if match:
+                first = float(match.group(1))
+                second = float(match.group(2)) if match.group(2) else None
+                # Use upper bound if present, otherwise first number
+                return second if second is not None else first
+        try:
+            return float(raw)
+        except (TypeError, ValueError):
+            return default
+
+    schedules = []
+    used_root_codes = set()
+    
+    for root_course in ranked_courses[:50]:  # Try first 50 as roots
+        root_code = normalize_code(root_course.get("code", ""))
+        if root_code in used_root_codes:
+            continue
+        
+        schedule_courses = [root_course]
+        total_credits = safe_credits(root_course.get("credits", 3))
+        schedule_blocks = []
+        
+        # Get time blocks for root course
+        meeting = root_course.get("meeting") or {}
+        if isinstance(meeting, dict):
+            days = meeting.get("days") or []
+            start = meeting.get("start_min")
+            end = meeting.get("end_min")
+            if days and start is not None and end is not None:
+                for d in days:
+                    schedule_blocks.append({"day": d, "start": start, "end": end})
+        
+        # Add more courses
+        for candidate in ranked_courses:
+            if len(schedule_courses) >= max_courses:
+                break
+            if total_credits >= max_credits:
+                break
+            
+            cand_code = normalize_code(candidate.get("code", ""))
+            if cand_code == root_code:
+                continue
+            if any(normalize_code(c.get("code", "")) == cand_code for c in schedule_courses):
+                continue
+            
+            # Check time conflict with current schedule
+            cand_meeting = candidate.get("meeting") or {}
+            if isinstance(cand_meeting, dict):
+                cand_days = cand_meeting.get("days") or []
+                cand_start = cand_meeting.get("start_min")
+                cand_end = cand_meeting.get("end_min")
+            else:
+                parsed = parse_meeting_time(candidate.get("time", ""))
+                cand_days = parsed["days"]
+                cand_start = parsed["start_min"]
+                cand_end = parsed["end_min"]
+            
+            conflict = False
+            if cand_days and cand_start is not None and cand_end is not None:
+                for block in schedule_blocks:
+                    if block["day"] in cand_days:
+                        if max(block["start"], cand_start) < min(block["end"], cand_end):
+                            conflict = True
+                            break
+            
+            if conflict:
+                continue
+            
+            # Add course to schedule
+            cand_credits = safe_credits(candidate.get("credits", 3))
+            if total_credits + cand_credits > max_credits:
+                continue
+            
+            schedule_courses.append(candidate)
+            total_credits += cand_credits
+            
+            # Add time blocks
+            if cand_days and cand_start is not None and cand_end is not None:
+                for d in cand_days:
+                    schedule_blocks.append({"day": d, "start": cand_start, "end": cand_end})
+        
+        if len(schedule_courses) >= min_courses:
+            used_root_codes.add(root_code)
+            
+            # Calculate total score
+            total_score = sum(c.get("score", 0) for c in schedule_courses)
+            
+            schedules.append({
+                "root_course_code": root_code,
+                "courses": schedule_courses,
+                "course_count": len(schedule_courses),
+                "total_credits": total_credits,
+                "total_score": total_score
+            })
+            
+            if len(schedules) >= num_schedules:
+                break
+    
+    return schedules
+
+
+def schedule_signature(schedules: List[Dict]):
+    return [
+        (s["root_course_code"], [id(c) for c in s["courses"]], s["total_credits"])
+        for s in schedules
+    ]
+
+
+def time_it(fn, repeat: int):
+    best = None
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("catalog", nargs="?", help="DetailedCourses JSON export")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--meetings", action="store_true", help="Derive meeting dicts from time strings")
+    parser.add_argument("--num-schedules", type=int, default=10)
+    parser.add_argument("--max-credits", type=int, default=16)
+    args = parser.parse_args()
+
+    path = args.catalog or sorted(glob.glob(DEFAULT_EXPORT_GLOB))[-1]
+    with open(path, "r", encoding="utf-8") as f:
+        courses = json.load(f)
+
+    if args.meetings:
+        for c in courses:
+            parsed = parse_meeting_time(c.get("time") or "")
+            c["meeting"] = {"days": parsed["days"], "start_min": parsed["start_min"], "end_min": parsed["end_min"]}
+
+    for c in courses:
+        c["score"] = score_course_rule_based(c)
+    courses.sort(key=lambda x: x.get("score", 0), reverse=True)
+
+    kwargs = {"num_schedules": args.num_schedules, "max_credits": args.max_credits}
+    legacy_t, legacy = time_it(lambda: legacy_build_conflict_free_schedules(courses, **kwargs), args.repeat)
+    new_t, new = time_it(lambda: build_conflict_free_schedules(courses, **kwargs), args.repeat)
+
+    same = schedule_signature(legacy) == schedule_signature(new)
+    print(f"catalog: {path} ({len(courses)} courses, meetings={'derived' if args.meetings else 'as stored'})")
+    print(f"legacy:  {legacy_t * 1000:.2f} ms  ({len(legacy)} schedules)")
+    print(f"bitmask: {new_t * 1000:.2f} ms  ({len(new)} schedules)")
+    print(f"speedup: {legacy_t / new_t:.1f}x   identical: {same}")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
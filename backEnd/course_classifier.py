@@ -0,0 +1,136 @@
+"""
+Course classification flags shared by the catalog pipeline and the engines.
+
+The pipeline stamps each course document with a ``classification`` dict so the
+recommendation engine can read booleans instead of re-scanning titles and
+requirement text on every request. Bump CLASSIFIER_VERSION whenever the rules
+below change; documents carrying an older version are reclassified lazily.
+"""
+
+from typing import Any, Dict, Optional
+
+from course_codes import normalize_course_code, get_course_number, get_department
+
+
+CLASSIFIER_VERSION = 2
+
+PERMISSION_PHRASES = (
+    "permission of the department required",
+    "permission required prior to enrollment",
+    "permission required",
+    "consent required",
+    "department consent",
+    "instructor consent",
+    "permission of instructor",
+    "open only to students admitted",
+    "reserved for students in the bba program",
+    "reserved for students in the bsn",
+    "bba & specstubus students allowed",
+    "bsn students only",
+    "student cannot self-register",
+)
+
+RESTRICTED_TYPES = {"CLN", "SUP", "THE"}
+
+RESTRICTED_DEPARTMENTS = {"NRSG", "NBB", "MI"}
+
+RESEARCH_KEYWORDS = (
+    "independent study", "directed study", "directed research",
+    "undergraduate research", "honors research", "thesis", "special research",
+)
+
+
+def code_metadata(code: Optional[str]) -> Dict[str, Any]:
+    """Normalized code, department and course number, via the engine's course_codes helpers."""
+    if not code:
+        return {"normalized_code": "", "department": "", "course_number": None}
+    normalized = normalize_course_code(str(code))
+    return {
+        "normalized_code": normalized,
+        "department": get_department(normalized),
+        "course_number": get_course_number(normalized),
+    }
+
+
+def classification_input(raw: Dict, normalized: Dict) -> Dict:
+    """
+    The document both ingest paths classify: the normalized fields over the
+    raw scraped record, so raw-only text (requirement_sentence, Atlas's
+    restrictions) is seen whichever path stamps the flags.
+    """
+    return {**raw, **normalized}
+
+
+def requires_permission(course: Dict) -> bool:
+    if course.get("permission_required"):
+        return True
+    # Atlas.py / visualAtlas.py permission enrichment
+    if (course.get("restrictions") or {}).get("permission_required"):
+        return True
+
+    req_sentence = (course.get("requirement_sentence") or "").lower()
+    notes = ((course.get("requirements") or {}).get("notes") or "").lower()
+    combined_text = req_sentence + " " + notes
+
+    return any(phrase in combined_text for phrase in PERMISSION_PHRASES)
+
+
+def is_restricted_course_type(course: Dict, meta: Optional[Dict[str, Any]] = None) -> bool:
+    course_type = (course.get("type") or "").upper()
+    if course_type in RESTRICTED_TYPES:
+        return True
+
+    # Hard block certain departments completely
+    meta = meta or code_metadata(course.get("code"))
+    if meta["department"] in RESTRICTED_DEPARTMENTS:
+        return True
+
+    title = (course.get("title") or "").lower()
+    req_sentence = (course.get("requirement_sentence") or "").lower()
+    combined = title + " " + req_sentence
+
+    if "nursing" in combined or ": bsn" in combined:
+        return True
+
+    if "clinical clerkship" in combined or "clinical internship" in combined:
+        return True
+
+    return False
+
+
+def is_research_course(course: Dict, meta: Optional[Dict[str, Any]] = None) -> bool:
+    meta = meta or code_metadata(course.get("code"))
+    code = meta["normalized_code"]
+    title = (course.get("title") or "").lower()
+
+    if any(kw in title for kw in RESEARCH_KEYWORDS):
+        return True
+
+    if code.endswith("R") and not code.endswith("RW"):
+        course_num = meta["course_number"]
+        if course_num:
+            if 395 <= course_num <= 399 or 485 <= course_num <= 499:
+                return True
+
+    return False
+
+
+def classify_course(course: Dict, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Compute the classification flags stored on a course document."""
+    meta = meta or code_metadata(course.get("code"))
+    return {
+        "version": CLASSIFIER_VERSION,
+        "requires_permission": requires_permission(course),
+        "restricted_type": is_restricted_course_type(course, meta),
+        "research": is_research_course(course, meta),
+    }
+
+
+def get_classification(course: Dict, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Return stored flags, recomputing (and caching on the doc) only when stale."""
+    flags = course.get("classification")
+    if isinstance(flags, dict) and flags.get("version") == CLASSIFIER_VERSION:
+        return flags
+    flags = classify_course(course, meta)
+    course["classification"] = flags
+    return flags
@@ -0,0 +1,50 @@
+"""
+Course-code helpers shared by the recommendation engine and the classifier.
+
+Codes are compared in one normalized form: upper case, no spaces, no _OX
+campus suffix, and a trailing Z / ZL section marker folded away
+("CHEM 203ZL" -> "CHEM203L").
+"""
+
+import re
+from typing import Optional
+
+
+def normalize_course_code(course_code: str) -> str:
+    if not course_code:
+        return course_code
+
+    code = course_code.strip().upper().replace(" ", "")
+    code = code.replace("_OX", "")
+
+    if code.endswith("ZL"):
+        return code[:-2] + "L"
+    elif code.endswith("Z"):
+        return code[:-1]
+
+    return code
+
+
+def get_course_number(course_code: str) -> Optional[int]:
+    nums = "".join(filter(str.isdigit, course_code))
+    if nums:
+        return int(nums[:3]) if len(nums) >= 3 else int(nums)
+    return None
+
+
+def get_department(course_code: str) -> str:
+    if not course_code:
+        return ""
+    code = normalize_course_code(str(course_code))
+    m = re.match(r"^([A-Z]+?)(?=\d)", code)
+    if m:
+        return m.group(1)
+    dept = []
+    for ch in code:
+        if ch.isalpha():
+            dept.append(ch)
+        else:
+            break
+    return "".join(dept) if dept else ""
+
+
@@ -0,0 +1,407 @@
+"""
+Offline shoot-out between the fibheap and ML schedule engines.
+
+Replays a corpus of user states against both engines' generate_schedule_for_user
+using in-memory collection stand-ins and writes one report with, per engine:
+
+  latency   mean / p50 / p95 / max seconds over all runs
+  memory    peak traced allocation per request (tracemalloc, separate pass)
+  quality   success rate, must-course coverage, GER coverage, credit target
+            hit rate, conflict-free rate
+  overlap   Jaccard similarity of the recommended course codes between engines
+
+Usage:
+  python engine_shootout.py [--corpus DIR_OR_FILE ...] [--synthetic 8]
+                            [--repeat 1] [--engines fibheap,ml] [--skip_memory]
+                            [--out report.json]
+
+--corpus takes profile run directories (anything containing input.json, as
+written by request_profiler) or a JSON file holding a list of
+{"user_courses": {...}, "user_prefs": {...}} states. Without --corpus a
+seeded synthetic corpus is generated from the catalog export.
+
+Both engines are judged by the same checks (the fibheap engine's time parser
+for conflicts and the requirement tables in integrated_recommendation_engine),
+so scores are comparable even where an engine ignores a constraint.
+
+The fibheap engine fuzzy-matches every catalog professor against the RMP
+collection on each request, so expect tens of seconds per fibheap run.
+"""
+
+import argparse
+import copy
+import glob
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from integrated_recommendation_engine import (
+    CSBA_REQUIREMENTS,
+    CSBS_REQUIREMENTS,
+    GER_DUE_BY_YEAR,
+    GER_REQUIREMENTS,
+    IntegratedRecommendationEngine,
+    normalize_course_code,
+    parse_credits,
+)
+
+EXPORT_DIR = os.path.join(os.path.dirname(__file__), "..", "mongo_exports")
+YEARS = ["Freshman", "Sophomore", "Junior", "Senior"]
+INTERESTS = [
+    "Machine Learning", "Software Engineering", "Data", "Security", "Economics",
+    "Art History", "Music", "Biology", "Psychology", "Philosophy",
+]
+# Roughly the order students take the shared major core
+MUST_SEQUENCE = [
+    "MATH111", "CS170", "CS171", "MATH112", "CS224",
+    "CS253", "MATH221", "CS255", "CS326", "CS350",
+]
+
+
+class ListCollection:
+    """Read-only stand-in for a pymongo collection backed by a list of docs."""
+
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.docs = docs
+
+    def find_one(self, query=None, sort=None, *args, **kwargs):
+        for doc in reversed(self.docs):
+            if not query or all(doc.get(k) == v for k, v in query.items()):
+                return copy.deepcopy(doc)
+        return None
+
+    def find(self, query=None, projection=None, *args, **kwargs):
+        # Engines annotate the docs they get back, so hand out copies like Mongo does
+        return [copy.deepcopy(doc) for doc in self.docs]
+
+
+def latest_export(collection: str) -> List[Dict[str, Any]]:
+    paths = sorted(glob.glob(os.path.join(EXPORT_DIR, f"{collection}_*.json")))
+    if not paths:
+        return []
+    with open(paths[-1], "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# -------------------------------------------------------------------
+# Corpus
+# -------------------------------------------------------------------
+
+def load_corpus(paths: List[str]) -> List[Dict[str, Any]]:
+    states = []
+    for path in paths:
+        if os.path.isdir(path):
+            for input_path in sorted(glob.glob(os.path.join(path, "**", "input.json"), recursive=True)):
+                with open(input_path, "r", encoding="utf-8") as f:
+                    states.append(json.load(f))
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            states.extend(data if isinstance(data, list) else [data])
+    return [s for s in states if s.get("user_prefs")]
+
+
+def synthetic_corpus(catalog: List[Dict[str, Any]], n: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Deterministic spread of years, degrees, histories and time constraints."""
+    rng = random.Random(seed)
+    ger_courses = sorted({
+        normalize_course_code(c.get("code") or "")
+        for c in catalog if c.get("ger") and c.get("code")
+    })
+
+    states = []
+    for i in range(n):
+        uid = f"synthetic-{i:03d}"
+        year_idx = i % len(YEARS)
+        core_done = MUST_SEQUENCE[:min(len(MUST_SEQUENCE), year_idx * 3 + rng.randint(0, 2))]
+        ger_done = rng.sample(ger_courses, min(len(ger_courses), year_idx * 3))
+
+        prefs = {
+            "uid": uid,
+            "degreeType": rng.choice(["BA", "BS"]),
+            "year": YEARS[year_idx],
+            "preferredCredits": rng.choice([12, 15, 16, 18]),
+            "interests": rng.sample(INTERESTS, rng.randint(1, 3)),
+            "timeUnavailable": [],
+            "timePreference": ["08:00", "18:00"],
+        }
+        if rng.random() < 0.5:
+            start = rng.choice([8, 10, 13, 15])
+            prefs["timeUnavailable"].append({
+                "days": rng.sample(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"], 2),
+                "start": f"{start:02d}:00",
+                "end": f"{start + 2:02d}:00",
+            })
+
+        states.append({
+            "uid": uid,
+            "user_courses": {"uid": uid, "emory_courses": core_done + ger_done} if year_idx else None,
+            "user_prefs": prefs,
+        })
+    return states
+
+
+# -------------------------------------------------------------------
+# Quality checks
+# -------------------------------------------------------------------
+
+class Judge:
+    """Engine-independent checks applied to every returned schedule."""
+
+    def __init__(self, catalog: List[Dict[str, Any]]):
+        self.engine = IntegratedRecommendationEngine()
+        self.offered = {normalize_course_code(c.get("code") or "") for c in catalog}
+        self.ger_by_code: Dict[str, List[str]] = {}
+        for c in catalog:
+            code = normalize_course_code(c.get("code") or "")
+            if code and code not in self.ger_by_code:
+                self.ger_by_code[code] = c.get("ger") or []
+
+    def completed_codes(self, user_courses: Optional[Dict[str, Any]]) -> set:
+        completed = set()
+        for key in ["incoming_transfer_courses", "incoming_test_courses", "emory_courses", "spring_2026_courses"]:
+            for code in (user_courses or {}).get(key) or []:
+                completed.add(normalize_course_code(code))
+        return completed
+
+    def outstanding(self, state: Dict[str, Any]):
+        prefs = state["user_prefs"]
+        completed = self.completed_codes(state.get("user_courses"))
+        reqs = CSBA_REQUIREMENTS if prefs.get("degreeType") == "BA" else CSBS_REQUIREMENTS
+        musts = {c for c in reqs["must"] if c not in completed and c in self.offered}
+
+        done: Dict[str, int] = {}
+        for code in completed:
+            for tag in self.ger_by_code.get(code, []):
+                done[tag] = done.get(tag, 0) + 1
+        year = prefs.get("year") or "Freshman"
+        due = set()
+        for y in YEARS[:YEARS.index(year) + 1 if year in YEARS else 1]:
+            due |= GER_DUE_BY_YEAR[y]
+        gers = {t for t in due if done.get(t, 0) < GER_REQUIREMENTS.get(t, 1)}
+        return musts, gers
+
+    def conflict_free(self, courses: List[Dict[str, Any]], unavailable) -> bool:
+        for i, a in enumerate(courses):
+            if self.engine._has_time_conflict(a, unavailable):
+                return False
+            for b in courses[i + 1:]:
+                if self.engine._check_courses_overlap(a, b):
+                    return False
+        return True
+
+    def score(self, state: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        prefs = state["user_prefs"]
+        schedules = (result.get("schedules") or []) if result.get("success") else []
+        musts, gers = self.outstanding(state)
+        unavailable = self.engine._parse_time_unavailable(prefs.get("timeUnavailable") or [])
+        try:
+            target = int(prefs.get("preferredCredits") or 16)
+        except (TypeError, ValueError):
+            target = 16
+
+        codes = set()
+        must_cov, ger_cov, credit_hits, conflict_free = [], [], 0, 0
+        for schedule in schedules:
+            courses = [c for c in schedule.get("courses") or [] if c]
+            sched_codes = {normalize_course_code(c.get("code") or "") for c in courses}
+            codes |= sched_codes
+            if musts:
+                must_cov.append(len(musts & sched_codes) / len(musts))
+            if gers:
+                tags = {t for c in courses for t in (c.get("ger") or [])}
+                ger_cov.append(len(gers & tags) / len(gers))
+            credits = sum(parse_credits(c.get("credits")) for c in courses)
+            if abs(credits - target) <= 1:
+                credit_hits += 1
+            if self.conflict_free(courses, unavailable):
+                conflict_free += 1
+
+        n = len(schedules)
+        return {
+            "success": bool(result.get("success")),
+            "schedules": n,
+            "must_coverage": mean(must_cov),
+            "ger_coverage": mean(ger_cov),
+            "credit_target_hit_rate": credit_hits / n if n else None,
+            "conflict_free_rate": conflict_free / n if n else None,
+            "codes": sorted(codes),
+        }
+
+
+# -------------------------------------------------------------------
+# Runner
+# -------------------------------------------------------------------
+
+def mean(values: List[float]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def fmt_seconds(value: Optional[float]) -> str:
+    """Latency for the progress line; summaries are None when nothing ran."""
+    return "n/a" if value is None else f"{value:.3f}s"
+
+
+def load_engines(names: List[str]) -> Dict[str, Any]:
+    engines = {}
+    for name in names:
+        try:
+            if name == "ml":
+                from ml_recommendation_engine import generate_schedule_for_user
+            else:
+                from integrated_recommendation_engine import generate_schedule_for_user
+            engines[name] = generate_schedule_for_user
+        except ImportError as e:
+            engines[name] = e
+    return engines
+
+
+def run_state(generate: Callable, state: Dict[str, Any], cols: Dict[str, Any], num: int):
+    uid = state["user_prefs"].get("uid") or state.get("uid")
+    user_courses = dict(state.get("user_courses") or {}, uid=uid) if state.get("user_courses") else None
+    return generate(
+        uid=uid,
+        course_col=ListCollection([user_courses] if user_courses else []),
+        pref_col=ListCollection([dict(state["user_prefs"], uid=uid)]),
+        enriched_courses_col=cols["courses"],
+        rmp_col=cols["rmp"],
+        basic_courses_col=cols["basic"],
+        num_recommendations=num,
+    )
+
+
+def summarize(latencies, peaks, quality) -> Dict[str, Any]:
+    def avg(key):
+        return mean([q[key] for q in quality if q[key] is not None])
+
+    return {
+        "runs": len(latencies),
+        "latency_s": {
+            "mean": mean(latencies),
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "max": max(latencies) if latencies else None,
+        },
+        "peak_memory_mb": {
+            "mean": mean(peaks),
+            "max": max(peaks) if peaks else None,
+        },
+        "quality": {
+            "success_rate": mean([1.0 if q["success"] else 0.0 for q in quality]),
+            "schedules_per_request": mean([q["schedules"] for q in quality]),
+            "must_coverage": avg("must_coverage"),
+            "ger_coverage": avg("ger_coverage"),
+            "credit_target_hit_rate": avg("credit_target_hit_rate"),
+            "conflict_free_rate": avg("conflict_free_rate"),
+        },
+    }
+
+
+def positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", nargs="*", default=[], help="Profile run dirs or JSON state files")
+    parser.add_argument("--synthetic", type=int, default=8, help="Synthetic states when no corpus is given")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=positive_int, default=1,
+                        help="Timed runs per state and engine (at least 1: the last run is the one scored)")
+    parser.add_argument("--num", type=int, default=10, help="num_recommendations per request")
+    parser.add_argument("--engines", default="fibheap,ml")
+    parser.add_argument("--skip_memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--out", default="engine_shootout_report.json")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+
+    catalog = latest_export("DetailedCourses_DetailedCourses")
+    basic = latest_export("DetailedCourses_BasicCourses")
+    cols = {
+        "courses": ListCollection(catalog),
+        "rmp": ListCollection(latest_export("RateMyProfessors_Professors")),
+        "basic": ListCollection(basic) if basic else None,
+    }
+    states = load_corpus(args.corpus) if args.corpus else synthetic_corpus(catalog, args.synthetic, args.seed)
+    print(f"{len(states)} states, {len(catalog)} catalog courses")
+
+    judge = Judge(catalog)
+    engines = load_engines([e.strip() for e in args.engines.split(",") if e.strip()])
+
+    report: Dict[str, Any] = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "states": len(states),
+        "repeat": args.repeat,
+        "engines": {},
+        "overlap": {},
+    }
+    codes_by_engine: Dict[str, List[set]] = {}
+
+    for name, generate in engines.items():
+        if isinstance(generate, Exception):
+            print(f"[{name}] unavailable: {generate}")
+            report["engines"][name] = {"error": f"import failed: {generate}"}
+            continue
+
+        latencies, peaks, quality, codes = [], [], [], []
+        for state in states:
+            result = None
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                result = run_state(generate, state, cols, args.num)
+                latencies.append(time.perf_counter() - started)
+
+            # Separate pass: tracemalloc slows allocation-heavy code too much to time under it
+            if not args.skip_memory:
+                tracemalloc.start()
+                run_state(generate, state, cols, args.num)
+                peaks.append(tracemalloc.get_traced_memory()[1] / (1024 * 1024))
+                tracemalloc.stop()
+
+            scored = judge.score(state, result)
+            codes.append(set(scored.pop("codes")))
+            quality.append(scored)
+
+        report["engines"][name] = summarize(latencies, peaks, quality)
+        codes_by_engine[name] = codes
+        lat = report["engines"][name]["latency_s"]
+        print(f"[{name}] p50={fmt_seconds(lat['p50'])} p95={fmt_seconds(lat['p95'])} "
+              f"({len(latencies)} runs)", flush=True)
+
+    names = sorted(codes_by_engine)
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            scores = [
+                len(x & y) / len(x | y)
+                for x, y in zip(codes_by_engine[a], codes_by_engine[b]) if x | y
+            ]
+            report["overlap"][f"{a}_vs_{b}"] = {"mean_jaccard": mean(scores), "states": len(scores)}
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps({k: report[k] for k in ("engines", "overlap")}, indent=2))
+    print(f"report → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,21 +27,17 @@ class FibonacciHeap:
     
     def insert(self, key: float, data: Any) -> FibonacciHeapNode:
         node = FibonacciHeapNode(key, data)
-        
-        if self.max_node is None:
-            self.max_node = node
-        else:
-            self._add_to_root_list(node)
-            if node.key > self.max_node.key:
-                self.max_node = node
-        
-        self.num_nodes += 1
+        self._insert_node(node)
         return node
     
     def find_max(self) -> Optional[Any]:
         return self.max_node.data if self.max_node else None
     
     def extract_max(self) -> Optional[Any]:
+        max_node = self.extract_max_node()
+        return max_node.data if max_node else None
+    
+    def extract_max_node(self) -> Optional[FibonacciHeapNode]:
         max_node = self.max_node
         if max_node is None:
             return None
@@ -67,7 +63,85 @@ class FibonacciHeap:
             self._consolidate()
         
         self.num_nodes -= 1
-        return max_node.data
+        max_node.child = None
+        max_node.degree = 0
+        max_node.left = max_node
+        max_node.right = max_node
+        return max_node
+    
+    def increase_key(self, node: FibonacciHeapNode, new_key: Any):
+        if new_key < node.key:
+            raise ValueError("new key is smaller than current key")
+        
+        node.key = new_key
+        parent = node.parent
+        if parent is not None and node.key > parent.key:
+            self._cut(node, parent)
+            self._cascading_cut(parent)
+        
+        if node.key > self.max_node.key:
+            self.max_node = node
+    
+    def decrease_key(self, node: FibonacciHeapNode, new_key: Any):
+        if new_key > node.key:
+            raise ValueError("new key is larger than current key")
+        
+        # In a max-heap a smaller key can sink below its children, so the
+        # node is taken out and re-inserted; the handle stays the same object.
+        self.delete(node)
+        node.key = new_key
+        node.mark = False
+        self._insert_node(node)
+    
+    def update_key(self, node: FibonacciHeapNode, new_key: Any):
+        if new_key > node.key:
+            self.increase_key(node, new_key)
+        elif new_key < node.key:
+            self.decrease_key(node, new_key)
+    
+    def delete(self, node: FibonacciHeapNode):
+        parent = node.parent
+        if parent is not None:
+            self._cut(node, parent)
+            self._cascading_cut(parent)
+        self.max_node = node
+        self.extract_max_node()
+    
+    def _insert_node(self, node: FibonacciHeapNode):
+        node.parent = None
+        if self.max_node is None:
+            self.max_node = node
+            node.left = node
+            node.right = node
+        else:
+            self._add_to_root_list(node)
+            if node.key > self.max_node.key:
+                self.max_node = node
+        self.num_nodes += 1
+    
+    def _cut(self, node: FibonacciHeapNode, parent: FibonacciHeapNode):
+        if node.right == node:
+            parent.child = None
+        else:
+            node.left.right = node.right
+            node.right.left = node.left
+            if parent.child == node:
+                parent.child = node.right
+        
+        parent.degree -= 1
+        node.parent = None
+        node.mark = False
+        self._add_to_root_list(node)
+    
+    def _cascading_cut(self, node: FibonacciHeapNode):
+        parent = node.parent
+        if parent is None:
+            return
+        if not node.mark:
+            node.mark = True
+        else:
+            self._cut(node, parent)
+            self._cascading_cut(parent)
     
     def extract_top_k(self, k: int) -> List[Any]:
         results = []
@@ -1,6 +1,8 @@
 import re
 from typing import Dict, List, Set, Optional, Tuple, Any
 from fibonacci_heap import FibonacciHeap
+from course_classifier import get_classification
+from course_codes import normalize_course_code, get_course_number, get_department
 import unicodedata
 import difflib
 
@@ -85,21 +87,6 @@ EASY_LANGUAGES = {"SPAN", "FREN", "ITAL", "PORT"}
 DAY_MAP = {"M": "Monday", "T": "Tuesday", "W": "Wednesday", "Th": "Thursday", "F": "Friday"}
 
 
-def normalize_course_code(course_code: str) -> str:
-    if not course_code:
-        return course_code
-
-    code = course_code.strip().upper().replace(" ", "")
-    code = code.replace("_OX", "")
-
-    if code.endswith("ZL"):
-        return code[:-2] + "L"
-    elif code.endswith("Z"):
-        return code[:-1]
-
-    return code
-
-
 def is_lab_course(code: str) -> bool:
     """Detect lab sections by normalized code ending in L."""
     return bool(code) and code.endswith("L")
@@ -150,29 +137,6 @@ def parse_credits(credits_value, default: int = 3) -> int:
     return default
 
 
-def get_course_number(course_code: str) -> Optional[int]:
-    nums = "".join(filter(str.isdigit, course_code))
-    if nums:
-        return int(nums[:3]) if len(nums) >= 3 else int(nums)
-    return None
-
-
-def get_department(course_code: str) -> str:
-    if not course_code:
-        return ""
-    code = normalize_course_code(str(course_code))
-    m = re.match(r"^([A-Z]+?)(?=\d)", code)
-    if m:
-        return m.group(1)
-    dept = []
-    for ch in code:
-        if ch.isalpha():
-            dept.append(ch)
-        else:
-            break
-    return "".join(dept) if dept else ""
-
-
 class IntegratedRecommendationEngine:
 
     def __init__(self):
@@ -183,15 +147,27 @@ class IntegratedRecommendationEngine:
         
         self._meeting_blocks_cache: Dict[str, List[Tuple[str, int, int]]] = {}
         self._course_metadata_cache: Dict[str, Dict[str, Any]] = {}
+        self._interest_hit_cache: Dict[str, bool] = {}
+        self._interest_matcher: Optional[re.Pattern] = None
+        self._interest_key: Optional[Tuple[str, ...]] = None
+        self.tree_stats: Dict[str, int] = {"queued": 0, "popped": 0, "rekeyed": 0, "dropped": 0}
+        self._tree_memo: Dict[Tuple, List[Dict]] = {}
+        self.memo_stats: Dict[str, int] = {"lookups": 0, "hits": 0}
 
     def _clear_caches(self):
         self._meeting_blocks_cache.clear()
         self._course_metadata_cache.clear()
+        self._interest_hit_cache.clear()
+        self._interest_matcher = None
+        self._interest_key = None
+        self.tree_stats = {"queued": 0, "popped": 0, "rekeyed": 0, "dropped": 0}
+        self._tree_memo.clear()
+        self.memo_stats = {"lookups": 0, "hits": 0}
 
     def _get_course_metadata(self, course: Dict) -> Dict[str, Any]:
         code = course.get("code") or ""
         if not code:
-            return {"normalized_code": "", "department": "", "course_number": None}
+            return {"normalized_code": "", "department": "", "course_number": None, "search_text": ""}
         
         cache_key = f"{code}_{id(course)}"
         
@@ -206,11 +182,45 @@ class IntegratedRecommendationEngine:
             "normalized_code": normalized,
             "department": dept,
             "course_number": num,
+            "search_text": f"{normalized} {course.get('title') or ''}".lower(),
         }
         
         self._course_metadata_cache[cache_key] = metadata
         return metadata
 
+    def _set_interests(self, interests: List[str]) -> None:
+        """Compile the user's interest tokens into one alternation pattern."""
+        key = tuple(str(i) for i in interests if i) if isinstance(interests, list) else ()
+        if key == self._interest_key:
+            return
+        self._interest_key = key
+        self._interest_hit_cache.clear()
+
+        parts: Set[str] = set()
+        for interest in key:
+            for part in re.findall(r"[a-z0-9]+", interest.lower()):
+                if len(part) > 2:
+                    parts.add(part)
+        self._interest_matcher = (
+            re.compile("|".join(re.escape(p) for p in sorted(parts, key=len, reverse=True)))
+            if parts else None
+        )
+
+    def _has_interest_hit(self, course: Dict, course_code: str) -> bool:
+        cache_key = f"{course_code}_{id(course)}"
+        hit = self._interest_hit_cache.get(cache_key)
+        if hit is None:
+            if self._interest_matcher is None:
+                hit = False
+            else:
+                meta = self._get_course_metadata(course)
+                text = meta["search_text"]
+                if meta["normalized_code"] != course_code:
+                    text = f"{course_code} {course.get('title') or ''}".lower()
+                hit = self._interest_matcher.search(text) is not None
+            self._interest_hit_cache[cache_key] = hit
+        return hit
+
     def _strip_accents(self, s: str) -> str:
         return "".join(
             c for c in unicodedata.normalize("NFKD", s)
@@ -291,62 +301,15 @@ class IntegratedRecommendationEngine:
 
         return None
 
+    def _get_classification(self, course: Dict) -> Dict[str, Any]:
+        """Ingest-time classification flags, recomputed only when missing or stale."""
+        return get_classification(course, self._get_course_metadata(course))
+
     def _requires_permission(self, course: Dict) -> bool:
-        if course.get("permission_required"):
-            return True
-        
-        req_sentence = course.get("requirement_sentence") or ""
-        req_sentence_lower = req_sentence.lower()
-        
-        notes = (course.get("requirements") or {}).get("notes") or ""
-        notes_lower = notes.lower()
-        
-        combined_text = req_sentence_lower + " " + notes_lower
-        
-        permission_phrases = [
-            "permission of the department required",
-            "permission required prior to enrollment",
-            "permission required",
-            "consent required",
-            "department consent",
-            "instructor consent",
-            "permission of instructor",
-            "open only to students admitted",
-            "reserved for students in the bba program",
-            "reserved for students in the bsn",
-            "bba & specstubus students allowed",
-            "bsn students only",
-            "student cannot self-register",
-        ]
-        
-        return any(phrase in combined_text for phrase in permission_phrases)
+        return self._get_classification(course)["requires_permission"]
 
     def _is_restricted_course_type(self, course: Dict) -> bool:
-        course_type = (course.get("type") or "").upper()
-        
-        if course_type == "CLN":
-            return True
-        
-        if course_type in ("SUP", "THE"):
-            return True
-
-        # Hard block certain departments completely
-        meta = self._get_course_metadata(course)
-        dept = meta["department"]
-        if dept in {"NRSG", "NBB", "MI"}:
-            return True
-        
-        title = (course.get("title") or "").lower()
-        req_sentence = (course.get("requirement_sentence") or "").lower()
-        combined = title + " " + req_sentence
-        
-        if "nursing" in combined or ": bsn" in combined:
-            return True
-        
-        if "clinical clerkship" in combined or "clinical internship" in combined:
-            return True
-        
-        return False
+        return self._get_classification(course)["restricted_type"]
 
     def _has_valid_schedule_time(self, course: Dict) -> bool:
         schedule_loc = course.get("schedule_location")
@@ -363,24 +326,7 @@ class IntegratedRecommendationEngine:
         return len(blocks) > 0
 
     def _is_research_course(self, course: Dict) -> bool:
-        meta = self._get_course_metadata(course)
-        code = meta["normalized_code"]
-        title = (course.get("title") or "").lower()
-        
-        research_keywords = [
-            "independent study", "directed study", "directed research",
-            "undergraduate research", "honors research", "thesis", "special research",
-        ]
-        if any(kw in title for kw in research_keywords):
-            return True
-        
-        if code.endswith("R") and not code.endswith("RW"):
-            course_num = meta["course_number"]
-            if course_num:
-                if 395 <= course_num <= 399 or 485 <= course_num <= 499:
-                    return True
-        
-        return False
+        return self._get_classification(course)["research"]
 
     def _is_cross_listed_duplicate(
         self, 
@@ -844,13 +790,8 @@ class IntegratedRecommendationEngine:
         if removed_courses and course_code in removed_courses:
             return 0.0
         
-        if self._requires_permission(course):
-            return 0.0
-        
-        if self._is_research_course(course):
-            return 0.0
-        
-        if self._is_restricted_course_type(course):
+        flags = self._get_classification(course)
+        if flags["requires_permission"] or flags["research"] or flags["restricted_type"]:
             return 0.0
         
         course_gers = course.get("ger") or []
@@ -1003,20 +944,9 @@ class IntegratedRecommendationEngine:
         else:
             score += 7.5
 
-        text = f"{course_code} {course.get('title') or ''}".lower()
         if interests and isinstance(interests, list):
-            interest_hit = False
-            for interest in interests:
-                if not interest:
-                    continue
-                parts = re.findall(r"[a-z0-9]+", str(interest).lower())
-                for part in parts:
-                    if part and len(part) > 2 and part in text:
-                        interest_hit = True
-                        break
-                if interest_hit:
-                    break
-            if interest_hit:
+            self._set_interests(interests)
+            if self._has_interest_hit(course, course_code):
                 score += 12.0
 
         if time_pref and len(time_pref) == 2:
@@ -1198,6 +1128,7 @@ class IntegratedRecommendationEngine:
 
         schedule = [root_course_copy]
         current_schedule_codes = {root_code}
+        placed_ids = {id(root_course)}
         
         total_credits = parse_credits(root_course.get("credits"))
         department_counts = {root_dept: 1}
@@ -1306,7 +1237,80 @@ class IntegratedRecommendationEngine:
 
         must_course_candidates.sort(key=lambda x: x[0], reverse=True)
         lang_102_candidates.sort(key=lambda x: x[0], reverse=True)
-        other_candidates.sort(key=lambda x: x[0], reverse=True)
+
+        # Live queue for the remaining candidates. Keys are (score, -catalog order)
+        # so ties pop in catalog order. requirement_index maps each requirement a
+        # candidate's score depends on to its heap nodes, so that when the
+        # requirement is satisfied only those candidates get re-scored.
+        candidate_queue = FibonacciHeap()
+        requirement_index: Dict[Tuple, List] = {}
+
+        for order, (final_score, base_score, course, code) in enumerate(other_candidates):
+            is_outside_pref = self._is_outside_preferred_time(course, earliest_minutes, latest_minutes)
+            entry = {"base": base_score, "course": course, "code": code, "outside": is_outside_pref, "live": True}
+            node = candidate_queue.insert((final_score, -order), entry)
+
+            keys = [("code", code)]
+            for idx, group in enumerate(remaining_electives):
+                if code in group["courses"] and group["chosen"] < group["choose"]:
+                    keys.append(("elective", idx))
+            cand_gers = course.get("ger") or []
+            if isinstance(cand_gers, str):
+                cand_gers = [cand_gers]
+            open_gers = [g for g in cand_gers if g != "IC" and g in remaining_gers]
+            for g in open_gers:
+                keys.append(("ger", g))
+            if open_gers:
+                keys.append(("major_unmet",))
+            if self._get_course_metadata(course)["department"] in IC_LANGUAGE_PREFIXES:
+                keys.append(("language",))
+
+            for key in keys:
+                requirement_index.setdefault(key, []).append(node)
+
+        self.tree_stats["queued"] += len(other_candidates)
+
+        def drop_candidate(node) -> None:
+            node.data["live"] = False
+            candidate_queue.delete(node)
+            self.tree_stats["dropped"] += 1
+
+        def rekey_candidates(satisfied: List[Tuple]) -> None:
+            seen = set()
+            for key in satisfied:
+                for node in requirement_index.pop(key, ()):
+                    entry = node.data
+                    if not entry["live"] or id(node) in seen:
+                        continue
+                    seen.add(id(node))
+
+                    if entry["code"] in current_schedule_codes:
+                        drop_candidate(node)
+                        continue
+
+                    new_base = self._calculate_score(
+                        entry["course"], entry["code"], remaining_must, remaining_electives, remaining_gers,
+                        interests, time_pref, completed, rmp_index, year, ic_status,
+                        language_already_in_schedule=language_in_schedule,
+                        earliest_minutes=earliest_minutes,
+                        latest_minutes=latest_minutes,
+                        is_outside_time_pref=entry["outside"],
+                        locked_courses=locked_courses,
+                        removed_courses=removed_courses
+                    )
+                    if new_base <= 0:
+                        drop_candidate(node)
+                        continue
+
+                    entry["base"] = new_base
+                    new_final = self._calculate_contextual_score(entry["course"], root_course, new_base)
+                    candidate_queue.update_key(node, (new_final, node.key[1]))
+                    self.tree_stats["rekeyed"] += 1
+
+        def major_unmet() -> bool:
+            return bool(remaining_must) or any(
+                group["choose"] > group["chosen"] for group in remaining_electives
+            )
         
         def add_to_schedule(course: Dict, code: str, base_score: float, total_candidate_score: float, is_outside_pref: bool) -> bool:
             nonlocal total_credits, total_score, language_in_schedule
@@ -1338,12 +1342,17 @@ class IntegratedRecommendationEngine:
 
             schedule.append(course_copy)
             current_schedule_codes.add(code)
+            placed_ids.add(id(course))
             total_credits += course_credits
             
             department_counts[cand_dept] = department_counts.get(cand_dept, 0) + 1
             
-            if cand_dept in IC_LANGUAGE_PREFIXES:
+            satisfied = [("code", code)]
+            had_major_unmet = major_unmet()
+
+            if cand_dept in IC_LANGUAGE_PREFIXES and not language_in_schedule:
                 language_in_schedule = True
+                satisfied.append(("language",))
             
             total_score += total_candidate_score
 
@@ -1354,9 +1363,11 @@ class IntegratedRecommendationEngine:
             if code in remaining_must:
                 remaining_must.remove(code)
 
-            for group in remaining_electives:
+            for idx, group in enumerate(remaining_electives):
                 if code in group["courses"] and group["chosen"] < group["choose"]:
                     group["chosen"] += 1
+                    if group["chosen"] >= group["choose"]:
+                        satisfied.append(("elective", idx))
 
             course_gers = course.get("ger") or []
             if isinstance(course_gers, str):
@@ -1366,6 +1377,12 @@ class IntegratedRecommendationEngine:
                     remaining_gers[g] -= 1
                     if remaining_gers[g] <= 0:
                         del remaining_gers[g]
+                        satisfied.append(("ger", g))
+
+            if had_major_unmet and not major_unmet():
+                satisfied.append(("major_unmet",))
+
+            rekey_candidates(satisfied)
             
             return True
 
@@ -1410,12 +1427,55 @@ class IntegratedRecommendationEngine:
                 if add_to_schedule(course, code, base_score, total_candidate_score, is_outside_pref):
                     break
 
+        # Suffix memo for the fill phase. Every expansion step checks whether
+        # another root already reached the same canonical state (placed
+        # sections, requirement counters, occupied time, language flag) and, if
+        # so, reuses the courses it added from there. The root is left out of
+        # the key so roots can share suffixes; reused courses are re-scored
+        # against this root's synergy, but the picks were made under the
+        # root that first built the suffix.
+        memo_checkpoints: List[Tuple[Tuple, int]] = []
+
+        def memo_lookup() -> bool:
+            nonlocal total_score
+            if total_credits >= target_credits:
+                return False
+            key = (
+                frozenset(placed_ids),
+                frozenset(remaining_must),
+                tuple(group["chosen"] for group in remaining_electives),
+                frozenset(remaining_gers.items()),
+                frozenset(schedule_blocks),
+                language_in_schedule,
+            )
+            self.memo_stats["lookups"] += 1
+            cached_suffix = self._tree_memo.get(key)
+            if cached_suffix is None:
+                memo_checkpoints.append((key, len(schedule)))
+                return False
+            self.memo_stats["hits"] += 1
+            for cached in cached_suffix:
+                course_copy = dict(cached)
+                schedule.append(course_copy)
+                total_score += self._calculate_contextual_score(
+                    course_copy, root_course, course_copy["recommendation_score"]
+                )
+            return True
+
         backup_candidates = []
+        memo_hit = memo_lookup()
         
-        for total_candidate_score, base_score, course, code in other_candidates:
+        while not memo_hit and not candidate_queue.is_empty():
             if total_credits >= target_credits:
                 break
 
+            node = candidate_queue.extract_max_node()
+            entry = node.data
+            entry["live"] = False
+            self.tree_stats["popped"] += 1
+            total_candidate_score = node.key[0]
+            base_score, course, code = entry["base"], entry["course"], entry["code"]
+
             if self._has_time_conflict(course, schedule_blocks):
                 continue
             
@@ -1455,10 +1515,12 @@ class IntegratedRecommendationEngine:
                 continue
 
             is_outside_pref = self._is_outside_preferred_time(course, earliest_minutes, latest_minutes)
-            if not add_to_schedule(course, code, base_score, total_candidate_score, is_outside_pref):
+            if add_to_schedule(course, code, base_score, total_candidate_score, is_outside_pref):
+                memo_hit = memo_lookup()
+            else:
                 backup_candidates.append((total_candidate_score, base_score, course, code))
 
-        if total_credits < target_credits:
+        if not memo_hit and total_credits < target_credits:
             for total_candidate_score, base_score, course, code in backup_candidates:
                 if total_credits >= target_credits:
                     break
@@ -1478,6 +1540,9 @@ class IntegratedRecommendationEngine:
                 is_outside_pref = self._is_outside_preferred_time(course, earliest_minutes, latest_minutes)
                 add_to_schedule(course, code, base_score, total_candidate_score, is_outside_pref)
 
+        for key, suffix_start in memo_checkpoints:
+            self._tree_memo[key] = [dict(c) for c in schedule[suffix_start:]]
+
         balance_modifier = self._calculate_schedule_balance(schedule)
         total_score *= balance_modifier
 
@@ -1633,6 +1698,13 @@ class IntegratedRecommendationEngine:
             if not isinstance(interests, list):
                 interests = []
 
+            # Match interests against the whole catalog once; every root reuses the hits
+            self._set_interests(interests)
+            for course in all_courses:
+                meta = self._get_course_metadata(course)
+                if meta["normalized_code"]:
+                    self._has_interest_hit(course, meta["normalized_code"])
+
             # Get locked (user-added) and removed courses
             locked_courses_list = user_prefs.get("locked_courses") or []
             locked_courses = set()
@@ -2022,6 +2094,13 @@ def generate_schedule_for_user(
                 "interests": user_prefs.get("interests"),
                 "total_courses_processed": len(all_courses),
                 "target_credits": user_prefs.get("preferredCredits") or 15,
+                "engine_stats": dict(engine.tree_stats),
+                "memo": {
+                    "lookups": engine.memo_stats["lookups"],
+                    "hits": engine.memo_stats["hits"],
+                    "hit_rate": round(engine.memo_stats["hits"] / engine.memo_stats["lookups"], 3)
+                    if engine.memo_stats["lookups"] else 0.0,
+                },
             },
         }
     except Exception as e:
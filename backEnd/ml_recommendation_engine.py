@@ -1,102 +1,214 @@
 import os
-import math
+import json
 import re
-from typing import Dict, Any, List, Optional, Set
+import threading
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime
 
 import numpy as np
 
-try:
-    import joblib
-    JOBLIB_AVAILABLE = True
-except ImportError:
-    JOBLIB_AVAILABLE = False
-    print("[WARN] joblib not available, ML model will use rule-based scoring")
-
 from dotenv import load_dotenv
 
+from model_registry import ModelRegistry
+from professor_features import FEATURE_NAMES, feature_store_version, get_feature_store, professor_feature_row
+
 load_dotenv()
 
 # Path to the trained model
-MODEL_PATH = os.path.join(os.path.dirname(__file__), "recommender_ml.joblib")
+MODEL_FILENAME = "recommender_ml.joblib"
+MODEL_PATH = os.path.join(os.path.dirname(__file__), MODEL_FILENAME)
 
-# Global model cache
-_cached_model = None
+# Compiled export written by Model/Recommended_Courses.export_compiled_model;
+# preferred over MODEL_PATH because it needs neither joblib nor scikit-learn
+COMPILED_MODEL_FILENAME = "recommender_ml.json"
+COMPILED_MODEL_PATH = os.path.join(os.path.dirname(__file__), COMPILED_MODEL_FILENAME)
+COMPILED_FORMAT_VERSION = 1
 
+# Published model versions live under MODEL_REGISTRY_DIR/<version>/ with a
+# CURRENT pointer file; the files next to this module are the fallback
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", os.path.join(os.path.dirname(__file__), "models"))
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "30"))
 
-def load_ml_model():
-    global _cached_model
-    if _cached_model is not None:
-        return _cached_model
-    
-    if not JOBLIB_AVAILABLE:
+# Rule-based fallback weights, in feature order [rating, again, easy, pop]
+RULE_WEIGHTS = (0.55, 0.15, 0.15, 0.15)
+
+# Catalog documents, re-read from Mongo at most every CATALOG_REFRESH_INTERVAL
+# seconds; every (re)load bumps the version the feature matrix is cached on
+CATALOG_REFRESH_INTERVAL = float(os.getenv("CATALOG_REFRESH_INTERVAL", "300"))
+_catalog_cache: Dict[str, Any] = {"source": None, "courses": None, "loaded_at": 0.0, "version": 0}
+_catalog_lock = threading.Lock()
+
+# Catalog feature matrix, rebuilt only when the catalog or feature store version changes
+_feature_cache: Dict[str, Any] = {"version": None, "index": {}, "matrix": None}
+
+
+class CompiledLinearModel:
+    """Linear model evaluated with NumPy from the compiled JSON artifact."""
+
+    def __init__(self, artifact: Dict[str, Any]):
+        self.coef = np.asarray(artifact["coef"], dtype=float)
+        self.intercept = float(artifact["intercept"])
+        self.model_type = artifact.get("model_type")
+        self.version = artifact.get("model_version")
+        self.training = artifact.get("training") or {}
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return features @ self.coef + self.intercept
+
+
+def load_compiled_model(path: str = COMPILED_MODEL_PATH) -> Optional[CompiledLinearModel]:
+    if not os.path.exists(path):
         return None
-    
-    if os.path.exists(MODEL_PATH):
-        try:
-            _cached_model = joblib.load(MODEL_PATH)
-            print(f"[ML Engine] Loaded model from {MODEL_PATH}")
-            return _cached_model
-        except Exception as e:
-            print(f"[ML Engine] Failed to load model: {e}")
-            return None
-    else:
-        print(f"[ML Engine] Model file not found at {MODEL_PATH}")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            artifact = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[ML Engine] Failed to read compiled model: {e}")
         return None
 
+    if artifact.get("format_version") != COMPILED_FORMAT_VERSION:
+        print(f"[ML Engine] Unsupported compiled model format {artifact.get('format_version')}")
+        return None
+    if artifact.get("features") != FEATURE_NAMES:
+        print(f"[ML Engine] Compiled model feature schema {artifact.get('features')} does not match {FEATURE_NAMES}")
+        return None
+    return CompiledLinearModel(artifact)
 
-def norm(val, lo, hi, invert=False):
-    if val is None:
-        return 0.0
+
+def load_joblib_model(path: str = MODEL_PATH):
+    # Only needed for model types that have no compiled form
+    if not os.path.exists(path):
+        return None
     try:
-        v = max(lo, min(hi, float(val)))
-    except (TypeError, ValueError):
-        return 0.0
-    x = (v - lo) / (hi - lo) if hi > lo else 0.0
-    return 1.0 - x if invert else x
+        import joblib
+    except ImportError:
+        print("[WARN] joblib not available, ML model will use rule-based scoring")
+        return None
+    try:
+        return joblib.load(path)
+    except Exception as e:
+        print(f"[ML Engine] Failed to load model: {e}")
+        return None
 
 
-def safe_num_ratings(val):
-    if val is None:
-        return 0.0
-    try:
-        return float(val)
-    except (TypeError, ValueError):
-        return 0.0
+def load_model_dir(path: str):
+    """Registry loader: prefer the compiled artifact, fall back to joblib."""
+    compiled = load_compiled_model(os.path.join(path, COMPILED_MODEL_FILENAME))
+    if compiled is not None:
+        return compiled, "compiled"
+    model = load_joblib_model(os.path.join(path, MODEL_FILENAME))
+    if model is not None:
+        return model, "joblib"
+    return None, None
+
+
+model_registry = ModelRegistry(
+    MODEL_REGISTRY_DIR,
+    load_dir=load_model_dir,
+    fallback_dir=os.path.dirname(os.path.abspath(__file__)),
+    watch_interval=MODEL_WATCH_INTERVAL,
+)
+
+
+def load_ml_model():
+    """Return the serving model, loading it here only if startup didn't."""
+    version, model = model_registry.active()
+    if version is None:
+        model_registry.refresh()
+        version, model = model_registry.active()
+    return model
+
+
+def _feature_row(course: Dict[str, Any]) -> tuple:
+    return professor_feature_row(course.get("rmp"))
 
 
 def extract_features(course: Dict[str, Any]) -> np.ndarray:
-    rmp = course.get("rmp") or {}
-    
-    rating = norm(rmp.get("rating"), 0, 5)
-    again = norm(rmp.get("would_take_again_%") or rmp.get("would_take_again_pct"), 0, 100)
-    easy = norm(rmp.get("difficulty"), 1, 5, invert=True)
-    
-    raw_num = rmp.get("num_ratings")
-    num = safe_num_ratings(raw_num)
-    pop = math.log1p(num) / math.log1p(100) if num > 0 else 0.0
-    
-    return np.array([rating, again, easy, pop], dtype=float)
+    return np.array(_feature_row(course), dtype=float)
+
+
+def extract_feature_matrix(courses: List[Dict[str, Any]]) -> np.ndarray:
+    """Build the (n_courses, n_features) matrix, from the professor feature store when built."""
+    if not courses:
+        return np.zeros((0, len(FEATURE_NAMES)), dtype=float)
+    store = get_feature_store()
+    if store is not None:
+        return store.feature_matrix(courses)
+    return np.array([_feature_row(c) for c in courses], dtype=float)
+
+
+def _course_key(course: Dict[str, Any]) -> str:
+    if course.get("_id") is not None:
+        return str(course["_id"])
+    # (code, section) is unique in the catalog; two sections of a course can
+    # share a time and professor
+    return f"{course.get('code')}|{course.get('section')}|{course.get('time')}|{course.get('professor')}"
+
+
+def load_catalog(enriched_courses_col, max_age: float = CATALOG_REFRESH_INTERVAL) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Return (courses, version) for the catalog collection. The documents are
+    re-read when a different collection is passed, when the cached copy is
+    older than max_age seconds, or after refresh_catalog(); each read bumps
+    version. Callers must not mutate the returned documents.
+    """
+    with _catalog_lock:
+        stale = time.monotonic() - _catalog_cache["loaded_at"] >= max_age
+        if _catalog_cache["source"] is not enriched_courses_col or _catalog_cache["courses"] is None or stale:
+            _catalog_cache["courses"] = list(enriched_courses_col.find({}))
+            _catalog_cache["source"] = enriched_courses_col
+            _catalog_cache["loaded_at"] = time.monotonic()
+            _catalog_cache["version"] += 1
+        return _catalog_cache["courses"], _catalog_cache["version"]
+
+
+def refresh_catalog() -> None:
+    """Make the next load_catalog() re-read the collection, e.g. after the catalog is rewritten."""
+    with _catalog_lock:
+        _catalog_cache["courses"] = None
+
+
+def get_catalog_features(courses: List[Dict[str, Any]], version: int):
+    """Return (matrix, key -> row index) for the catalog, cached by catalog + feature store version."""
+    version = f"catalog:{version}|store:{feature_store_version()}"
+    if _feature_cache["version"] != version:
+        _feature_cache["matrix"] = extract_feature_matrix(courses)
+        _feature_cache["index"] = {_course_key(c): i for i, c in enumerate(courses)}
+        _feature_cache["version"] = version
+    return _feature_cache["matrix"], _feature_cache["index"]
 
 
 def score_course_rule_based(course: Dict[str, Any], 
                             w_rating=0.55, w_again=0.15, w_easy=0.15, w_pop=0.15) -> float:
-    features = extract_features(course)
-    rating, again, easy, pop = features
+    rating, again, easy, pop = _feature_row(course)
     return (w_rating * rating) + (w_again * again) + (w_easy * easy) + (w_pop * pop)
 
 
+def score_courses_rule_based(features: np.ndarray, weights=RULE_WEIGHTS) -> np.ndarray:
+    # Column-wise in the same order as score_course_rule_based so the
+    # results match the scalar version exactly
+    w_rating, w_again, w_easy, w_pop = weights
+    return (
+        (w_rating * features[:, 0]) + (w_again * features[:, 1])
+        + (w_easy * features[:, 2]) + (w_pop * features[:, 3])
+    )
+
+
 def score_course_ml(course: Dict[str, Any], model) -> float:
-    if model is None:
-        return score_course_rule_based(course)
+    return float(score_courses_ml(extract_features(course).reshape(1, -1), model)[0])
+
+
+def score_courses_ml(features: np.ndarray, model) -> np.ndarray:
+    """Score a feature matrix with one predict call; rule-based when no model."""
+    if model is None or len(features) == 0:
+        return score_courses_rule_based(features)
     
-    features = extract_features(course)
     try:
-        score = float(model.predict(features.reshape(1, -1))[0])
-        return score
+        return np.asarray(model.predict(features), dtype=float)
     except Exception as e:
         print(f"[ML Engine] Prediction failed: {e}")
-        return score_course_rule_based(course)
+        return score_courses_rule_based(features)
 
 
 def normalize_code(code: str) -> str:
@@ -226,126 +338,163 @@ def filter_completed_courses(courses: List[Dict], completed_codes: Set[str]) ->
     return [c for c in courses if normalize_code(c.get("code", "")) not in completed_normalized]
 
 
-def build_conflict_free_schedules(
-    ranked_courses: List[Dict],
-    num_schedules: int = 10,
-    max_credits: int = 18,
-    min_courses: int = 4,
-    max_courses: int = 6
-) -> List[Dict]:
-    def safe_credits(raw, default: float = 3.0) -> float:
-        
-        if raw is None:
-            return default
-        if isinstance(raw, (int, float)):
-            try:
-                return float(raw)
-            except (TypeError, ValueError):
-                return default
-
-        if isinstance(raw, str):
-            # Extract numbers and optional range (supports hyphen or en dash)
-            match = re.match(r"\s*(\d+(?:\.\d+)?)(?:\s*[-\u2013]\s*(\d+(?:\.\d+)?))?", raw)
-            if match:
-                first = float(match.group(1))
-                second = float(match.group(2)) if match.group(2) else None
-                # Use upper bound if present, otherwise first number
-                return second if second is not None else first
+def safe_credits(raw, default: float = 3.0) -> float:
+    if raw is None:
+        return default
+    if isinstance(raw, (int, float)):
         try:
             return float(raw)
         except (TypeError, ValueError):
             return default
 
-    schedules = []
-    used_root_codes = set()
-    
-    for root_course in ranked_courses[:50]:  # Try first 50 as roots
-        root_code = normalize_code(root_course.get("code", ""))
-        if root_code in used_root_codes:
-            continue
-        
-        schedule_courses = [root_course]
-        total_credits = safe_credits(root_course.get("credits", 3))
-        schedule_blocks = []
-        
-        # Get time blocks for root course
-        meeting = root_course.get("meeting") or {}
-        if isinstance(meeting, dict):
-            days = meeting.get("days") or []
-            start = meeting.get("start_min")
-            end = meeting.get("end_min")
-            if days and start is not None and end is not None:
-                for d in days:
-                    schedule_blocks.append({"day": d, "start": start, "end": end})
-        
-        # Add more courses
-        for candidate in ranked_courses:
-            if len(schedule_courses) >= max_courses:
-                break
-            if total_credits >= max_credits:
-                break
-            
-            cand_code = normalize_code(candidate.get("code", ""))
-            if cand_code == root_code:
-                continue
-            if any(normalize_code(c.get("code", "")) == cand_code for c in schedule_courses):
-                continue
-            
-            # Check time conflict with current schedule
-            cand_meeting = candidate.get("meeting") or {}
-            if isinstance(cand_meeting, dict):
-                cand_days = cand_meeting.get("days") or []
-                cand_start = cand_meeting.get("start_min")
-                cand_end = cand_meeting.get("end_min")
+    if isinstance(raw, str):
+        # Extract numbers and optional range (supports hyphen or en dash)
+        match = re.match(r"\s*(\d+(?:\.\d+)?)(?:\s*[-\u2013]\s*(\d+(?:\.\d+)?))?", raw)
+        if match:
+            first = float(match.group(1))
+            second = float(match.group(2)) if match.group(2) else None
+            # Use upper bound if present, otherwise first number
+            return second if second is not None else first
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return default
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _week_mask(days: List[str], start: Optional[int], end: Optional[int], day_slots: Dict[str, int]) -> int:
+    """Bitmask with one bit per minute of the week the meeting occupies."""
+    if not days or start is None or end is None:
+        return 0
+    try:
+        start = max(0, int(start))
+        end = min(MINUTES_PER_DAY, int(end))
+    except (TypeError, ValueError):
+        return 0
+    if end <= start:
+        return 0
+    span = ((1 << (end - start)) - 1) << start
+    mask = 0
+    for d in days:
+        slot = day_slots.setdefault(d, len(day_slots))
+        mask |= span << (slot * MINUTES_PER_DAY)
+    return mask
+
+
+class ScheduleAssembler:
+    """
+    Greedy conflict-free schedule assembly over a ranked course list.
+
+    Each course's normalized code, credits and week bitmasks are computed at
+    most once, and only when the scan first reaches it; roots usually fill up
+    within the first few candidates, so most of the list is never prepared.
+    Placed codes are a set and occupied time is a single int mask. A root only
+    blocks time through its meeting dict; a candidate also falls back to
+    parsing its time string.
+    """
+
+    def __init__(self, ranked_courses: List[Dict]):
+        self.ranked_courses = ranked_courses
+        self._prepared: List[tuple] = []
+        self._day_slots: Dict[str, int] = {}
+
+    def _prepare_through(self, index: int) -> None:
+        day_slots = self._day_slots
+        for course in self.ranked_courses[len(self._prepared):index + 1]:
+            meeting = course.get("meeting") or {}
+            if isinstance(meeting, dict):
+                days = meeting.get("days") or []
+                cand_mask = root_mask = _week_mask(days, meeting.get("start_min"), meeting.get("end_min"), day_slots)
             else:
-                parsed = parse_meeting_time(candidate.get("time", ""))
-                cand_days = parsed["days"]
-                cand_start = parsed["start_min"]
-                cand_end = parsed["end_min"]
-            
-            conflict = False
-            if cand_days and cand_start is not None and cand_end is not None:
-                for block in schedule_blocks:
-                    if block["day"] in cand_days:
-                        if max(block["start"], cand_start) < min(block["end"], cand_end):
-                            conflict = True
-                            break
-            
-            if conflict:
+                parsed = parse_meeting_time(course.get("time", ""))
+                cand_mask = _week_mask(parsed["days"], parsed["start_min"], parsed["end_min"], day_slots)
+                root_mask = 0
+            self._prepared.append((
+                course,
+                normalize_code(course.get("code", "")),
+                safe_credits(course.get("credits", 3)),
+                root_mask,
+                cand_mask,
+            ))
+
+    def _entry(self, index: int) -> tuple:
+        if index >= len(self._prepared):
+            self._prepare_through(index)
+        return self._prepared[index]
+
+    def assemble(
+        self,
+        num_schedules: int = 10,
+        max_credits: int = 18,
+        min_courses: int = 4,
+        max_courses: int = 6,
+        max_roots: int = 50
+    ) -> List[Dict]:
+        schedules = []
+        used_root_codes = set()
+        n = len(self.ranked_courses)
+        
+        for root_index in range(min(max_roots, n)):
+            root_course, root_code, root_credits, root_mask, _ = self._entry(root_index)
+            if root_code in used_root_codes:
                 continue
             
-            # Add course to schedule
-            cand_credits = safe_credits(candidate.get("credits", 3))
-            if total_credits + cand_credits > max_credits:
-                continue
+            schedule_courses = [root_course]
+            placed_codes = {root_code}
+            total_credits = root_credits
+            occupied = root_mask
             
-            schedule_courses.append(candidate)
-            total_credits += cand_credits
+            for index in range(n):
+                if len(schedule_courses) >= max_courses:
+                    break
+                if total_credits >= max_credits:
+                    break
+                
+                course, code, credits, _, mask = self._entry(index)
+                if code in placed_codes:
+                    continue
+                if mask & occupied:
+                    continue
+                if total_credits + credits > max_credits:
+                    continue
+                
+                schedule_courses.append(course)
+                placed_codes.add(code)
+                total_credits += credits
+                occupied |= mask
             
-            # Add time blocks
-            if cand_days and cand_start is not None and cand_end is not None:
-                for d in cand_days:
-                    schedule_blocks.append({"day": d, "start": cand_start, "end": cand_end})
+            if len(schedule_courses) >= min_courses:
+                used_root_codes.add(root_code)
+                
+                schedules.append({
+                    "root_course_code": root_code,
+                    "courses": schedule_courses,
+                    "course_count": len(schedule_courses),
+                    "total_credits": total_credits,
+                    "total_score": sum(c.get("score", 0) for c in schedule_courses)
+                })
+                
+                if len(schedules) >= num_schedules:
+                    break
         
-        if len(schedule_courses) >= min_courses:
-            used_root_codes.add(root_code)
-            
-            # Calculate total score
-            total_score = sum(c.get("score", 0) for c in schedule_courses)
-            
-            schedules.append({
-                "root_course_code": root_code,
-                "courses": schedule_courses,
-                "course_count": len(schedule_courses),
-                "total_credits": total_credits,
-                "total_score": total_score
-            })
-            
-            if len(schedules) >= num_schedules:
-                break
-    
-    return schedules
+        return schedules
+
 
+def build_conflict_free_schedules(
+    ranked_courses: List[Dict],
+    num_schedules: int = 10,
+    max_credits: int = 18,
+    min_courses: int = 4,
+    max_courses: int = 6
+) -> List[Dict]:
+    return ScheduleAssembler(ranked_courses).assemble(
+        num_schedules=num_schedules,
+        max_credits=max_credits,
+        min_courses=min_courses,
+        max_courses=max_courses
+    )
 
 def generate_schedule_for_user(
     uid: str,
@@ -357,8 +506,10 @@ def generate_schedule_for_user(
     num_recommendations: int = 10
 ) -> Dict[str, Any]:
     try:
-        # Load ML model
-        model = load_ml_model()
+        # Snapshot the serving model once so a swap mid-request can't mix versions
+        load_ml_model()
+        model_version, model = model_registry.active()
+        model_registry.record_served(model_version)
         
         # Get user courses
         user_courses = course_col.find_one({"uid": uid}, sort=[("_id", -1)])
@@ -380,8 +531,8 @@ def generate_schedule_for_user(
         # Get time unavailable blocks
         time_unavailable = user_prefs.get("timeUnavailable", [])
         
-        # Get all enriched courses
-        all_courses = list(enriched_courses_col.find({}))
+        # Get all enriched courses (shared between requests until the next reload)
+        all_courses, catalog_version = load_catalog(enriched_courses_col)
         
         # Filter out completed courses
         available_courses = filter_completed_courses(all_courses, completed_codes)
@@ -390,14 +541,18 @@ def generate_schedule_for_user(
         filtered_courses = []
         for course in available_courses:
             if not check_time_conflict(course, time_unavailable):
-                filtered_courses.append(course)
+                # Copy: scoring and the JSON clean-up below write to these
+                filtered_courses.append(dict(course))
         
         if not filtered_courses:
             return {"success": False, "error": "No available courses after filtering"}
         
-        # Score courses using ML model
-        for course in filtered_courses:
-            course["score"] = score_course_ml(course, model)
+        # Score all candidates with one predict call over the cached catalog features
+        catalog_features, feature_index = get_catalog_features(all_courses, catalog_version)
+        rows = [feature_index[_course_key(c)] for c in filtered_courses]
+        scores = score_courses_ml(catalog_features[rows], model).tolist()
+        for course, score in zip(filtered_courses, scores):
+            course["score"] = score
             course["normalized_code"] = normalize_code(course.get("code", ""))
         
         # Sort by score
@@ -432,6 +587,10 @@ def generate_schedule_for_user(
             "engine": "ml",
             "metadata": {
                 "model_loaded": model is not None,
+                "model_version": model_version,
+                "model_format": None if model is None else (
+                    "compiled" if isinstance(model, CompiledLinearModel) else "joblib"
+                ),
                 "total_available_courses": len(filtered_courses),
                 "completed_courses": len(completed_codes),
                 "generated_at": datetime.utcnow().isoformat()
@@ -0,0 +1,160 @@
+"""
+Versioned model registry with hot swapping.
+
+Layout:
+  <registry_dir>/
+    CURRENT            pointer file holding the active version name
+    <version>/         one directory per published model artifact set
+
+A background watcher polls CURRENT and, when it names a new version, loads it
+off the request path and swaps it in with a single reference assignment, so a
+request either sees the old (version, model) pair or the new one, never a mix.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+POINTER_FILE = "CURRENT"
+BUNDLED_VERSION = "bundled"
+
+
+class ModelRegistry:
+
+    def __init__(
+        self,
+        registry_dir: str,
+        load_dir: Callable[[str], Tuple[Any, str]],
+        fallback_dir: Optional[str] = None,
+        watch_interval: float = 30.0,
+    ):
+        """
+        load_dir(path) loads the artifacts in a directory and returns
+        (model, format) or (None, None) when nothing usable is there.
+        fallback_dir is served as version "bundled" when the registry has no
+        pointer yet (e.g. the model files shipped next to the engine).
+        """
+        self.registry_dir = registry_dir
+        self.load_dir = load_dir
+        self.fallback_dir = fallback_dir
+        self.watch_interval = watch_interval
+
+        # (version, model, info) - replaced as a whole, never mutated
+        self._active: Tuple[Optional[str], Any, Dict[str, Any]] = (None, None, {})
+        # Guards the load decision, the swap and the served counters; a load
+        # itself runs outside it so requests never wait on one
+        self._load_lock = threading.Lock()
+        self._served: Dict[str, int] = {}
+        self._last_served: Optional[str] = None
+        self._failed_version: Optional[str] = None
+        self._bundled_failed = False
+        self._loading = False
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def read_pointer(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.registry_dir, POINTER_FILE), "r", encoding="utf-8") as f:
+                version = f.read().strip()
+        except OSError:
+            return None
+        return version or None
+
+    def active(self) -> Tuple[Optional[str], Any]:
+        version, model, _ = self._active
+        return version, model
+
+    def refresh(self) -> bool:
+        """
+        Load the version named by CURRENT if it differs from the active one.
+        With nothing active yet and no loadable CURRENT, fall back to the
+        bundled model so the engine still has something to serve.
+        """
+        with self._load_lock:
+            if self._loading:
+                return False
+            version = self.read_pointer()
+            active = self._active[0]
+            candidates = []
+            # Don't retry (and re-log) a broken version until CURRENT changes
+            if version is not None and version != active and version != self._failed_version:
+                candidates.append((version, os.path.join(self.registry_dir, version)))
+            if active is None and self.fallback_dir and not self._bundled_failed:
+                candidates.append((BUNDLED_VERSION, self.fallback_dir))
+            if not candidates:
+                return False
+            self._loading = True
+
+        try:
+            for version, path in candidates:
+                loaded = self._load(version, path)
+                with self._load_lock:
+                    if loaded is not None:
+                        previous = self._active[0]
+                        self._active = loaded
+                        print(f"[Model Registry] Serving model {version} (was {previous})")
+                        return True
+                    if version == BUNDLED_VERSION:
+                        self._bundled_failed = True
+                    else:
+                        self._failed_version = version
+            return False
+        finally:
+            with self._load_lock:
+                self._loading = False
+
+    def _load(self, version: str, path: str) -> Optional[Tuple[str, Any, Dict[str, Any]]]:
+        """Load one artifact directory (off the lock); None when it is not usable."""
+        started = time.perf_counter()
+        try:
+            model, model_format = self.load_dir(path)
+        except Exception as e:
+            print(f"[Model Registry] Failed to load version {version}: {e}")
+            return None
+        if model is None:
+            print(f"[Model Registry] No loadable model in {path}; keeping {self._active[0]}")
+            return None
+        info = {
+            "format": model_format,
+            "path": path,
+            "loaded_at": datetime.utcnow().isoformat(),
+            "load_seconds": round(time.perf_counter() - started, 4),
+        }
+        return version, model, info
+
+    def _watch(self):
+        while not self._stop.wait(self.watch_interval):
+            self.refresh()
+
+    def start(self, watch: bool = True):
+        """Load the current version now and optionally keep polling for new ones."""
+        self.refresh()
+        if watch and self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name="model-registry-watcher", daemon=True)
+            self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def record_served(self, version: Optional[str]):
+        key = version or "none"
+        with self._load_lock:
+            self._served[key] = self._served.get(key, 0) + 1
+            self._last_served = key
+
+    def status(self) -> Dict[str, Any]:
+        version, model, info = self._active
+        return {
+            "version": version,
+            "loaded": model is not None,
+            **info,
+            "registry_dir": self.registry_dir,
+            "watching": self._watcher is not None and self._watcher.is_alive(),
+            **self._served_snapshot(),
+        }
+
+    def _served_snapshot(self) -> Dict[str, Any]:
+        with self._load_lock:
+            return {"last_served_version": self._last_served, "requests_by_version": dict(self._served)}
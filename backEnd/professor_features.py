@@ -0,0 +1,161 @@
+"""
+Professor feature store.
+
+The four RMP-derived model features (normalized rating, would-take-again,
+ease, log-popularity) depend only on the professor, so scripts/rmp_features.py
+computes them once per RMP professor and saves a compact table:
+
+  rmp_features.npz
+    ids       (n,)  RMP professor ids (the number in the ratemyprofessors URL)
+    features  (n,4) float64, columns in FEATURE_NAMES order
+
+Course documents reference a professor through rmp.id (set during
+enrichment); for older documents the id is recovered from rmp.url. Courses
+whose professor is not in the table fall back to their embedded rmp dict.
+"""
+
+import math
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+FEATURE_NAMES = ["rating_norm", "again_norm", "easy_norm", "popularity_norm"]
+
+FEATURE_STORE_PATH = os.getenv(
+    "RMP_FEATURES_PATH", os.path.join(os.path.dirname(__file__), "rmp_features.npz")
+)
+
+_RMP_ID_RE = re.compile(r"/professor/(\d+)")
+
+
+def norm(val, lo, hi, invert=False):
+    if val is None:
+        return 0.0
+    try:
+        v = max(lo, min(hi, float(val)))
+    except (TypeError, ValueError):
+        return 0.0
+    x = (v - lo) / (hi - lo) if hi > lo else 0.0
+    return 1.0 - x if invert else x
+
+
+def safe_num_ratings(val):
+    if val is None:
+        return 0.0
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def rmp_id_from_url(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    m = _RMP_ID_RE.search(str(url))
+    return m.group(1) if m else None
+
+
+def professor_feature_row(rmp: Dict[str, Any]) -> tuple:
+    """Features for one RMP record (a Professors doc or a course's embedded rmp)."""
+    rmp = rmp or {}
+
+    rating = norm(rmp.get("rating"), 0, 5)
+    again = norm(rmp.get("would_take_again_%") or rmp.get("would_take_again_pct"), 0, 100)
+    easy = norm(rmp.get("difficulty"), 1, 5, invert=True)
+
+    num = safe_num_ratings(rmp.get("num_ratings"))
+    pop = math.log1p(num) / math.log1p(100) if num > 0 else 0.0
+
+    return (rating, again, easy, pop)
+
+
+def course_rmp_id(course: Dict[str, Any]) -> Optional[str]:
+    rmp = course.get("rmp") or {}
+    rmp_id = rmp.get("id")
+    if rmp_id:
+        return str(rmp_id)
+    return rmp_id_from_url(rmp.get("url"))
+
+
+class ProfessorFeatureStore:
+
+    def __init__(self, ids: List[str], features: np.ndarray):
+        self.ids = list(ids)
+        self.features = features
+        self.index = {rmp_id: i for i, rmp_id in enumerate(self.ids)}
+
+    @classmethod
+    def load(cls, path: str = FEATURE_STORE_PATH) -> Optional["ProfessorFeatureStore"]:
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["ids"].tolist(), data["features"].astype(float))
+
+    def save(self, path: str = FEATURE_STORE_PATH):
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, ids=np.array(self.ids, dtype=str), features=self.features)
+        os.replace(tmp_path, path)
+
+    def feature_matrix(self, courses: List[Dict[str, Any]]) -> np.ndarray:
+        """(n_courses, n_features) matrix: table rows where known, embedded rmp otherwise."""
+        matrix = np.empty((len(courses), len(FEATURE_NAMES)), dtype=float)
+        for i, course in enumerate(courses):
+            row = self.index.get(course_rmp_id(course))
+            if row is not None:
+                matrix[i] = self.features[row]
+            else:
+                matrix[i] = professor_feature_row(course.get("rmp"))
+        return matrix
+
+
+def build_feature_store(professors: List[Dict[str, Any]]) -> ProfessorFeatureStore:
+    ids = []
+    rows = []
+    for doc in professors:
+        rmp_id = rmp_id_from_url(doc.get("url"))
+        if not rmp_id:
+            continue
+        ids.append(rmp_id)
+        rows.append(professor_feature_row(doc))
+    features = np.array(rows, dtype=float).reshape(len(rows), len(FEATURE_NAMES))
+    return ProfessorFeatureStore(ids, features)
+
+
+_store = None
+_store_mtime: Optional[int] = None
+_store_lock = threading.Lock()
+
+
+def _store_file_mtime() -> Optional[int]:
+    try:
+        return os.stat(FEATURE_STORE_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_feature_store() -> Optional[ProfessorFeatureStore]:
+    """
+    Process-wide store; None when no table has been built. Reloaded when
+    rmp_features.npz changes on disk (scripts/rmp_features.py replaces it
+    atomically), so a long-running server picks up a rebuilt table.
+    """
+    global _store, _store_mtime
+    mtime = _store_file_mtime()
+    if mtime == _store_mtime:
+        return _store
+    with _store_lock:
+        if mtime != _store_mtime:
+            _store = ProfessorFeatureStore.load() if mtime is not None else None
+            _store_mtime = mtime
+            if _store is not None:
+                print(f"[Feature Store] Loaded {len(_store.ids)} professors from {FEATURE_STORE_PATH}")
+    return _store
+
+
+def feature_store_version() -> str:
+    """Version of the table get_feature_store() serves, for feature-cache keys."""
+    get_feature_store()
+    return str(_store_mtime) if _store_mtime is not None else "none"
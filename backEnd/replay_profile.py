@@ -0,0 +1,100 @@
+"""
+Replay a profiled request offline.
+
+Usage:
+  python replay_profile.py profiles/<run_dir> [--engine fibheap|ml] [--profile]
+
+The saved user state in <run_dir>/input.json is served from memory; the course
+catalog, BasicCourses and RMP collections are read from MONGODB_URI as the app
+does. Pass --profile to write a fresh set of artifacts for before/after diffs.
+
+Only the user state is saved, so a replay is reproducible only while those
+collections are unchanged. The capture records a fingerprint of each one and
+the replay warns when the live data no longer matches.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'FibHeap'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from request_profiler import collection_fingerprint, profile_call
+
+
+class SavedDocCollection:
+    """Read-only stand-in for a user collection holding one saved document."""
+
+    def __init__(self, doc):
+        self.doc = doc
+
+    def find_one(self, query=None, sort=None, *args, **kwargs):
+        if not self.doc:
+            return None
+        if query and any(self.doc.get(k) != v for k, v in query.items()):
+            return None
+        return dict(self.doc)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("run_dir", help="Profile artifact directory containing input.json")
+    parser.add_argument("--engine", choices=["fibheap", "ml"], help="Override the engine recorded in input.json")
+    parser.add_argument("--profile", action="store_true", help="Profile the replay as well")
+    args = parser.parse_args()
+
+    with open(os.path.join(args.run_dir, "input.json"), "r", encoding="utf-8") as f:
+        state = json.load(f)
+
+    engine_type = args.engine or state.get("engine_type", "fibheap")
+    if engine_type == "ml":
+        from ml_recommendation_engine import generate_schedule_for_user
+    else:
+        from integrated_recommendation_engine import generate_schedule_for_user
+
+    load_dotenv()
+    client = MongoClient(os.getenv("MONGODB_URI"))
+    catalog_cols = {
+        "DetailedCourses": client["DetailedCourses"]["DetailedCourses"],
+        "BasicCourses": client["BasicCourses"]["BasicCourses"],
+        "RMP": client["RMP"]["RMP"],
+    }
+
+    captured = state.get("catalog")
+    if not captured:
+        print("[WARN] input.json has no catalog fingerprints; cannot tell whether the catalog changed")
+    else:
+        for name, col in catalog_cols.items():
+            live = collection_fingerprint(col)
+            if captured.get(name) != live:
+                print(f"[WARN] {name} changed since capture ({captured.get(name)} -> {live}); "
+                      f"results may differ from the profiled run")
+
+    def call():
+        return generate_schedule_for_user(
+            uid=state["uid"],
+            course_col=SavedDocCollection(state.get("user_courses")),
+            pref_col=SavedDocCollection(state.get("user_prefs")),
+            enriched_courses_col=catalog_cols["DetailedCourses"],
+            rmp_col=catalog_cols["RMP"],
+            basic_courses_col=catalog_cols["BasicCourses"],
+            num_recommendations=state.get("num_recommendations", 10),
+        )
+
+    if args.profile:
+        result, _ = profile_call(f"replay-{state.get('endpoint', 'request')}", call, state)
+    else:
+        result = call()
+
+    print(f"success={result.get('success')} schedules={len(result.get('schedules', []))}")
+    if not result.get("success"):
+        print(f"error: {result.get('error')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Opt-in profiling for schedule generation requests.
+
+Profiling is off unless one of these is set:
+  - PROFILE_REQUESTS=1 together with PROFILE_SAMPLE_RATE (0.0-1.0, default 1.0)
+  - an "X-Profile-Token" header matching PROFILE_ADMIN_TOKEN
+
+Each profiled request writes a directory under PROFILE_DIR (default
+backEnd/profiles) containing:
+  profile.pstats     cProfile stats (load with pstats / snakeviz)
+  stacks.collapsed   sampled stacks, one "frame;frame;frame count" per line
+                     (feed to flamegraph.pl or speedscope)
+  allocations.txt    tracemalloc top allocation sites + peak
+  input.json         anonymized user state needed to replay the request, plus
+                     fingerprints of the catalog collections it read
+
+Only one request is profiled at a time: cProfile hooks and tracemalloc are
+process-global, so a request that would overlap a profiled one runs
+unprofiled instead (its response has no profile_id). Allocations made by
+other threads during a profiled request still show up in allocations.txt.
+
+Replay with:  python replay_profile.py profiles/<dir>
+
+The catalog itself is not saved: a replay reads the live collections again and
+warns when their fingerprints no longer match the ones captured.
+"""
+
+import cProfile
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(__file__), "profiles"))
+PROFILE_HEADER = "X-Profile-Token"
+
+SAMPLE_INTERVAL_S = 0.005
+TOP_ALLOCATIONS = 25
+
+# Held for the whole of a profiled call; see profile_call
+_profile_lock = threading.Lock()
+
+# Keys that may identify a student; dropped from saved input state
+PII_KEYS = {"_id", "email", "name", "displayName", "display_name", "phone"}
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def should_profile(headers) -> bool:
+    """Decide whether this request runs under the profiler."""
+    admin_token = os.getenv("PROFILE_ADMIN_TOKEN")
+    if admin_token and headers is not None and headers.get(PROFILE_HEADER) == admin_token:
+        return True
+
+    if not _env_flag("PROFILE_REQUESTS"):
+        return False
+
+    try:
+        rate = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+    except ValueError:
+        rate = 1.0
+    return random.random() < rate
+
+
+def anonymize_uid(uid: Optional[str]) -> Optional[str]:
+    if not uid:
+        return None
+    return "anon-" + hashlib.sha256(str(uid).encode("utf-8")).hexdigest()[:12]
+
+
+def anonymize_doc(doc: Optional[Dict], anon_uid: Optional[str]) -> Optional[Dict]:
+    if not doc:
+        return doc
+    clean = {k: v for k, v in doc.items() if k not in PII_KEYS}
+    if "uid" in clean:
+        clean["uid"] = anon_uid
+    return clean
+
+
+def collection_fingerprint(col) -> Dict[str, Any]:
+    """Document count plus an order-independent hash of every document in col."""
+    digests = sorted(
+        hashlib.sha256(json.dumps(doc, sort_keys=True, default=str).encode("utf-8")).digest()
+        for doc in col.find({})
+    )
+    h = hashlib.sha256()
+    for d in digests:
+        h.update(d)
+    return {"count": len(digests), "sha256": h.hexdigest()[:16]}
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack into collapsed-stack counts."""
+
+    def __init__(self, target_thread_id: int, interval: float = SAMPLE_INTERVAL_S):
+        super().__init__(daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=1.0)
+
+
+def profile_call(
+    endpoint: str,
+    fn: Callable[[], Any],
+    input_state: Dict[str, Any],
+) -> Tuple[Any, Optional[str]]:
+    """
+    Run fn() under cProfile, a stack sampler and tracemalloc; return (result, artifact_dir).
+    If another profiled call is in progress, fn() runs unprofiled and artifact_dir is None.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        print(f"[PROFILE] {endpoint}: another request is being profiled, running unprofiled")
+        return fn(), None
+    try:
+        return _profile_locked(endpoint, fn, input_state)
+    finally:
+        _profile_lock.release()
+
+
+def _profile_locked(endpoint: str, fn: Callable[[], Any], input_state: Dict[str, Any]) -> Tuple[Any, str]:
+    run_id = f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{endpoint}_{os.getpid()}_{random.randint(0, 9999):04d}"
+    out_dir = os.path.join(PROFILE_DIR, run_id)
+    os.makedirs(out_dir, exist_ok=True)
+
+    started_tracemalloc = not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start(10)
+    tracemalloc.reset_peak()
+
+    sampler = _StackSampler(threading.get_ident())
+    profiler = cProfile.Profile()
+
+    sampler.start()
+    t0 = time.perf_counter()
+    profiler.enable()
+    try:
+        result = fn()
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - t0
+        sampler.stop()
+        # Hide the sampler's own bookkeeping from the allocation report
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+        _, peak = tracemalloc.get_traced_memory()
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+        profiler.dump_stats(os.path.join(out_dir, "profile.pstats"))
+
+        with open(os.path.join(out_dir, "stacks.collapsed"), "w", encoding="utf-8") as f:
+            for stack, count in sorted(sampler.counts.items(), key=lambda kv: -kv[1]):
+                f.write(f"{stack} {count}\n")
+
+        with open(os.path.join(out_dir, "allocations.txt"), "w", encoding="utf-8") as f:
+            f.write(f"elapsed_s: {elapsed:.4f}\n")
+            f.write(f"peak_traced_bytes: {peak}\n\n")
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+
+        state = dict(input_state)
+        state["endpoint"] = endpoint
+        state["elapsed_s"] = round(elapsed, 4)
+        state["captured_at"] = datetime.utcnow().isoformat()
+        with open(os.path.join(out_dir, "input.json"), "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, default=str)
+
+        print(f"[PROFILE] {endpoint} took {elapsed:.3f}s, artifacts -> {out_dir}")
+
+    return result, out_dir
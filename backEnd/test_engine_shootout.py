@@ -0,0 +1,52 @@
+"""
+engine_shootout CLI checks:
+    python backEnd/test_engine_shootout.py   (or pytest)
+
+The end-to-end run needs the catalog exports engine_shootout reads and is
+skipped when they are missing.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import engine_shootout
+
+
+def test_repeat_zero_is_rejected():
+    # Used to crash in Judge.score on result=None after zero timed runs
+    for argv in (["--repeat", "0"], ["--repeat", "-1"]):
+        try:
+            engine_shootout.main(argv + ["--synthetic", "1", "--engines", "ml", "--skip_memory"])
+        except SystemExit as e:
+            assert e.code == 2
+        else:
+            raise AssertionError(f"{argv} was accepted")
+
+
+def test_single_run_reports_latency():
+    if not engine_shootout.latest_export("DetailedCourses_DetailedCourses"):
+        print("skip test_single_run_reports_latency: no DetailedCourses catalog export")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "report.json")
+        engine_shootout.main(["--repeat", "1", "--synthetic", "1", "--engines", "ml",
+                              "--skip_memory", "--out", out])
+        with open(out, "r", encoding="utf-8") as f:
+            report = json.load(f)
+    ml = report["engines"]["ml"]
+    if "error" in ml:
+        print(f"skip test_single_run_reports_latency: {ml['error']}")
+        return
+    assert ml["runs"] == 1
+    assert ml["latency_s"]["p50"] is not None
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
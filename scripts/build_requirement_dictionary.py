@@ -9,18 +9,8 @@ cleaned_path = "data/unique_cleaned_req.txt"
 existing_req_path = "data/requirement_dictionary.json"
 middle_dctionary_path = "data/req_middle_dictionary.json"
 
-with open(existing_req_path, "r") as f:
-    existing_req = json.load(f)
-
-with open(middle_dctionary_path, "r") as f:
-    middle_dict = json.load(f)
-
-with open(raw_path, "r") as f:
-    raw_data = f.readlines()
-
-with open(cleaned_path, "r") as f:
-    data = f.readlines()
-
+# loaded in __main__, so importing tokenize / get_dict does not read the data files
+middle_dict = {}
 
 
 LOGICAL_TOKENS = ["AND", "OR", "and", "or", "(", ")"]
@@ -156,7 +146,8 @@ def validate(prompt):
 
 
 # --- main function ---
-def get_req(sen):
+def split_notes(sen):
+    """Pull the common-case sentences out as a note; returns (rest of the sentence, note)."""
     note = None
     sens = sen.split(". ")
     for i in range(len(sens)):
@@ -170,7 +161,20 @@ def get_req(sen):
         else:
             sens[i] = s
     
-    sen = ". ".join([s for s in sens if s])
+    return ". ".join([s for s in sens if s]), note
+
+def parse_sentence(sen):
+    """Non-interactive parse: the normalized prereq (list of OR clauses) or None if unparseable."""
+    out_tokens = tokenize(sen)
+    if not out_tokens:
+        return None
+    try:
+        return parse_and_normalize(out_tokens)
+    except ValueError:
+        return None
+
+def get_req(sen):
+    sen, note = split_notes(sen)
 
     if sen.strip() == "":
         return get_dict(None, None, None, note)
@@ -210,6 +214,19 @@ def get_req(sen):
 
 # --- main ---
 if __name__ == "__main__":
+    # unattended batch version: python scripts/compile_requirements.py
+    with open(existing_req_path, "r") as f:
+        existing_req = json.load(f)
+
+    with open(middle_dctionary_path, "r") as f:
+        middle_dict = json.load(f)
+
+    with open(raw_path, "r") as f:
+        raw_data = f.readlines()
+
+    with open(cleaned_path, "r") as f:
+        data = f.readlines()
+
     try:
         start = 661
         # in case exception occurs we can resume
@@ -1,5 +1,6 @@
 import re
 import json
+import sys
 from pprint import pprint
 
 spring26_path = "data/courses_spring_2026.jsonl" 
@@ -48,106 +49,137 @@ gold_ger_labels = {
 
 
 # --- main cleaning function starts ---
-# input: line["code"], ger raw string obtained by combining line["ger"]
-def match_ger_labels(code, raw):   
-    code = code.lower()
-    raw = raw.replace("Requirement Designation:", "").strip().lower()
-    labels = []
+# Rule table: each entry is an if/elif chain of (pattern, labels) checked in
+# order against the lowercased raw string; the first match in a chain wins.
+GER_RULES = [
+    [(r"first.*year.*seminar|\bfsem\b", ["FS"])],
+    [(r"first.*year.*writing|\bfwrt\b", ["FW"])],
+    [(r"cont.*comm.*writing|\bcw\b", ["CW"])],
+    [(r"natural.*sciences", ["NS"])],
+    [(r"soc.*sciences?", ["SS"])],
+    [(r"intercult.*comm", ["IC"])],
+    [(r"exp.*application", ["XA"])],
+    [(r"ethn", ["ETHN"])],
+    [(r"health", ["HLTH"])],
 
-    # course code based matching
-    if code.endswith("W"):
-        labels.append("WRT")
-    if code == "ecs101":
-        labels.append("ECS")
-    if code == "hlth100":
-        labels.append("HLTH")
+    # gold ger incorporated. gold ger filters checked before blue ger filters
+    [(r"cont.*comm|\bcw\b", ["CW"]),
+     (r"with writing|cont.*writ", ["WRT"])],
+    [(r"history.*society.*cultures|\bhsc\b", ["HSC"]),
+     (r"\bhscw\b", ["HSC", "WRT"])],
+    [(r"humanities.*arts.*performance|\bhap\b", ["HAP"]),
+     (r"\bhapw\b", ["HAP", "WRT"]),
+     (r"humanities.*arts", ["HA"]),
+     (r"humanities.*arts.*language|\bhal\b", ["HAL"]),
+     (r"\bhalw\b", ["HAL", "WRT"]),
+     (r"humanities.*arts", ["HA"])],
+    [(r"math.*quantit.*reasoning|\bmqr\b", ["MQR"]),
+     (r"\bmqrw\b", ["MQR", "WRT"]),
+     (r"quantit.*reasoning", ["QR"])],
+    [(r"science.*nature.*technology.*lab|\bsntl\b", ["SNTL"]),
+     (r"\bsnlw\b", ["SNTL", "WRT"]),
+     (r"science.*nature.*technology|\bsnt\b", ["SNT"]),
+     (r"\bsntw\b", ["SNT", "WRT"])],
+    [(r"physical education and dance", ["PED"]),
+     (r"physical education", ["PE"])],
+    [(r"principles of physical fitness", ["PPF"])],
+]
+
+# course code based matching (codes compared lowercased, spaces removed by normalize_code)
+CODE_LABELS = {
+    "ecs101": ["ECS"],
+    "hlth100": ["HLTH"],
+}
 
-    # main matching
-    if re.search(r"first.*year.*seminar|\bfsem\b", raw):
-        labels.append("FS")
+_compiled_rules = [[(re.compile(pattern), labels) for pattern, labels in chain] for chain in GER_RULES]
 
-    if re.search(r"first.*year.*writing|\bfwrt\b", raw):
-        labels.append("FW")
+# raw ger string -> its labels; there are only a few dozen distinct strings per catalog
+_raw_label_cache = {}
 
-    if re.search(r"cont.*comm.*writing|\bcw\b", raw):
-        labels.append("CW")
-    
-    if re.search(r"natural.*sciences", raw):
-        labels.append("NS")
-    
-    if re.search(r"soc.*sciences?", raw):
-        labels.append("SS")
 
-    if re.search(r"intercult.*comm", raw):
-        labels.append("IC")
+def raw_ger_labels(raw):
+    """Labels the raw string alone earns, as a sorted tuple (cached per distinct string)."""
+    labels = _raw_label_cache.get(raw)
+    if labels is None:
+        text = raw.replace("Requirement Designation:", "").strip().lower()
+        found = set()
+        for chain in _compiled_rules:
+            for pattern, chain_labels in chain:
+                if pattern.search(text):
+                    found.update(chain_labels)
+                    break
+        labels = _raw_label_cache[raw] = tuple(sorted(found))
+    return labels
 
-    if re.search(r"exp.*application", raw):
-        labels.append("XA")
 
-    if re.search(r"ethn", raw):
-        labels.append("ETHN")
+# input: line["code"], ger raw string obtained by combining line["ger"]
+def match_ger_labels(code, raw):   
+    code = code.lower()
+    labels = raw_ger_labels(raw)
 
-    if re.search(r"health", raw):
-        labels.append("HLTH")
+    # The original suffix rule tests the lowercased code, so it never fires.
+    # It stays as it was so stored labels do not change.
+    extra = CODE_LABELS.get(code, [])
+    if code.endswith("W"):
+        extra = extra + ["WRT"]
+    if extra:
+        labels = tuple(sorted(set(labels) | set(extra)))
 
+    if not labels:
+        return ["❌"]
+    return list(labels)
 
-    # gold ger incorporated. gold ger filters checked before blue ger filters
-    if re.search(r"cont.*comm|\bcw\b", raw):
-        labels.append("CW")
-    elif re.search(r"with writing|cont.*writ", raw):
-        labels.append("WRT")
-
-    if re.search(r"history.*society.*cultures|\bhsc\b", raw):
-        labels.append("HSC")
-    elif re.search(r"\bhscw\b", raw):
-        labels.extend(["HSC", "WRT"])
-
-    if re.search(r"humanities.*arts.*performance|\bhap\b", raw):
-        labels.append("HAP")
-    elif re.search(r"\bhapw\b", raw):
-        labels.extend(["HAP", "WRT"])
-    elif re.search(r"humanities.*arts", raw):
-        labels.append("HA")
-    elif re.search(r"humanities.*arts.*language|\bhal\b", raw):
-        labels.append("HAL")
-    elif re.search(r"\bhalw\b", raw):
-        labels.extend(["HAL", "WRT"])
-    elif re.search(r"humanities.*arts", raw):
-        labels.append("HA")
-
-    if re.search(r"math.*quantit.*reasoning|\bmqr\b", raw):
-        labels.append("MQR")
-    elif re.search(r"\bmqrw\b", raw):
-        labels.extend(["MQR", "WRT"])
-    elif re.search(r"quantit.*reasoning", raw):
-        labels.append("QR")
-
-    if re.search(r"science.*nature.*technology.*lab|\bsntl\b", raw):
-        labels.append("SNTL")
-    elif re.search(r"\bsnlw\b", raw):
-        labels.extend(["SNTL", "WRT"])
-    elif re.search(r"science.*nature.*technology|\bsnt\b", raw):
-        labels.append("SNT")
-    elif re.search(r"\bsntw\b", raw):
-        labels.extend(["SNT", "WRT"])
-    
-    if re.search(r"physical education and dance", raw):
-        labels.append("PED")
-    elif re.search(r"physical education", raw):
-        labels.append("PE")
-    
-    if re.search(r"principles of physical fitness", raw):
-        labels.append("PPF")
-    
-    labels = list(set(labels))  # remove duplicates
-    labels.sort()
+# --- main cleaning function ends ---
 
-    if labels == []:
-        labels = ["❌"]
 
-    return labels
+def read_ger_out(path=output_path):
+    """unique_ger_out.txt lines -> [(code, raw, labels)]"""
+    rows = []
+    with open(path, "r") as f:
+        for line in f:
+            if " <-- " not in line:
+                continue
+            head, raw = line.rstrip("\n").split(" <-- ", 1)
+            labels = head[21:].strip().strip("[]")
+            rows.append((head[6:21].strip(), raw, [l.strip() for l in labels.split(",") if l.strip()]))
+    return rows
 
-# --- main cleaning function ends ---
+
+def check():
+    """Regression check: the recorded labels in unique_ger_out.txt, and every catalog record, still match."""
+    recorded = read_ger_out()
+    failures = 0
+    for code, raw, labels in recorded:
+        got = match_ger_labels(code, raw)
+        if got != labels:
+            failures += 1
+            print(f"FAIL {code} {raw!r}: {got} != {labels}")
+
+    by_raw = {raw: labels for _, raw, labels in recorded}
+    records = unknown = 0
+    for path in (spring26_path, basic_courses_path):
+        with open(path, "r") as f:
+            for line in f:
+                obj = json.loads(line)
+                ger_raw = obj.get("ger")
+                if not ger_raw:
+                    continue
+                records += 1
+                want = by_raw.get(ger_raw.strip().lower())
+                code = obj.get("code").replace(" ", "")
+                if want is None:
+                    unknown += 1
+                    continue
+                if code.lower() in CODE_LABELS:
+                    want = sorted(set(want) | set(CODE_LABELS[code.lower()]))
+                got = match_ger_labels(code, ger_raw)
+                if got != want:
+                    failures += 1
+                    print(f"FAIL {code} {ger_raw!r}: {got} != {want}")
+
+    print(f"{len(recorded)} recorded strings, {records} catalog records "
+          f"({unknown} with unrecorded GER strings), {failures} mismatches")
+    return 1 if failures else 0
 
 
 
@@ -163,6 +195,9 @@ def match_ger_labels(code, raw):
 
 
 if __name__ == "__main__":
+    if "--check" in sys.argv:
+        sys.exit(check())
+
     out = ""
     lines = []
     seen = set()
@@ -0,0 +1,206 @@
+"""
+Unattended requirement-sentence compiler.
+
+build_requirement_dictionary.py walks the sentences one by one and stops at an
+input() prompt whenever tokenize() cannot read one. This compiles every unique
+sentence in data/unique_raw_req.txt in one pass instead:
+
+    raw sentence -> cleaned sentence -> common-case notes split off
+                 -> req_middle_dictionary.json (hand-resolved) -> parse cache
+                 -> tokenize + parse_and_normalize (process pool)
+
+The prereq is the same normalized form the dictionary already stores: a list of
+OR clauses that are ANDed together, e.g. [["MATH111"], ["CS170", "CS171"]].
+
+- Cleaned sentence: the hand-checked line from unique_cleaned_req.txt when the
+  raw sentence has one, otherwise get_unique_middle_req's automatic cleanup
+  (anything it keeps that does not parse goes to review, never dropped).
+- Parse results are cached by the SHA-256 of the sentence in
+  data/req_parse_cache.json; bump PARSER_VERSION when tokenize/parse changes.
+- Sentences that still do not parse are written to data/req_review_queue.jsonl
+  and left out of the dictionary. Resolve one by adding its "sentence" to
+  req_middle_dictionary.json and re-run.
+- Existing requirement_dictionary.json entries are kept unless --rebuild.
+
+Usage:
+  python scripts/compile_requirements.py [--workers 4] [--rebuild] [--dry-run]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from build_requirement_dictionary import (
+    raw_path, cleaned_path, existing_req_path, middle_dctionary_path,
+    tokenize, get_dict, split_notes, parse_sentence,
+)
+from get_unique_middle_req import keep_req, clean_sen
+
+cache_path = "data/req_parse_cache.json"
+review_path = "data/req_review_queue.jsonl"
+
+PARSER_VERSION = 1
+
+
+def sentence_hash(sen):
+    return hashlib.sha256(sen.encode("utf-8")).hexdigest()
+
+
+def read_req_lines(path):
+    """'CODE           : sentence' lines -> [(code, sentence), ...]"""
+    with open(path, "r") as f:
+        return [(line.split(":")[0].strip(), line[17:].strip()) for line in f if line.strip()]
+
+
+def auto_clean(code, raw):
+    """The cleanup get_unique_cleaned_req.py asks a human for, without asking."""
+    line = clean_sen(keep_req(f"{code:<15}: {raw}"))
+    kept = []
+    for s in line[17:].split("."):
+        s = re.sub(r"as\s+(a\s+)?prerequisite(s)?\.?$", "", s.strip(), flags=re.IGNORECASE)
+        s = re.sub(r"s?[.,\s]*$", "", s)
+        s = re.sub(r'or equivalent transfer credit', '', s, flags=re.IGNORECASE).strip()
+        if s:
+            kept.append(s)
+    return ". ".join(kept)
+
+
+# -------------------- cache --------------------
+
+def load_cache(path):
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if cache.get("version") != PARSER_VERSION:
+        return {}
+    return cache.get("entries", {})
+
+
+def save_cache(path, entries):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"version": PARSER_VERSION, "entries": entries}, f, indent=1)
+    os.replace(tmp, path)
+
+
+# -------------------- compile --------------------
+
+def compile_all(rows, middle_dict, cache, workers=1, chunksize=32):
+    """
+    rows: [(code, raw, cleaned)]. Returns ({raw: obj}, [review items], counts).
+    Lookups happen here; only cache misses are parsed, in the pool when workers > 1.
+    """
+    counts = {"notes_only": 0, "middle_dict": 0, "cached": 0, "parsed": 0, "review": 0}
+    resolved = {}
+    misses = []  # (code, raw, sen, note)
+    for code, raw, cleaned in rows:
+        sen, note = split_notes(cleaned)
+        if sen.strip() == "":
+            resolved[raw] = get_dict(None, None, None, note)
+            counts["notes_only"] += 1
+        elif sen in middle_dict:
+            resolved[raw] = middle_dict[sen]
+            counts["middle_dict"] += 1
+        elif sentence_hash(sen) in cache:
+            resolved[raw] = get_dict(cache[sentence_hash(sen)], None, None, note)
+            counts["cached"] += 1
+        else:
+            misses.append((code, raw, sen, note))
+
+    sentences = [m[2] for m in misses]
+    if workers > 1 and len(sentences) > chunksize:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(parse_sentence, sentences, chunksize=chunksize))
+    else:
+        parsed = [parse_sentence(s) for s in sentences]
+
+    review = []
+    for (code, raw, sen, note), prereq in zip(misses, parsed):
+        if prereq is None:
+            review.append({"code": code, "raw": raw, "sentence": sen,
+                           "reason": "untokenizable" if not tokenize(sen) else "unbalanced expression"})
+            counts["review"] += 1
+            continue
+        cache[sentence_hash(sen)] = prereq
+        resolved[raw] = get_dict(prereq, None, None, note)
+        counts["parsed"] += 1
+    return resolved, review, counts
+
+
+def run(workers=1, rebuild=False, dry_run=False):
+    started = time.perf_counter()
+    with open(existing_req_path, "r") as f:
+        existing_req = json.load(f)
+    with open(middle_dctionary_path, "r") as f:
+        middle_dict = json.load(f)
+
+    # cleaned lines are line-aligned with the raw file they were made from
+    raw_lines = read_req_lines(raw_path)
+    cleaned_by_raw = {}
+    if os.path.exists(cleaned_path):
+        for (_, raw), (_, cleaned) in zip(raw_lines, read_req_lines(cleaned_path)):
+            cleaned_by_raw[raw] = cleaned
+
+    seen = set()
+    rows = []
+    auto_cleaned = 0
+    for code, raw in raw_lines:
+        if raw in seen:
+            continue
+        seen.add(raw)
+        if raw in cleaned_by_raw:
+            cleaned = cleaned_by_raw[raw]
+        else:
+            cleaned = auto_clean(code, raw)
+            auto_cleaned += 1
+        rows.append((code, raw, cleaned))
+
+    cache = load_cache(cache_path)
+    resolved, review, counts = compile_all(rows, middle_dict, cache, workers)
+
+    added = changed = 0
+    out = {} if rebuild else dict(existing_req)
+    for raw, obj in resolved.items():
+        if raw not in existing_req:
+            added += 1
+        elif not rebuild:
+            continue
+        elif existing_req[raw] != obj:
+            changed += 1
+        out[raw] = obj
+
+    print(f"{len(rows)} unique sentences ({auto_cleaned} auto-cleaned): "
+          + ", ".join(f"{v} {k}" for k, v in counts.items()))
+    print(f"dictionary: {added} added, {changed} changed, {len(out)} total "
+          f"({time.perf_counter() - started:.2f}s, {workers} workers)")
+    if review:
+        print(f"{len(review)} sentences need review -> {review_path}")
+    if dry_run:
+        return out, review
+
+    with open(existing_req_path, "w") as f:
+        json.dump(out, f, indent=4)
+    with open(review_path, "w") as f:
+        for item in review:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+    save_cache(cache_path, cache)
+    return out, review
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=1, help="Processes for parsing cache misses")
+    ap.add_argument("--rebuild", action="store_true",
+                    help="Replace existing dictionary entries with the compiled ones")
+    ap.add_argument("--dry-run", action="store_true", help="Compile and report without writing files")
+    args = ap.parse_args()
+    run(args.workers, args.rebuild, args.dry_run)
@@ -0,0 +1,327 @@
+"""
+Streaming data-preparation pipeline for the scraped catalog JSONL files.
+
+Replaces the read-everything / build-a-list / json.dump flow of
+prepare_spring26_courses.py and prepare_basic_course.py with iterator stages:
+
+    read JSONL -> undergrad filter -> normalize -> GER labels
+               -> requirement lookup -> classification -> write
+
+Records flow through one at a time and are written as they come out, so memory
+stays flat. Stages marked parallel (normalize, GER labels) can run in a
+process pool with --workers N; consecutive parallel stages are fused into one
+pool task and results keep input order. Each stage reports items in/out and
+time spent.
+
+The output format follows the extension: .jsonl writes one record per line,
+.json streams the same indent=4 array json.dump produced (byte-identical), so
+spring26_2_db.py / basic2db.py keep working.
+
+Usage:
+  python scripts/prep_pipeline.py spring26 [--workers 4] [--output data/x.jsonl] [--timings t.json]
+  python scripts/prep_pipeline.py basic
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backEnd"))
+
+from clean_ger import match_ger_labels
+from prepare_spring26_courses import (
+    normalize_code, normalize_typically_offered, get_time_location, get_professor_professor_email,
+)
+
+requirements_dctionary_path = "data/requirement_dictionary.json"
+
+
+# -------------------- pipeline machinery --------------------
+
+class Stage:
+    """One step: fn(item) -> item, or None to drop the record."""
+
+    def __init__(self, name, fn, parallel=False):
+        self.name = name
+        self.fn = fn
+        self.parallel = parallel
+
+
+class StageTimings:
+
+    def __init__(self):
+        self.stats = {}
+
+    def add(self, name, seconds, n_in=1, n_out=1):
+        s = self.stats.setdefault(name, {"seconds": 0.0, "in": 0, "out": 0})
+        s["seconds"] += seconds
+        s["in"] += n_in
+        s["out"] += n_out
+
+    def report(self, wall):
+        print(f"{'stage':24s} {'in':>8s} {'out':>8s} {'seconds':>9s} {'items/s':>10s}")
+        for name, s in self.stats.items():
+            rate = s["in"] / s["seconds"] if s["seconds"] else float("inf")
+            print(f"{name:24s} {s['in']:8d} {s['out']:8d} {s['seconds']:9.3f} {rate:10.0f}")
+        print(f"{'wall':24s} {'':8s} {'':8s} {wall:9.3f}")
+
+    def as_dict(self, wall):
+        return {"stages": self.stats, "wall_seconds": wall}
+
+
+def read_jsonl(path, timings):
+    with open(path, "r") as f:
+        for line in f:
+            t0 = time.perf_counter()
+            if not line.strip():
+                continue
+            obj = json.loads(line)
+            timings.add("read", time.perf_counter() - t0)
+            yield obj
+
+
+def run_stage(stage, items, timings):
+    for item in items:
+        t0 = time.perf_counter()
+        out = stage.fn(item)
+        timings.add(stage.name, time.perf_counter() - t0, 1, out is not None)
+        if out is not None:
+            yield out
+
+
+def _run_group(fns, chunk):
+    """Pool task: push a chunk of records through fused stages, timing each."""
+    results = []
+    for item in chunk:
+        times = []
+        for name, fn in fns:
+            t0 = time.perf_counter()
+            item = fn(item)
+            times.append((name, time.perf_counter() - t0, item is not None))
+            if item is None:
+                break
+        results.append((item, times))
+    return results
+
+
+def run_parallel_group(stages, items, timings, pool, workers, chunksize):
+    """Ordered, bounded-window process-pool map over a group of parallel stages."""
+    task = partial(_run_group, [(s.name, s.fn) for s in stages])
+    it = iter(items)
+    pending = deque()
+
+    def submit():
+        chunk = list(islice(it, chunksize))
+        if chunk:
+            pending.append(pool.submit(task, chunk))
+        return bool(chunk)
+
+    for _ in range(workers * 2):
+        if not submit():
+            break
+    while pending:
+        for item, times in pending.popleft().result():
+            for name, seconds, kept in times:
+                timings.add(name, seconds, 1, kept)
+            if item is not None:
+                yield item
+        submit()
+
+
+def build(stages, items, timings, pool=None, workers=1, chunksize=64):
+    """Chain the stages lazily; runs of parallel stages go to the pool when there is one."""
+    i = 0
+    while i < len(stages):
+        if pool is not None and stages[i].parallel:
+            j = i
+            while j < len(stages) and stages[j].parallel:
+                j += 1
+            items = run_parallel_group(stages[i:j], items, timings, pool, workers, chunksize)
+            i = j
+        else:
+            items = run_stage(stages[i], items, timings)
+            i += 1
+    return items
+
+
+def write_output(path, items, timings):
+    """Stream records to .jsonl (one per line) or .json (indent=4 array, as json.dump wrote)."""
+    tmp = path + ".tmp"
+    n = 0
+    as_array = not path.endswith(".jsonl")
+    with open(tmp, "w") as f:
+        if as_array:
+            f.write("[")
+        for item in items:
+            t0 = time.perf_counter()
+            if as_array:
+                body = json.dumps(item, indent=4).replace("\n", "\n    ")
+                f.write(("," if n else "") + "\n    " + body)
+            else:
+                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            n += 1
+            timings.add("write", time.perf_counter() - t0)
+        if as_array:
+            f.write("\n]" if n else "]")
+    os.replace(tmp, path)
+    return n
+
+
+# -------------------- stages --------------------
+
+def undergrad_only(obj):
+    num = (int)(re.search(r"(\d{3})", obj.get("code")).group(1))
+    return obj if num < 500 else None  # filter grad school courses
+
+
+def normalize_detailed(obj):
+    code = normalize_code(obj.get("code"))
+    typically_offered = obj.get("typically_offered")
+    if typically_offered:
+        typically_offered = normalize_typically_offered(typically_offered)
+    time_, location = get_time_location(code, obj.get("schedule_location"))
+    prof, email = get_professor_professor_email(code, obj.get("professor"))
+    return {
+        "code": code,
+        "title": obj.get("title"),
+        "section": obj.get("section"),
+        "type": obj.get("type"),
+        "credits": obj.get("credits"),
+        "typically_offered": typically_offered,
+        "ger": obj.get("ger"),
+        "requirements": (obj.get("requirement_sentence") or "").strip(),
+        "instruction_method": obj.get("instruction_method"),
+        "campus": obj.get("campus"),
+        "time": time_,
+        "location": location,
+        "professor": prof,
+        "professor_email": email,
+    }
+
+
+def normalize_basic(obj):
+    code = normalize_code(obj.get("code"))
+    typically_offered = obj.get("typically_offered")
+    if typically_offered is not None and typically_offered != "":
+        typically_offered = normalize_typically_offered(typically_offered)
+    else:
+        typically_offered = None
+    return {
+        "code": code,
+        "title": obj.get("title"),
+        "type": obj.get("type"),
+        "credits": obj.get("credits"),
+        "typically_offered": typically_offered,
+        "ger": obj.get("ger"),
+        "requirements": (obj.get("requirement_sentence") or "").strip(),
+    }
+
+
+def label_ger(item):
+    ger_sen = item["ger"]
+    item["ger"] = match_ger_labels(item["code"], ger_sen) if ger_sen else None
+    return item
+
+
+def requirement_lookup(dictionary):
+    from build_requirement_dictionary import get_dict
+
+    def lookup(item):
+        req_sen = item["requirements"]
+        item["requirements"] = get_dict(None, None, None, None) if req_sen == "" else dictionary.get(req_sen)
+        return item
+    return lookup
+
+
+def keep_raw(normalize, obj):
+    """normalize(obj), carrying the scraped record along for the classify stage."""
+    item = normalize(obj)
+    item["_raw"] = obj
+    return item
+
+
+def classify(item):
+    from course_classifier import classification_input, classify_course
+    # flags read by the engine instead of re-scanning text per request; same
+    # raw + normalized input Model/Extraction.py classifies
+    raw = item.pop("_raw")
+    item["classification"] = classify_course(classification_input(raw, item))
+    return item
+
+
+PROFILES = {
+    "spring26": {
+        "input": "data/courses_spring_2026.jsonl",
+        "output": "data/processed_spring26_courses.json",
+        "normalize": normalize_detailed,
+        "classify": True,
+    },
+    "basic": {
+        "input": "data/courses_basic.jsonl",
+        "output": "data/processed_basic_courses.json",
+        "normalize": normalize_basic,
+        "classify": False,
+    },
+}
+
+
+def pipeline_stages(profile, dictionary):
+    stages = [
+        Stage("undergrad_filter", undergrad_only),
+        Stage("normalize", partial(keep_raw, profile["normalize"]) if profile["classify"]
+              else profile["normalize"], parallel=True),
+        Stage("ger_labels", label_ger, parallel=True),
+        Stage("requirements", requirement_lookup(dictionary)),
+    ]
+    if profile["classify"]:
+        stages.append(Stage("classify", classify))
+    return stages
+
+
+def run(name, input_path=None, output_path=None, workers=1, chunksize=64, timings_path=None):
+    profile = PROFILES[name]
+    input_path = input_path or profile["input"]
+    output_path = output_path or profile["output"]
+
+    with open(requirements_dctionary_path, "r") as f:
+        dictionary = json.load(f)
+
+    timings = StageTimings()
+    started = time.perf_counter()
+    stages = pipeline_stages(profile, dictionary)
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        items = build(stages, read_jsonl(input_path, timings), timings, pool, workers, chunksize)
+        n = write_output(output_path, items, timings)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    wall = time.perf_counter() - started
+    print(f"{name}: wrote {n} records to {output_path} ({'%d workers' % workers if pool else 'in process'})")
+    timings.report(wall)
+    if timings_path:
+        with open(timings_path, "w") as f:
+            json.dump(timings.as_dict(wall), f, indent=2)
+    return n
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("profile", choices=sorted(PROFILES))
+    ap.add_argument("--input", default=None)
+    ap.add_argument("--output", default=None, help=".jsonl for JSON lines, .json for the legacy array")
+    ap.add_argument("--workers", type=int, default=1, help="Process pool size for normalize + GER stages")
+    ap.add_argument("--chunksize", type=int, default=64)
+    ap.add_argument("--timings", default=None, help="Optional per-stage timings JSON")
+    args = ap.parse_args()
+    run(args.profile, args.input, args.output, args.workers, args.chunksize, args.timings)
@@ -1,9 +1,3 @@
-from clean_ger import match_ger_labels
-from build_requirement_dictionary import get_dict
-import json
-from pprint import pprint
-import re
-
 spring26_path = "data/courses_spring_2026.jsonl"
 requirements_dctionary_path = "data/requirement_dictionary.json"
 output_path = "data/processed_spring26_courses.json"
@@ -66,67 +60,6 @@ def get_professor_professor_email(code, sen):
     
 
 if __name__ == "__main__":
-    start = 0
-    items = []
-    with open(requirements_dctionary_path, "r") as f:
-        requirements_dctionary = json.load(f)
-
-    with open(spring26_path, 'r') as file:
-        lines = [json.loads(line) for line in file if line.strip()]
-    
-
-
-    for i in range(start, len(lines)):
-        obj = lines[i]
-        code = obj.get("code")
-        
-        num = (int)(re.search(r"(\d{3})", code).group(1))
-        if num >= 500: # filter grad school courses
-            continue
-        
-        code = normalize_code(code)
-        typically_offered = obj.get("typically_offered")
-        if typically_offered:
-            typically_offered = normalize_typically_offered(typically_offered)
-            # print(code, "typically_offered normalized to:", typically_offered)
-        ger_sen = obj.get("ger")
-        if ger_sen:
-            labels = match_ger_labels(code, ger_sen)
-        else:
-            labels = None
-        req_sen = obj.get("requirement_sentence", "").strip()
-        requirements = {}
-        if req_sen == "":
-            requirements = get_dict(None, None, None, None)
-        else:
-            requirements = requirements_dctionary.get(req_sen)
-        
-        time, location = get_time_location(code, obj.get("schedule_location"))
-        prof, email = get_professor_professor_email(code, obj.get("professor"))
-
-
-        item = {
-            "code": code,                        
-            "title": obj.get("title"),                 
-            "section": obj.get("section"),
-            "type": obj.get("type"),                        
-            "credits": obj.get("credits"),                         
-            "typically_offered": typically_offered,
-            "ger": labels,
-            "requirements": requirements,                       
-            "instruction_method": obj.get("instruction_method"),
-            "campus": obj.get("campus"),     
-            "time": time,                 
-            "location": location,
-            "professor": prof, 
-            "professor_email": email   
-        }
-
-        items.append(item)
-    
-    with open(output_path, "w") as f:
-        json.dump(items, f, indent=4)
-
-
-
-
+    # streaming stages live in prep_pipeline.py (python prep_pipeline.py spring26 --workers N)
+    from prep_pipeline import run
+    run("spring26", spring26_path, output_path)
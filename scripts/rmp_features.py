@@ -0,0 +1,75 @@
+"""
+Build the professor feature store from RateMyProfessors.Professors.
+
+Run after rmp2db.py (and again whenever the RMP data is refreshed):
+
+    python scripts/rmp_features.py                       # read from Mongo
+    python scripts/rmp_features.py --json <export.json>  # read a mongo export
+    python scripts/rmp_features.py --link_courses        # also set rmp.id on the course collections
+
+Writes backEnd/rmp_features.npz (or $RMP_FEATURES_PATH), which both the ML
+engine and Model/Recommended_Courses.py read instead of recomputing the
+features from each course's embedded rmp dict.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backEnd"))
+from professor_features import FEATURE_STORE_PATH, build_feature_store, rmp_id_from_url
+
+
+# DetailedCourses.DetailedCourses is what backEnd/app.py serves; CoursesEnriched
+# feeds the Model/ pipeline
+LINKED_COLLECTIONS = (("DetailedCourses", "DetailedCourses"), ("DetailedCourses", "CoursesEnriched"))
+
+
+def link_courses(client, collections=LINKED_COLLECTIONS):
+    """Store the RMP id on each course so lookups don't parse URLs."""
+    for db_name, col_name in collections:
+        col = client[db_name][col_name]
+        ops = []
+        for doc in col.find({"rmp.url": {"$ne": None}}, {"rmp.url": 1, "rmp.id": 1}):
+            rmp_id = rmp_id_from_url((doc.get("rmp") or {}).get("url"))
+            if rmp_id and doc["rmp"].get("id") != rmp_id:
+                ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"rmp.id": rmp_id}}))
+        if ops:
+            col.bulk_write(ops, ordered=False)
+        print(f"{db_name}.{col_name}: linked {len(ops)} courses to RMP ids")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--json", help="Read professors from a JSON export instead of Mongo")
+    parser.add_argument("--out", default=FEATURE_STORE_PATH)
+    parser.add_argument("--link_courses", action="store_true",
+                        help="Set rmp.id on DetailedCourses.DetailedCourses and CoursesEnriched")
+    args = parser.parse_args()
+
+    client = None
+    if args.json:
+        with open(args.json, "r", encoding="utf-8") as f:
+            professors = json.load(f)
+    else:
+        load_dotenv()
+        client = MongoClient(os.getenv("DB_URI"))
+        professors = list(client["RateMyProfessors"]["Professors"].find(
+            {}, {"_id": 0, "url": 1, "rating": 1, "num_ratings": 1,
+                 "difficulty": 1, "would_take_again_%": 1}
+        ))
+    print(f"loaded {len(professors)} professors")
+
+    store = build_feature_store(professors)
+    store.save(args.out)
+    print(f"saved {len(store.ids)} feature rows to {args.out}")
+
+    if args.link_courses:
+        if client is None:
+            load_dotenv()
+            client = MongoClient(os.getenv("DB_URI"))
+        link_courses(client)